@@ -1,13 +1,13 @@
 import streamlit as st
-from PIL import Image
+
+from utils.assets import sidebar_logo
 
 st.set_page_config(
     layout = 'wide',
     page_title = 'Home')
 
-image_path = 'images/logo.jpg'
-image = Image.open(image_path)
-st.sidebar.image(image, width = 240)
+# Logo da barra lateral (reduzido para a largura exibida uma única vez por processo)
+sidebar_logo()
 
 # Textos a serem exibidos na barra lateral
 st.sidebar.markdown('# Curry Company')
@@ -0,0 +1,152 @@
+# ==========================================================================================================================
+# IMPORTANDO BIBLIOTECAS NECESSÁRIAS
+# ==========================================================================================================================
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.synthetic import write_train_csv
+from utils.backends import BACKENDS, get_backend
+from utils.data import DATASET_PATH
+from utils.engine import (delivery_speed_rankings, distance_by_city, orders_by_city_and_traffic, orders_by_day, orders_by_traffic,
+                          ratings_by_courier, ratings_by_traffic, ratings_by_weather, time_by_city, time_by_city_and_order_type,
+                          time_by_city_and_traffic)
+from utils.ingest import ingest_batch
+
+# ==========================================================================================================================
+# CONFIGURAÇÕES INCIAIS
+# ==========================================================================================================================
+# Consultas comparadas: as visões das páginas que passam pelo backend, mais a média e o desvio padrão por Festival ('time_metric')
+QUERIES = {
+    'orders_by_day': orders_by_day,
+    'orders_by_traffic': orders_by_traffic,
+    'orders_by_city_and_traffic': orders_by_city_and_traffic,
+    'ratings_by_courier': ratings_by_courier,
+    'ratings_by_traffic': ratings_by_traffic,
+    'ratings_by_weather': ratings_by_weather,
+    'delivery_speed_rankings': delivery_speed_rankings,
+    'festival_time': lambda query: query.mean_std('Time_taken(min)', 'Festival'),
+    'time_by_city': time_by_city,
+    'time_by_city_and_order_type': time_by_city_and_order_type,
+    'time_by_city_and_traffic': time_by_city_and_traffic,
+    'distance_by_city': distance_by_city,
+}
+
+# Estados dos filtros da barra lateral: tudo, recortes típicos das três páginas, um único dia, cada multiseleção vazia e período sem pedidos
+FILTER_STATES = [
+    {},
+    {'date_min': '2022-02-20', 'date_max': '2022-03-20', 'Road_traffic_density': ['Low', 'Medium', 'Jam']},
+    {'date_min': '2022-03-01', 'date_max': '2022-04-06', 'Road_traffic_density': ['High', 'Jam'],
+     'Weatherconditions': ['conditions Sunny', 'conditions Fog', 'conditions Stormy']},
+    {'date_min': '2022-02-11', 'date_max': '2022-03-15', 'City': ['Urban', 'Semi-Urban'], 'Road_traffic_density': ['Low', 'Jam'],
+     'Weatherconditions': ['conditions Cloudy', 'conditions Windy', 'conditions Sandstorms']},
+    {'date_min': '2022-03-13', 'date_max': '2022-03-13'},
+    {'Road_traffic_density': []},
+    {'City': []},
+    {'date_min': '2022-03-01', 'Weatherconditions': []},
+    {'date_min': '2030-01-01', 'date_max': '2030-12-31'},
+]
+
+# Tolerância relativa e absoluta na comparação dos números (as médias e desvios são calculados com algoritmos diferentes)
+RTOL = 1e-9
+ATOL = 1e-9
+
+# ==========================================================================================================================
+# FUNÇÕES
+# ==========================================================================================================================
+def differences(left, right, rtol = RTOL, atol = ATOL):
+    """ Esta função tem a responsabilidade de comparar os resultados de uma consulta nos dois backends, independentemente da ordem
+        das linhas e do tipo das chaves (categorias ou textos).
+
+        Input:  1. Dataframe do primeiro backend;
+                2. Dataframe do segundo backend;
+                3. Tolerâncias relativa e absoluta dos números.
+        Output: Lista de textos descrevendo as diferenças (vazia quando os resultados são iguais)
+    """
+    if list(left.columns) != list(right.columns):
+        return ['colunas {} != {}'.format(list(left.columns), list(right.columns))]
+    if len(left) != len(right):
+        return ['{} linhas != {} linhas'.format(len(left), len(right))]
+
+    keys = [col for col in left.columns if not pd.api.types.is_float_dtype(left[col])]
+    left, right = [df.assign(**{col: df[col].astype(str) for col in keys if not pd.api.types.is_numeric_dtype(df[col])})
+                   .sort_values(keys, kind = 'stable').reset_index(drop = True) for df in (left, right)]
+
+    found = []
+    for col in left.columns:
+        if pd.api.types.is_numeric_dtype(left[col]):
+            same = np.isclose(left[col].to_numpy(dtype = np.float64), right[col].to_numpy(dtype = np.float64),
+                              rtol = rtol, atol = atol, equal_nan = True)
+        else:
+            same = (left[col] == right[col]).to_numpy()
+        if not same.all():
+            row = int(np.argmin(same))
+            found.append("'{}': {} de {} valores diferem (linha {}: {!r} != {!r})".format(
+                col, int((~same).sum()), len(same), row, left[col].iloc[row], right[col].iloc[row]))
+    return found
+
+def run(path, backends = ('pandas', 'arrow')):
+    """ Esta função tem a responsabilidade de executar todas as consultas em todos os estados dos filtros nos dois backends.
+
+        Input:  1. Caminho do arquivo CSV;
+                2. Nomes dos dois backends comparados.
+        Output: Tupla (lista de diferenças, {backend: {consulta: tempo total em s}})
+    """
+    found = []
+    seconds = {name: {query: 0.0 for query in QUERIES} for name in backends}
+    for filters in FILTER_STATES:
+        selections = {name: get_backend(name, path).select(**filters) for name in backends}
+        for query, func in QUERIES.items():
+            results = {}
+            for name, selection in selections.items():
+                start = time.perf_counter()
+                results[name] = func(selection)
+                seconds[name][query] += time.perf_counter() - start
+            for difference in differences(*(results[name] for name in backends)):
+                found.append('{} | {} | {}'.format(query, filters or 'sem filtros', difference))
+    return found, seconds
+
+def report(seconds):
+    """ Esta função tem a responsabilidade de imprimir o tempo de cada consulta em cada backend, somado em todos os estados dos filtros.
+
+        Input:  Tempos {backend: {consulta: tempo}}
+        Output: Nenhum.
+    """
+    names = list(seconds)
+    print('{:<35}'.format('Consulta') + ''.join('{:>12}'.format(name + ' (s)') for name in names))
+    for query in QUERIES:
+        print('{:<35}'.format(query) + ''.join('{:>12.4f}'.format(seconds[name][query]) for name in names))
+
+# ==========================================================================================================================
+# INÍCIO DA ESTRUTURA LÓGICA DO CÓDIGO
+# ==========================================================================================================================
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description = 'Compara os resultados das consultas das páginas nos backends pandas e arrow.')
+    parser.add_argument('--dataset', default = DATASET_PATH, help = 'CSV do conjunto de dados (ignorado com --rows)')
+    parser.add_argument('--rows', type = int, help = 'usa um CSV sintético com este número de linhas, em um diretório temporário')
+    parser.add_argument('--batch-rows', type = int, default = 0, help = 'linhas de um lote sintético ingerido após o CSV (com --rows)')
+    parser.add_argument('--seed', type = int, default = 0)
+    parser.add_argument('--backends', nargs = 2, default = ['pandas', 'arrow'], choices = list(BACKENDS))
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = args.dataset
+        if args.rows:
+            path = write_train_csv(os.path.join(tmp, 'train.csv'), args.rows, seed = args.seed)
+            if args.batch_rows:
+                batch = write_train_csv(os.path.join(tmp, 'batch.csv'), args.batch_rows, seed = args.seed + 1,
+                                        start = '2022-04-07', end = '2022-04-30')
+                ingest_batch(batch, path)
+
+        found, seconds = run(path, args.backends)
+
+    report(seconds)
+    print('\nDiferenças: {}'.format(len(found)))
+    for difference in found:
+        print('  ' + difference)
+    sys.exit(1 if found else 0)
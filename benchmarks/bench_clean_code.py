@@ -0,0 +1,92 @@
+# ==========================================================================================================================
+# IMPORTANDO BIBLIOTECAS NECESSÁRIAS
+# ==========================================================================================================================
+import argparse
+import os
+import tempfile
+import time
+
+import pandas as pd
+
+from benchmarks.synthetic import write_train_csv
+from utils.data import clean_code, read_raw
+
+# ==========================================================================================================================
+# FUNÇÕES
+# ==========================================================================================================================
+def clean_code_legacy(df1):
+    """ Esta função reproduz a limpeza original das páginas (uma atribuição '.loc' por coluna e um recorte do Dataframe por coluna),
+        servindo como referência ("antes") para o benchmark.
+
+        Input:  Dataframe lido com pd.read_csv simples
+        Output: Dataframe
+    """
+    for col in ['ID', 'Delivery_person_ID', 'Delivery_person_Age', 'Delivery_person_Ratings', 'Road_traffic_density',
+                'Type_of_order', 'Type_of_vehicle', 'Festival', 'City']:
+        df1.loc[:, col] = df1.loc[:, col].str.strip()
+
+    for i in df1.columns:
+      linhas_excl = df1.loc[:, i] == 'NaN'
+      df1 = df1.loc[~linhas_excl, :]
+
+    df1.loc[:, 'Delivery_person_Age'] = df1.loc[:, 'Delivery_person_Age'].astype(int)
+    df1.loc[:, 'Delivery_person_Ratings'] = df1.loc[:, 'Delivery_person_Ratings'].astype(float)
+    df1['Order_Date'] = pd.to_datetime(df1.loc[:, 'Order_Date'],dayfirst=True, format = '%d-%m-%Y')
+    df1['Time_taken(min)'] = df1.loc[:, 'Time_taken(min)'].str.strip(to_strip = '(min) ')
+    df1['Time_taken(min)'] = df1.loc[:, 'Time_taken(min)'].astype(int)
+    return df1
+
+def timed(func, *args):
+    """ Esta função tem a responsabilidade de executar uma função e medir o seu tempo de execução.
+
+        Input:  Função e seus argumentos
+        Output: Tupla (resultado, segundos)
+    """
+    start = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - start
+
+def run(n_rows, seed = 0):
+    """ Esta função tem a responsabilidade de comparar a leitura + limpeza original com a versão vetorizada sobre um CSV sintético.
+
+        Input:  1. Número de linhas do CSV sintético;
+                2. Semente do gerador aleatório.
+        Output: Dicionário com os tempos (s) e a memória (MB) de cada versão.
+    """
+    with tempfile.TemporaryDirectory() as tmp:
+        path = write_train_csv(os.path.join(tmp, 'train.csv'), n_rows, seed = seed)
+
+        raw_old, read_old = timed(pd.read_csv, path)
+        old, clean_old = timed(clean_code_legacy, raw_old)
+
+        raw_new, read_new = timed(read_raw, path)
+        new, clean_new = timed(clean_code, raw_new)
+
+    # As duas versões devem descartar exatamente as mesmas linhas
+    assert old.index.equals(new.index)
+
+    return {
+        'rows': n_rows,
+        'read_before_s': read_old,
+        'clean_before_s': clean_old,
+        'read_after_s': read_new,
+        'clean_after_s': clean_new,
+        'memory_before_mb': old.memory_usage(deep = True).sum() / 2**20,
+        'memory_after_mb': new.memory_usage(deep = True).sum() / 2**20}
+
+# ==========================================================================================================================
+# INÍCIO DA ESTRUTURA LÓGICA DO CÓDIGO
+# ==========================================================================================================================
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description = 'Benchmark da limpeza do dataset (antes x depois).')
+    parser.add_argument('--rows', type = int, default = 1_000_000)
+    parser.add_argument('--seed', type = int, default = 0)
+    args = parser.parse_args()
+
+    result = run(args.rows, args.seed)
+    print('Linhas: {:,}'.format(result['rows']))
+    print('Leitura   antes: {:7.2f} s | depois: {:7.2f} s'.format(result['read_before_s'], result['read_after_s']))
+    print('Limpeza   antes: {:7.2f} s | depois: {:7.2f} s | {:.1f}x mais rápida'.format(
+        result['clean_before_s'], result['clean_after_s'], result['clean_before_s'] / result['clean_after_s']))
+    print('Memória   antes: {:7.1f} MB | depois: {:7.1f} MB | {:.1f}x menor'.format(
+        result['memory_before_mb'], result['memory_after_mb'], result['memory_before_mb'] / result['memory_after_mb']))
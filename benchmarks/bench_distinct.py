@@ -0,0 +1,112 @@
+# ==========================================================================================================================
+# IMPORTANDO BIBLIOTECAS NECESSÁRIAS
+# ==========================================================================================================================
+import argparse
+
+import numpy as np
+
+from benchmarks.bench_clean_code import timed
+from benchmarks.synthetic import generate_train
+from utils.data import clean_code
+from utils.sketches import count_distinct_codes
+from utils.weekly import WeeklyStore, week_start
+
+# ==========================================================================================================================
+# CONFIGURAÇÕES INCIAIS
+# ==========================================================================================================================
+# Precisão padrão do HyperLogLog (erro padrão de ~1.04 / sqrt(2**p), cerca de 1,6% com p = 12)
+DEFAULT_PRECISION = 12
+
+# ==========================================================================================================================
+# FUNÇÕES
+# ==========================================================================================================================
+def nunique_strings(df1):
+    """ Esta função reproduz a contagem original sobre os IDs em texto (referência "antes"): total e por semana.
+
+        Input:  Dataframe com 'Order_Date' e 'Delivery_person_ID' (object)
+        Output: Tupla (total, Series por semana)
+    """
+    weeks = week_start(df1['Order_Date'])
+    return df1['Delivery_person_ID'].nunique(), df1.groupby(weeks)['Delivery_person_ID'].nunique()
+
+def distinct_codes(df1):
+    """ Esta função tem a responsabilidade de contar os entregadores distintos (total e por semana) sobre os códigos do dicionário.
+
+        Input:  Dataframe com 'Order_Date' e 'Delivery_person_ID' (categórico)
+        Output: Tupla (total, array por semana)
+    """
+    couriers = df1['Delivery_person_ID']
+    total = count_distinct_codes(couriers.cat.codes.to_numpy(), len(couriers.cat.categories))
+    return total, df1.groupby(week_start(df1['Order_Date']))['Delivery_person_ID'].nunique().to_numpy()
+
+def distinct_store(store):
+    """ Esta função tem a responsabilidade de responder às contagens (total e por semana) a partir de uma série diária já construída.
+
+        Input:  WeeklyStore
+        Output: Tupla (total, array por semana)
+    """
+    return store.distinct_couriers(), store.select()['Delivery_person_ID (nunique)'].to_numpy()
+
+def run(n_rows, n_couriers, precision = DEFAULT_PRECISION, seed = 0):
+    """ Esta função tem a responsabilidade de comparar as contagens de entregadores distintos sobre um Dataframe sintético:
+        texto (nunique), códigos do dicionário, série diária exata e série diária com HyperLogLog (uniões de sketches por dia).
+
+        Input:  1. Número de linhas;
+                2. Número de entregadores distintos;
+                3. Precisão do HyperLogLog;
+                4. Semente do gerador aleatório.
+        Output: Dicionário com os tempos (s), as memórias (MB) e o erro relativo máximo do HyperLogLog.
+    """
+    df1 = clean_code(generate_train(n_rows, seed = seed, n_couriers = n_couriers))[['Order_Date', 'Road_traffic_density',
+                                                                                   'Delivery_person_ID']]
+    strings = df1.astype({'Delivery_person_ID': 'object'})
+
+    (total, weekly), strings_s = timed(nunique_strings, strings)
+    (total_codes, weekly_codes), codes_s = timed(distinct_codes, df1)
+
+    exact, build_exact_s = timed(WeeklyStore.build, df1)
+    (total_exact, weekly_exact), query_exact_s = timed(distinct_store, exact)
+
+    hll, build_hll_s = timed(WeeklyStore.build, df1, precision)
+    (total_hll, weekly_hll), query_hll_s = timed(distinct_store, hll)
+
+    # As contagens exatas devem coincidir com as do texto
+    assert total == total_codes == total_exact
+    assert np.array_equal(weekly.to_numpy(), weekly_codes) and np.array_equal(weekly.to_numpy(), weekly_exact)
+
+    errors = np.abs(np.append(weekly_hll, total_hll) / np.append(weekly.to_numpy(), total) - 1)
+    return {
+        'rows': n_rows,
+        'couriers': total,
+        'strings_s': strings_s,
+        'codes_s': codes_s,
+        'build_exact_s': build_exact_s,
+        'query_exact_s': query_exact_s,
+        'build_hll_s': build_hll_s,
+        'query_hll_s': query_hll_s,
+        'hll_max_error': errors.max(),
+        'memory_strings_mb': strings['Delivery_person_ID'].memory_usage(deep = True) / 2**20,
+        'memory_codes_mb': df1['Delivery_person_ID'].memory_usage(deep = True) / 2**20,
+        'memory_exact_mb': exact.couriers.memory_usage(deep = True).sum() / 2**20,
+        'memory_hll_mb': hll.couriers.memory_usage(deep = True).sum() / 2**20}
+
+# ==========================================================================================================================
+# INÍCIO DA ESTRUTURA LÓGICA DO CÓDIGO
+# ==========================================================================================================================
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description = 'Benchmark da contagem de entregadores distintos (texto x códigos x HyperLogLog).')
+    parser.add_argument('--rows', type = int, default = 1_000_000)
+    parser.add_argument('--couriers', type = int, default = 100_000)
+    parser.add_argument('--precision', type = int, default = DEFAULT_PRECISION)
+    parser.add_argument('--seed', type = int, default = 0)
+    args = parser.parse_args()
+
+    result = run(args.rows, args.couriers, args.precision, args.seed)
+    print('Linhas: {:,} | entregadores distintos: {:,}'.format(result['rows'], result['couriers']))
+    print('nunique (texto)          : {:7.3f} s | {:7.1f} MB'.format(result['strings_s'], result['memory_strings_mb']))
+    print('Códigos do dicionário    : {:7.3f} s | {:7.1f} MB | {:.1f}x mais rápida'.format(
+        result['codes_s'], result['memory_codes_mb'], result['strings_s'] / result['codes_s']))
+    print('Série diária exata       : {:7.3f} s de construção | {:7.3f} s por consulta | {:7.1f} MB'.format(
+        result['build_exact_s'], result['query_exact_s'], result['memory_exact_mb']))
+    print('Série diária HyperLogLog : {:7.3f} s de construção | {:7.3f} s por consulta | {:7.1f} MB | erro máximo {:.2%}'.format(
+        result['build_hll_s'], result['query_hll_s'], result['memory_hll_mb'], result['hll_max_error']))
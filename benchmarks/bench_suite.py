@@ -0,0 +1,248 @@
+# ==========================================================================================================================
+# IMPORTANDO BIBLIOTECAS NECESSÁRIAS
+# ==========================================================================================================================
+import argparse
+import ast
+import gc
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from benchmarks.synthetic import write_train_csv
+from utils.couriers import CourierStats
+from utils.cube import OrderCube
+from utils.data import clean_code, read_raw
+from utils.engine import (central_locations, ratings_by_courier, ratings_by_traffic, ratings_by_weather, time_by_city,
+                          time_by_city_and_order_type, time_by_city_and_traffic)
+from utils.filters import FilterIndex
+from utils.locations import LocationSketch
+from utils.metrics import METRIC_COLUMNS, compute_metrics
+from utils.partitions import read_manifest, read_partitions, write_partitions
+from utils.prefix import DailyPrefix
+from utils.rankings import rank_couriers
+from utils.weekly import WeeklyStore
+
+# ==========================================================================================================================
+# CONFIGURAÇÕES INCIAIS
+# ==========================================================================================================================
+# Tamanhos padrão dos datasets sintéticos (o de 10M linhas precisa de alguns GB de memória e é executado com '--rows')
+DEFAULT_SIZES = [10_000, 100_000, 1_000_000]
+
+# Tamanho do dataset da execução de aquecimento (imports tardios e templates do plotly não entram nas medições)
+WARMUP_ROWS = 1_000
+
+# Páginas cujas funções são medidas
+PAGES = {'empresa': 'pages/1_Visão_Empresa.py', 'entregadores': 'pages/2_Visão_Entregadores.py',
+         'restaurantes': 'pages/3_Visão_Restaurantes.py'}
+
+# Estado dos filtros da barra lateral usado nas medições (um recorte típico, e não o dataset inteiro)
+FILTERS = {'date_min': '2022-02-20', 'date_max': '2022-03-20', 'Road_traffic_density': ['Low', 'Medium', 'Jam']}
+
+# Uma etapa só é considerada regressão quando fica TOLERANCE vezes pior que o baseline e também pior por mais que
+# MIN_SECONDS / MIN_MB (evitando alarmes falsos nas etapas de poucos milissegundos)
+TOLERANCE = 1.5
+MIN_SECONDS = 0.005
+MIN_MB = 1.0
+
+# ==========================================================================================================================
+# FUNÇÕES
+# ==========================================================================================================================
+def page_functions(path):
+    """ Esta função tem a responsabilidade de carregar as funções de uma página sem executá-la: somente os imports, as constantes
+        literais (como rótulos usados pelos gráficos) e as definições de funções do script são executados, então nenhum comando 'st.*'
+        do corpo da página roda e não é preciso um runtime do Streamlit.
+
+        Input:  Caminho do script da página
+        Output: Dicionário {nome: função}
+    """
+    def is_literal(node):
+        try:
+            ast.literal_eval(node)
+        except ValueError:
+            return False
+        return True
+
+    with open(path, encoding = 'utf-8') as file:
+        tree = ast.parse(file.read(), filename = path)
+    tree.body = [node for node in tree.body if isinstance(node, (ast.Import, ast.ImportFrom, ast.FunctionDef))
+                 or (isinstance(node, ast.Assign) and is_literal(node.value))]
+    namespace = {'__name__': 'page'}
+    exec(compile(tree, path, 'exec'), namespace)
+    return {name: value for name, value in namespace.items() if callable(value) and getattr(value, '__module__', None) == 'page'}
+
+def measure(func, *args, repeat = 3):
+    """ Esta função tem a responsabilidade de medir uma etapa: o menor tempo de 'repeat' execuções e o pico de memória alocada
+        (via tracemalloc, em uma execução à parte, para que o rastreamento não distorça o tempo).
+
+        Input:  1. Função e seus argumentos;
+                2. Quantidade de execuções cronometradas.
+        Output: Tupla (resultado, segundos, pico de memória em MB)
+    """
+    seconds = []
+    for _ in range(max(repeat, 1)):
+        start = time.perf_counter()
+        result = func(*args)
+        seconds.append(time.perf_counter() - start)
+        del result
+        gc.collect()
+
+    tracemalloc.start()
+    result = func(*args)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return result, min(seconds), peak / 2**20
+
+def run(n_rows, seed = 0, repeat = 3):
+    """ Esta função tem a responsabilidade de medir cada etapa dos dados das páginas sobre um CSV sintético:
+        leitura e limpeza, construção das estruturas derivadas, filtros, métricas e cada função de gráfico das páginas.
+
+        Input:  1. Número de linhas do CSV sintético;
+                2. Semente do gerador aleatório;
+                3. Quantidade de execuções cronometradas de cada etapa.
+        Output: Dicionário {etapa: {'seconds': tempo, 'peak_mb': pico de memória}}
+    """
+    pages = {name: page_functions(path) for name, path in PAGES.items()}
+    empresa, entregadores, restaurantes = pages['empresa'], pages['entregadores'], pages['restaurantes']
+    traffic = FILTERS['Road_traffic_density']
+    stages = {}
+
+    def stage(name, func, *args):
+        result, seconds, peak_mb = measure(func, *args, repeat = repeat)
+        stages[name] = {'seconds': seconds, 'peak_mb': peak_mb}
+        return result
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = write_train_csv(os.path.join(tmp, 'train.csv'), n_rows, seed = seed)
+        raw = stage('read_raw', read_raw, path)
+    df1 = stage('clean_code', clean_code, raw)
+    del raw
+    df1 = df1.sort_values('Order_Date', kind = 'stable').reset_index(drop = True)
+
+    # Estruturas derivadas, construídas uma vez por versão do dataset
+    cube = stage('build_cube', OrderCube.build, df1)
+    index = stage('build_filter_index', FilterIndex, df1)
+    weekly_store = stage('build_weekly_store', WeeklyStore.build, df1)
+    locations = stage('build_location_sketch', LocationSketch.build, df1)
+    couriers = stage('build_courier_stats', CourierStats.build, df1)
+    prefix = stage('build_daily_prefix', DailyPrefix.build, cube)
+
+    # Filtros da barra lateral
+    cube = stage('select_cube', lambda: cube.select(**FILTERS))
+    window = stage('select_window', lambda: prefix.select(**FILTERS))
+    filtered = stage('select_rows', lambda: index.select(df1, **FILTERS))
+    weekly = stage('select_weekly', lambda: weekly_store.select(FILTERS['date_min'], FILTERS['date_max'], traffic))
+    locations = stage('select_locations', lambda: locations.select(FILTERS['date_min'], FILTERS['date_max'], traffic))
+    couriers = stage('select_couriers', lambda: couriers.select(**FILTERS))
+    metrics = stage('compute_metrics', compute_metrics, filtered)
+
+    # Layout particionado: gravação das partições (uma vez por versão) e leitura somente das partições do recorte
+    with tempfile.TemporaryDirectory() as tmp:
+        stage('write_partitions', write_partitions, df1, tmp)
+        entries = read_manifest(tmp)
+        stage('read_partitions', lambda: read_partitions(entries, columns = METRIC_COLUMNS, **FILTERS))
+
+    # Visão Empresa
+    stage('empresa.order_by_day', empresa['order_by_day'], cube)
+    for name in ['traffic_order_share', 'city_and_traffic_order_share']:
+        stage('empresa.' + name, empresa[name], window)
+    for name in ['order_by_week', 'week_personID_order_share', 'order_growth']:
+        stage('empresa.' + name, empresa[name], weekly)
+    stage('empresa.order_map (aggregation)', central_locations, locations)
+    stage('empresa.order_map', empresa['order_map'], locations)
+
+    # Visão Entregadores
+    stage('entregadores.ratings_by_courier', ratings_by_courier, couriers)
+    stage('entregadores.ratings_by_traffic', ratings_by_traffic, window)
+    stage('entregadores.ratings_by_weather', ratings_by_weather, window)
+    stage('entregadores.top_stats', lambda: [entregadores['top_stats'](ranking) for ranking in
+                                             rank_couriers(couriers.means('Time_taken(min)', ['City', 'Delivery_person_ID'])).values()])
+
+    # Visão Restaurantes
+    stage('restaurantes.distance (fig)', restaurantes['distance'], window, metrics, 'fig')
+    stage('restaurantes.distance (med)', restaurantes['distance'], window, metrics, 'med')
+    festival = stage('restaurantes.festival', window.mean_std, 'Time_taken(min)', 'Festival')
+    stage('restaurantes.time_metric', lambda: [restaurantes['time_metric'](festival, metric, fest)
+                                               for metric in ['Avg_time', 'Std_time'] for fest in ['Yes', 'No']])
+    stage('restaurantes.time_by_city', time_by_city, window)
+    stage('restaurantes.time_by_city_and_order_type', time_by_city_and_order_type, window)
+    stage('restaurantes.time_by_city_and_traffic', time_by_city_and_traffic, window)
+
+    return stages
+
+def compare(results, baseline, tolerance = TOLERANCE):
+    """ Esta função tem a responsabilidade de comparar as medições com um baseline salvo, apontando as etapas que pioraram.
+
+        Input:  1. Medições {linhas: {etapa: {'seconds', 'peak_mb'}}};
+                2. Baseline no mesmo formato;
+                3. Razão máxima aceita entre a medição e o baseline.
+        Output: Lista de textos descrevendo as regressões (vazia quando não há nenhuma)
+    """
+    regressions = []
+    for rows, stages in results.items():
+        for name, current in stages.items():
+            previous = baseline.get(rows, {}).get(name)
+            if previous is None:
+                continue
+            for metric, minimum, unit in [('seconds', MIN_SECONDS, 's'), ('peak_mb', MIN_MB, 'MB')]:
+                if current[metric] > previous[metric] * tolerance and current[metric] - previous[metric] > minimum:
+                    regressions.append('{} linhas | {}: {:.3f} {} -> {:.3f} {} ({:.1f}x)'.format(
+                        rows, name, previous[metric], unit, current[metric], unit, current[metric] / max(previous[metric], 1e-12)))
+    return regressions
+
+def report(rows, stages, baseline = None):
+    """ Esta função tem a responsabilidade de imprimir as medições de um tamanho de dataset, ao lado do baseline quando houver.
+
+        Input:  1. Número de linhas;
+                2. Medições {etapa: {'seconds', 'peak_mb'}};
+                3. Medições do baseline para o mesmo tamanho (opcional).
+        Output: Nenhum.
+    """
+    print('\nLinhas: {:,}'.format(int(rows)))
+    print('{:<45} {:>10} {:>10} {:>12}'.format('Etapa', 'Tempo (s)', 'Pico (MB)', 'vs baseline'))
+    for name, current in stages.items():
+        previous = (baseline or {}).get(name)
+        ratio = '{:.2f}x'.format(current['seconds'] / max(previous['seconds'], 1e-12)) if previous else '-'
+        print('{:<45} {:>10.4f} {:>10.1f} {:>12}'.format(name, current['seconds'], current['peak_mb'], ratio))
+
+# ==========================================================================================================================
+# INÍCIO DA ESTRUTURA LÓGICA DO CÓDIGO
+# ==========================================================================================================================
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description = 'Benchmark das etapas de dados do dashboard (tempo e pico de memória por etapa).')
+    parser.add_argument('--rows', type = int, nargs = '+', default = DEFAULT_SIZES,
+                        help = 'tamanhos dos datasets sintéticos, por exemplo --rows 10000 100000 1000000 10000000')
+    parser.add_argument('--seed', type = int, default = 0)
+    parser.add_argument('--repeat', type = int, default = 3)
+    parser.add_argument('--baseline', help = 'JSON de uma execução anterior, para comparação')
+    parser.add_argument('--save', help = 'grava as medições em JSON (por exemplo, para servir de baseline)')
+    parser.add_argument('--tolerance', type = float, default = TOLERANCE)
+    args = parser.parse_args()
+
+    baseline = {}
+    if args.baseline:
+        with open(args.baseline) as file:
+            baseline = json.load(file)
+
+    run(WARMUP_ROWS, args.seed, repeat = 1)
+
+    # As chaves são textos para que o JSON salvo e as medições atuais sejam comparáveis
+    results = {}
+    for n_rows in args.rows:
+        results[str(n_rows)] = run(n_rows, args.seed, args.repeat)
+        report(n_rows, results[str(n_rows)], baseline.get(str(n_rows)))
+        gc.collect()
+
+    if args.save:
+        with open(args.save, 'w') as file:
+            json.dump(results, file, indent = 2)
+        print('\nMedições gravadas em {}'.format(args.save))
+
+    if args.baseline:
+        regressions = compare(results, baseline, args.tolerance)
+        print('\nRegressões em relação a {}: {}'.format(args.baseline, len(regressions)))
+        for regression in regressions:
+            print('  ' + regression)
+        sys.exit(1 if regressions else 0)
@@ -0,0 +1,130 @@
+# ==========================================================================================================================
+# IMPORTANDO BIBLIOTECAS NECESSÁRIAS
+# ==========================================================================================================================
+import argparse
+import ast
+import os
+import subprocess
+import sys
+
+# ==========================================================================================================================
+# CONFIGURAÇÕES INCIAIS
+# ==========================================================================================================================
+# Scripts do dashboard cujas importações são medidas
+SCRIPTS = ['Home.py', 'pages/1_Visão_Empresa.py', 'pages/2_Visão_Entregadores.py', 'pages/3_Visão_Restaurantes.py']
+
+# Módulos que o runtime do Streamlit já carregou quando uma página roda (o custo deles não é atribuído às páginas)
+PRELUDE = ['streamlit']
+
+# Orçamento padrão (s) das importações de cada script, além das do PRELUDE
+DEFAULT_BUDGET = 0.25
+
+# Módulos pesados que nenhum script deve importar ao carregar: são importados apenas nos caminhos que os usam
+# (o folium, por exemplo, somente quando o mapa é construído)
+DEFERRED_MODULES = ['folium', 'streamlit_folium', 'haversine', 'matplotlib']
+
+# Separador, na saída do '-X importtime', entre as importações do PRELUDE e as do script
+MARKER = '--- script imports ---'
+
+# ==========================================================================================================================
+# FUNÇÕES
+# ==========================================================================================================================
+def script_imports(path):
+    """ Esta função tem a responsabilidade de extrair as importações de primeiro nível de um script, sem executá-lo.
+
+        Input:  Caminho do script
+        Output: Código Python (str) somente com os 'import' e 'from ... import' do script
+    """
+    with open(path, encoding = 'utf-8') as file:
+        tree = ast.parse(file.read(), filename = path)
+    return ast.unparse(ast.Module([node for node in tree.body if isinstance(node, (ast.Import, ast.ImportFrom))], []))
+
+def import_times(path, prelude = PRELUDE):
+    """ Esta função tem a responsabilidade de medir, com o 'python -X importtime' em um processo novo, as importações de um script
+        feitas depois das do PRELUDE (ou seja, o custo que o script acrescenta ao primeiro carregamento da página).
+
+        Input:  1. Caminho do script;
+                2. Módulos importados antes do script.
+        Output: Lista de tuplas (módulo, tempo próprio em s, tempo acumulado em s, nível), na ordem da saída do importtime
+    """
+    code = '\n'.join(['import ' + module for module in prelude] +
+                     ['import sys', 'sys.stderr.write({!r})'.format(MARKER + '\n'), script_imports(path)])
+    env = dict(os.environ, PYTHONPATH = os.pathsep.join(filter(None, [os.getcwd(), os.environ.get('PYTHONPATH')])))
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', code], capture_output = True, text = True, env = env)
+    if result.returncode != 0:
+        raise RuntimeError('Importing the modules of {} failed:\n{}'.format(path, result.stderr[-2000:]))
+
+    rows = []
+    for line in result.stderr.split(MARKER + '\n', 1)[-1].splitlines():
+        if not line.startswith('import time:'):
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|')
+        if not self_us.strip().isdigit():
+            continue
+        level = (len(name) - len(name.lstrip())) // 2
+        rows.append((name.strip(), int(self_us) / 1e6, int(cumulative_us) / 1e6, level))
+
+    top = min((level for *_, level in rows), default = 0)
+    return [(name, own, cumulative, level - top) for name, own, cumulative, level in rows]
+
+def summarize(rows):
+    """ Esta função tem a responsabilidade de resumir as medições de um script.
+
+        Input:  Lista de 'import_times()'
+        Output: Dicionário com 'total' (s), 'modules' ({módulo de primeiro nível: tempo acumulado}) e 'loaded' (todos os módulos carregados)
+    """
+    modules = {name: cumulative for name, _, cumulative, level in rows if level == 0}
+    return {'total': sum(modules.values()), 'modules': modules, 'loaded': {name for name, *_ in rows}}
+
+def check(results, budget = DEFAULT_BUDGET, deferred = DEFERRED_MODULES):
+    """ Esta função tem a responsabilidade de apontar os scripts acima do orçamento ou que importam módulos adiados.
+
+        Input:  1. Resumos {script: 'summarize()'};
+                2. Orçamento (s) por script;
+                3. Módulos que não devem ser importados ao carregar os scripts.
+        Output: Lista de textos descrevendo as violações (vazia quando não há nenhuma)
+    """
+    violations = []
+    for path, summary in results.items():
+        if summary['total'] > budget:
+            violations.append('{}: {:.3f} s de importações (orçamento de {:.3f} s)'.format(path, summary['total'], budget))
+        for module in deferred:
+            if module in summary['loaded']:
+                violations.append('{}: importa {!r} ao carregar'.format(path, module))
+    return violations
+
+def report(path, summary, top = 8):
+    """ Esta função tem a responsabilidade de imprimir o total e os módulos de primeiro nível mais caros de um script.
+
+        Input:  1. Caminho do script;
+                2. Resumo de 'summarize()';
+                3. Quantidade de módulos listados.
+        Output: Nenhum.
+    """
+    print('\n{} | {:.3f} s'.format(path, summary['total']))
+    for name, seconds in sorted(summary['modules'].items(), key = lambda item: -item[1])[:top]:
+        print('  {:<45} {:>8.3f} s'.format(name, seconds))
+
+# ==========================================================================================================================
+# INÍCIO DA ESTRUTURA LÓGICA DO CÓDIGO
+# ==========================================================================================================================
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description = 'Tempo de importação de cada script do dashboard (como o python -X importtime), '
+                                                   'com orçamento e módulos que só podem ser importados sob demanda.')
+    parser.add_argument('scripts', nargs = '*', default = SCRIPTS)
+    parser.add_argument('--budget', type = float, default = DEFAULT_BUDGET, help = 'orçamento (s) das importações de cada script')
+    parser.add_argument('--repeat', type = int, default = 3, help = 'medições por script (vale a menor)')
+    parser.add_argument('--top', type = int, default = 8)
+    args = parser.parse_args()
+
+    results = {}
+    for path in args.scripts:
+        summaries = [summarize(import_times(path)) for _ in range(max(args.repeat, 1))]
+        results[path] = min(summaries, key = lambda summary: summary['total'])
+        report(path, results[path], args.top)
+
+    violations = check(results, args.budget)
+    print('\nViolações: {}'.format(len(violations)))
+    for violation in violations:
+        print('  ' + violation)
+    sys.exit(1 if violations else 0)
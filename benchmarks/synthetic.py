@@ -0,0 +1,92 @@
+# ==========================================================================================================================
+# IMPORTANDO BIBLIOTECAS NECESSÁRIAS
+# ==========================================================================================================================
+import numpy as np
+import pandas as pd
+
+# ==========================================================================================================================
+# CONFIGURAÇÕES INCIAIS
+# ==========================================================================================================================
+# Valores possíveis das colunas categóricas, já com os espaços (typos) presentes no dataset original
+CITIES = ['Urban ', 'Metropolitian ', 'Semi-Urban ']
+TRAFFIC = ['Low ', 'Medium ', 'High ', 'Jam ']
+WEATHER = ['conditions Cloudy', 'conditions Fog', 'conditions Sandstorms', 'conditions Stormy', 'conditions Sunny', 'conditions Windy']
+ORDER_TYPES = ['Snack ', 'Meal ', 'Drinks ', 'Buffet ']
+VEHICLES = ['motorcycle ', 'scooter ', 'electric_scooter ']
+ORDER_TIMES = ['08:30:00', '11:30:00', '13:15:00', '17:45:00', '19:45:00', '21:10:00', '22:35:00']
+
+# Proporção de linhas com dados ausentes ('NaN ') em cada coluna que os possui no dataset original
+NAN_SHARE = 0.01
+
+# Quantidade de linhas geradas e gravadas de cada vez nos CSVs grandes, para limitar a memória usada
+CSV_CHUNK_ROWS = 1_000_000
+
+# ==========================================================================================================================
+# FUNÇÕES
+# ==========================================================================================================================
+def generate_train(n_rows, seed = 0, start = '2022-02-11', end = '2022-04-06', n_couriers = 1320, first_id = 0):
+    """ Esta função tem a responsabilidade de gerar um Dataframe sintético com as mesmas colunas e as mesmas peculiaridades do 'dataset/train.csv':
+        textos 'NaN ' como dados ausentes, espaços no final dos textos, prefixo '(min) ' no tempo de entrega e datas no formato dd-mm-aaaa.
+
+        Input:  1. Número de linhas;
+                2. Semente do gerador aleatório;
+                3. Datas inicial e final dos pedidos;
+                4. Número de entregadores distintos;
+                5. Primeiro número usado nos IDs dos pedidos.
+        Output: Dataframe bruto, como lido de um CSV sem tratamento.
+    """
+    rng = np.random.default_rng(seed)
+
+    def pick(values, p = None):
+        return np.asarray(values, dtype = object)[rng.choice(len(values), n_rows, p = p)]
+
+    def with_nan(values, token = 'NaN '):
+        values = np.asarray(values, dtype = object)
+        values[rng.random(n_rows) < NAN_SHARE] = token
+        return values
+
+    dates = pd.date_range(start, end).strftime('%d-%m-%Y')
+    couriers = np.array(['{}RES{:04d}DEL{:02d} '.format(city, i, i % 3 + 1)
+                         for i, city in enumerate(np.resize(['INDO', 'BANG', 'COIMB', 'CHEN', 'HYD', 'RANCHI', 'MYS', 'DEH'], n_couriers))],
+                        dtype = object)
+
+    restaurant_lat = rng.uniform(9.0, 30.0, n_rows).round(6)
+    restaurant_lon = rng.uniform(72.0, 88.0, n_rows).round(6)
+
+    df = pd.DataFrame({
+        'ID': np.char.add(np.char.add('0x', np.char.mod('%x', np.arange(n_rows) + first_id + 0x1000)), ' ').astype(object),
+        'Delivery_person_ID': couriers[rng.integers(0, n_couriers, n_rows)],
+        'Delivery_person_Age': with_nan(rng.integers(20, 40, n_rows).astype(str)),
+        'Delivery_person_Ratings': with_nan(rng.choice(np.arange(25, 51) / 10, n_rows).astype(str)),
+        'Restaurant_latitude': restaurant_lat,
+        'Restaurant_longitude': restaurant_lon,
+        'Delivery_location_latitude': (restaurant_lat + rng.uniform(-0.15, 0.15, n_rows)).round(6),
+        'Delivery_location_longitude': (restaurant_lon + rng.uniform(-0.15, 0.15, n_rows)).round(6),
+        'Order_Date': pick(dates),
+        'Time_Orderd': with_nan(pick(ORDER_TIMES)),
+        'Time_Order_picked': pick(ORDER_TIMES),
+        'Weatherconditions': with_nan(pick(WEATHER), token = 'conditions NaN'),
+        'Road_traffic_density': with_nan(pick(TRAFFIC)),
+        'Vehicle_condition': rng.integers(0, 4, n_rows),
+        'Type_of_order': pick(ORDER_TYPES),
+        'Type_of_vehicle': pick(VEHICLES),
+        'multiple_deliveries': with_nan(rng.integers(0, 4, n_rows).astype(str)),
+        'Festival': with_nan(pick(['No ', 'Yes '], p = [0.98, 0.02])),
+        'City': with_nan(pick(CITIES)),
+        'Time_taken(min)': np.char.add('(min) ', rng.integers(10, 55, n_rows).astype(str)).astype(object)})
+    return df
+
+def write_train_csv(path, n_rows, seed = 0, **kwargs):
+    """ Esta função tem a responsabilidade de gravar em disco um CSV sintético no formato do 'dataset/train.csv'.
+        Acima de CSV_CHUNK_ROWS linhas, o CSV é gerado e gravado em partes (cada uma com a sua semente), para não montar
+        o Dataframe inteiro em memória.
+
+        Input:  1. Caminho do arquivo;
+                2. Número de linhas;
+                3. Semente do gerador aleatório (e demais parâmetros de 'generate_train()').
+        Output: Caminho do arquivo gravado.
+    """
+    for i, first_id in enumerate(range(0, max(n_rows, 1), CSV_CHUNK_ROWS)):
+        chunk = generate_train(min(CSV_CHUNK_ROWS, n_rows - first_id), seed = seed + i, first_id = first_id, **kwargs)
+        chunk.to_csv(path, index = False, mode = 'w' if i == 0 else 'a', header = (i == 0))
+    return path
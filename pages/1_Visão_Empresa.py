@@ -2,17 +2,23 @@
 # IMPORTANDO BIBLIOTECAS NECESSÁRIAS
 # ==========================================================================================================================
 
-from haversine import haversine
-import plotly.graph_objects as go
-import numpy as np
 from datetime import datetime
-from PIL import Image
 import plotly.express as px
-import plotly.graph_objects as go
-import pandas as pd
 import streamlit as st
-import folium
-from streamlit_folium import folium_static
+import streamlit.components.v1 as components
+
+from utils.assets import sidebar_logo
+from utils.backends import get_backend
+from utils.debug import debug_panel, start_rerun
+from utils.engine import (central_locations, order_growth_by_week, orders_by_city_and_traffic, orders_by_day, orders_by_traffic,
+                          orders_by_week, orders_per_courier_by_week)
+from utils.locations import LOCATION_COLS, load_location_sketch
+from utils.maps import cached_map_html, central_locations_map, raw_points_map
+from utils.partitions import load_partitions
+from utils.payload import MAX_CHART_POINTS, aggregate_by_time, downsample
+from utils.profiling import span
+from utils.scheduler import ChartScheduler
+from utils.weekly import ROLLING_WEEKS, load_weekly_store
 
 # ==========================================================================================================================
 # CONFIGURAÇÕES INCIAIS
@@ -23,11 +29,15 @@ st.set_page_config(page_title = 'Visão Empresa', layout = 'wide')
 # Definindo o título da página a ser exibido 
 st.title('Marketplace - Visão Cliente')
 
+# Rótulo do eixo x do gráfico de pedidos de acordo com a granularidade escolhida pelo orçamento de pontos
+DATE_LABELS = {'D': 'Data do pedido', 'W': 'Semana do pedido', 'M': 'Mês do pedido'}
+
 # ==========================================================================================================================
 # FUNÇÕES
 # ==========================================================================================================================
-def order_map(df1):
-    """ Esta função tem a responsabilidade de agrupar parte dos dados de um dataframe e gerar um mapa geográfico contendo a localização central dos pedidos por cada cidade e condição de tráfego. A localização central nada mais é do que o ponto médio dos pedidos.
+def order_map(locations):
+    """ Esta função tem a responsabilidade de gerar um mapa geográfico contendo a localização central dos pedidos por cada cidade e condição de tráfego. A localização central nada mais é do que o ponto médio (mediana) dos pedidos, obtido dos sketches de quantis já recortados pelos filtros: exata por padrão ou, com a opção de medianas aproximadas, com erro relativo de no máximo QUANTILE_ALPHA.
+        Os marcadores são criados em uma única camada GeoJSON.
     
         Dados de interesse:
         1. Coluna das Cidades;
@@ -37,79 +47,90 @@ def order_map(df1):
 
         Objetivo do gráfico gerado: Mapear as localizações centrais para cada pedido do conjunto de dados, informando ao clique, a respectiva condição de tráfego e a cidade.
 
-        Input:  Dataframe
-        Output: Mapa plotado na tela.
+        Input:  LocationSketch
+        Output: Objeto folium.Map
     """
-    # definindo colunas a serem filtradas
-    cols = ['City', 'Road_traffic_density', 'Delivery_location_latitude', 'Delivery_location_longitude']
-    # filtragem das linhas
-    df2 = df1.loc[:, cols].groupby(['City', 'Road_traffic_density']).median().reset_index()
+    # medianas das coordenadas por cidade e condição de tráfego
+    df2 = central_locations(locations)
     df2.rename( columns = {'Delivery_location_latitude' : 'Delivery_location_latitude (median)', 'Delivery_location_longitude' : 'Delivery_location_longitude (median)'}, inplace = True)
     # gerando o mapa geográfico das localizações centrais
-    map = folium.Map()
-    for index, location_info in df2.iterrows():
-      folium.Marker([location_info['Delivery_location_latitude (median)'],
-                     location_info['Delivery_location_longitude (median)']],
-                     popup = location_info[['City', 'Road_traffic_density']]).add_to(map)
-    folium_static(map, width = 1024, height = 600)
-    return
-
-def week_personID_order_share(df1):
-    """ Esta função tem a responsabilidade de agrupar parte dos dados de um dataframe e gerar uma imagem contendo os elementos de um gráfico de linha.
+    return central_locations_map(df2)
+
+def delivery_points_map(date_min, date_max, traffic):
+    """ Esta função tem a responsabilidade de gerar um mapa geográfico contendo cada ponto de entrega do período e das condições de tráfego selecionadas.
+        Os pontos são agrupados em clusters pelo próprio navegador e, acima de MAX_RAW_POINTS, amostrados em intervalos regulares.
+
+        Input:  1. Datas inicial e final (inclusive);
+                2. Condições de tráfego selecionadas.
+        Output: Objeto folium.Map
+    """
+    # somente as coordenadas, lidas apenas das partições do período selecionado
+    df2 = load_partitions(date_min = date_min, date_max = date_max, columns = LOCATION_COLS, Road_traffic_density = traffic)
+    return raw_points_map(df2['Delivery_location_latitude'].to_numpy(), df2['Delivery_location_longitude'].to_numpy())
+
+def week_personID_order_share(weekly):
+    """ Esta função tem a responsabilidade de gerar uma imagem contendo os elementos de um gráfico de linha a partir da série semanal.
     
         Dados de interesse:
-        1. Coluna dos IDs das entregas;
-        2. Coluna das semanas em que cada pedido ocorreu;
-        3. Coluna dos IDs dos entregadores.
+        1. Quantidade de pedidos de cada semana ISO;
+        2. Quantidade de entregadores distintos de cada semana ISO.
 
         Objetivo do gráfico gerado: Quantificar o número médio de pedidos por cada entregador por semana.
 
-        Input:  Dataframe
+        Input:  Série semanal (WeeklyStore.select()) já filtrada
         Output: Objeto fig a ser plotado.
     """
-    # definindo colunas a serem filtradas
-    cols_1 = ['ID','Week_of_year']
-    cols_2 = ['Delivery_person_ID','Week_of_year']
-    # filtragem das linhas
-    df2 = df1.loc[:, cols_1].groupby(['Week_of_year']).count().reset_index()
-    df2.rename(columns = {'ID' : 'ID (count)'}, inplace = True)
-    df3 = df1.loc[:, cols_2].groupby(['Week_of_year']).nunique().reset_index()
-    df3.rename(columns = {'Delivery_person_ID' : 'Delivery_person_ID (nunique)'}, inplace = True)
-    # Mesclando os dataframes 'df1' e 'df2' filtrados anteriormente
-    df4 = pd.merge(df2, df3, how = 'inner')
-    df4['media_por_entreg_unico'] = df4.loc[:, 'ID (count)'] / df4.loc[:, 'Delivery_person_ID (nunique)']
+    # pedidos, entregadores distintos e média de pedidos por entregador em cada semana
+    df4 = downsample(orders_per_courier_by_week(weekly), 'week_start', 'media_por_entreg_unico', MAX_CHART_POINTS)
     # gerando o gráfico de linhas e armazenando-o em 'fig'
     fig = (px.line(df4, x = 'Week_of_year', y = 'media_por_entreg_unico', 
                    labels = {'Week_of_year' : '# Semana do ano', 
                              'media_por_entreg_unico' : 'Média de entregas por entregador'}))
     return fig
 
-def order_by_week(df1):
-    """ Esta função tem a responsabilidade de agrupar parte dos dados de um dataframe e gerar uma imagem contendo os elementos de um gráfico de linha.
+def order_growth(weekly):
+    """ Esta função tem a responsabilidade de gerar uma imagem contendo os elementos de um gráfico de barras a partir da série semanal.
     
         Dados de interesse:
-        1. Coluna dos IDs das entregas;
-        2. Coluna das semanas em que cada pedido ocorreu.
+        1. Crescimento semana a semana (WoW) da quantidade de pedidos;
+        2. Média móvel da quantidade de pedidos.
+
+        Objetivo do gráfico gerado: Acompanhar o crescimento dos pedidos de uma semana para a seguinte.
+
+        Input:  Série semanal (WeeklyStore.select()) já filtrada
+        Output: Objeto fig a ser plotado.
+    """
+    # crescimento semana a semana e média móvel dos pedidos
+    df2 = order_growth_by_week(weekly)
+    # gerando o gráfico de barras e armazenando-o em 'fig'
+    fig = (px.bar(df2, x = 'Week_of_year', y = 'ID (count) (WoW %)',
+                  hover_data = ['ID (count)', 'ID (count) (rolling mean)'],
+                  labels = {'Week_of_year' : '# Semana do ano',
+                            'ID (count) (WoW %)' : 'Crescimento em relação à semana anterior (%)',
+                            'ID (count)' : 'Pedidos registrados',
+                            'ID (count) (rolling mean)' : 'Média móvel de {} semanas'.format(ROLLING_WEEKS)}))
+    return fig
+
+def order_by_week(weekly):
+    """ Esta função tem a responsabilidade de gerar uma imagem contendo os elementos de um gráfico de linha a partir da série semanal.
+    
+        Dados de interesse:
+        1. Quantidade de pedidos de cada semana ISO.
 
         Objetivo do gráfico gerado: Quantificar o número de pedidos por semana.
 
-        Input:  Dataframe
+        Input:  Série semanal (WeeklyStore.select()) já filtrada
         Output: Objeto fig a ser plotado.
     """
-    # criando uma coluna de semana
-    df1['Week_of_year'] = df1['Order_Date'].dt.strftime( '%U')
-    # definindo colunas a serem filtradas
-    cols = ['ID', 'Week_of_year']
-    # filtragem das linhas
-    df2 = df1.loc[:, cols].groupby('Week_of_year').count().reset_index()
-    df2.rename(columns = {'ID' : 'ID (count)'}, inplace = True)
+    # contagem dos pedidos por semana ISO (ano e semana)
+    df2 = downsample(orders_by_week(weekly), 'week_start', 'ID (count)', MAX_CHART_POINTS)
     # gerando o gráfico de linhas e armazenando-o em 'fig'
     fig = (px.line(df2, x = 'Week_of_year', y = 'ID (count)', 
                    labels = {'ID (count)': 'Pedidos registrados', 
                              'Week_of_year' : '# Semana do ano'}))
     return fig
 
-def city_and_traffic_order_share(df1):
+def city_and_traffic_order_share(query):
     """ Esta função tem a responsabilidade de agrupar parte dos dados de um dataframe e gerar uma imagem contendo os elementos de um gráfico de pontos.
     
         Dados de interesse:
@@ -119,21 +140,18 @@ def city_and_traffic_order_share(df1):
 
         Objetivo do gráfico gerado: Quantificar a porcentagem de pedidos realizados por cidade em cada uma das condições de trânsito.
 
-        Input:  Dataframe
+        Input:  Consulta do backend ('get_backend().select()') já filtrada
         Output: Objeto fig a ser plotado.
     """
-    # definindo colunas a serem filtradas
-    cols = ['Road_traffic_density', 'City', 'ID']
-    # filtragem das linhas
-    df2 = df1.loc[:, cols].groupby(['Road_traffic_density', 'City']).count().reset_index()
-    df2.rename(columns = {'ID' : 'ID (count)'}, inplace= True)
+    # contagem dos pedidos pelo backend das consultas
+    df2 = orders_by_city_and_traffic(query)
     # gerando o gráfico de linhas e armazenando-o em 'fig'
     fig = (px.scatter(df2, x = 'Road_traffic_density', y = 'City', 
                       size = 'ID (count)', labels = {'ID (count)': 'Pedidos registrados', 
                                'City' : 'Cidade', 'Road_traffic_density' : 'Densidade do tráfego'}))
     return fig
 
-def traffic_order_share(df1):
+def traffic_order_share(query):
     """ Esta função tem a responsabilidade de agrupar parte dos dados de um dataframe e gerar uma imagem contendo os elementos de um gráfico de pizza.
     
         Dados de interesse:
@@ -142,194 +160,196 @@ def traffic_order_share(df1):
 
         Objetivo do gráfico gerado: Quantificar a porcentagem de pedidos realizados em cada uma das condições de trânsito.
 
-        Input:  Dataframe
+        Input:  Consulta do backend ('get_backend().select()') já filtrada
         Output: Objeto fig a ser plotado.
     """
-    # definindo colunas a serem filtradas
-    cols = ['ID', 'Road_traffic_density']
-    # filtragem das linhas
-    df2 = df1.loc[:, cols].groupby('Road_traffic_density').count().reset_index()
-    df2.rename(columns = {'ID' : 'ID (count)'}, inplace= True)
-    df2['Delivery_percents_by_traffic'] = df2['ID (count)']/df2['ID (count)'].sum()
+    # contagem e participação dos pedidos pelo backend das consultas
+    df2 = orders_by_traffic(query)
     # gerando o gráfico de linhas e armazenando-o em 'fig'
     fig = px.pie(df2, values = 'Delivery_percents_by_traffic', names = 'Road_traffic_density')
     return fig
 
-def order_by_day(df1):
+def order_by_day(query):
     """ Esta função tem a responsabilidade de agrupar parte dos dados de um dataframe e gerar uma imagem contendo os elementos de um gráfico de barras.
     
         Dados de interesse:
         1. Coluna dos IDs das entregas;
         2. Coluna das datas em que cada pedido ocorreu.
 
-        Objetivo do gráfico gerado: Relacionar os pedidos realizados por suas respectivas datas.
+        Objetivo do gráfico gerado: Relacionar os pedidos realizados por suas respectivas datas. Acima de MAX_CHART_POINTS datas,
+        os pedidos são somados por semana (ou por mês), para que o gráfico enviado ao navegador não cresça com o histórico.
 
-        Input:  Dataframe
+        Input:  Consulta do backend ('get_backend().select()') já filtrada
         Output: Objeto fig a ser plotado.
     """
-    # definindo colunas a serem filtradas
-    cols = ['ID', 'Order_Date']
-    # filtragem das linhas
-    df2 = df1.loc[:, cols].groupby('Order_Date').count().reset_index()
-    df2.rename( columns = {'ID':'ID (count)'}, inplace = True)
+    # contagem dos pedidos pelo backend das consultas, somada em períodos mais longos quando excede o orçamento de pontos
+    df2, freq = aggregate_by_time(orders_by_day(query), 'Order_Date', ['ID (count)'], MAX_CHART_POINTS)
     # gerando o gráfico de linhas e armazenando-o em 'fig'
-    fig = (px.bar(df2, x = 'Order_Date', y= 'ID (count)', labels = {'Order_Date' : 'Data do pedido',
+    fig = (px.bar(df2, x = 'Order_Date', y= 'ID (count)', labels = {'Order_Date' : DATE_LABELS[freq],
                                                                    'ID (count)': 'Pedidos registrados'}))
     return fig
 
-def clean_code(df1):
-    """ Esta função tem a responsabilidade de limpar o dataframe
-
-        Tipos de limpeza:
-        1. Remoção os dados NaN;
-        2. Mudança nos tipos de dados das colunas;
-        3. Remoção dos espaços presentes nos dados strings (typos);
-        4. Formatação da coluna de datas;
-        5. Limpeza da coluna de tempo ( remoção do texto '(min)' da variável numérica.
-
-        Input:  Dataframe
-        Output: Dataframe
-    """
-    # Retirando os espaços indesejados (typos) do conjunto de dados
-    df1.loc[:, 'ID'] = df1.loc[:, 'ID'].str.strip()
-    df1.loc[:, 'Delivery_person_ID'] = df1.loc[:, 'Delivery_person_ID'].str.strip()
-    df1.loc[:, 'Delivery_person_Age'] = df1.loc[:, 'Delivery_person_Age'].str.strip()
-    df1.loc[:, 'Delivery_person_Ratings'] = df1.loc[:, 'Delivery_person_Ratings'].str.strip()
-    df1.loc[:, 'Road_traffic_density'] = df1.loc[:, 'Road_traffic_density'].str.strip()
-    df1.loc[:, 'Type_of_order'] = df1.loc[:, 'Type_of_order'].str.strip()
-    df1.loc[:, 'Type_of_vehicle'] = df1.loc[:, 'Type_of_vehicle'].str.strip()
-    df1.loc[:, 'Festival'] = df1.loc[:, 'Festival'].str.strip()
-    df1.loc[:, 'City'] = df1.loc[:, 'City'].str.strip()
-    
-    # Descartando (dropando) todas as linhas que contenham 'NaN'
-    for i in df1.columns:
-      linhas_excl = df1.loc[:, i] == 'NaN'
-      df1 = df1.loc[~linhas_excl, :]
-    
-    # Convertendo a coluna 'Delivery_person_Age' para o tipo int
-    df1.loc[:, 'Delivery_person_Age'] = df1.loc[:, 'Delivery_person_Age'].astype(int)
-    
-    # Convertendo a coluna 'Delivery_person_Ratings' para o tipo float
-    df1.loc[:, 'Delivery_person_Ratings'] = df1.loc[:, 'Delivery_person_Ratings'].astype(float)
-    
-    # Convertendo a coluna 'Order_Date' para o tipo datetime
-    df1['Order_Date'] = pd.to_datetime(df1.loc[:, 'Order_Date'],dayfirst=True, format = '%d-%m-%Y')
-    
-    # Limpando a coluna "Time_taken (min)" e transformando_a em coluna de inteiros
-    df1['Time_taken(min)'] = df1.loc[:, 'Time_taken(min)'].str.strip(to_strip = '(min) ')
-    df1['Time_taken(min)'] = df1.loc[:, 'Time_taken(min)'].astype(int)
-
-    return df1
-
 # ==========================================================================================================================
 # RESPONDENDO AS QUESTÕES - VISÃO EMPRESA
 # ==========================================================================================================================
 
-# ==========================================================================================================================
-# BARRA LATERAL NO STREAMLIT
-# ==========================================================================================================================
-# Configuração e Upload de uma imagem na parte superior da barra lateral 
-image_path = ('images/logo.jpg')
-image = Image.open( image_path)
-st.sidebar.image( image, width = 240)
-
-# Textos a serem exibidos na barra lateral
-st.sidebar.markdown('# Curry Company')
-st.sidebar.markdown('## Fastest Delivery in Town')
-st.sidebar.markdown("""---""")
-
-st.sidebar.markdown('## Período a ser analisado:')
-# Definindo primeiro filtro a ser aplicado na barra lateral, na forma de um controle deslizante
-date_slider = st.sidebar.slider(
-    'Até qual valor?',
-    value = datetime( 2022, 4, 6),
-    min_value = datetime( 2022, 2, 11),
-    max_value = datetime( 2022, 4, 6),
-    format = 'DD-MM-YYYY',
-    label_visibility='hidden')
-
-st.sidebar.markdown("""---""")
-# Definindo segundo filtro a ser aplicado na barra lateral, na forma de uma lista suspensa
-traffic_options = st.sidebar.multiselect(
-    'Quais as condições do trânsito?',
-    ['Low', 'Medium', 'High', 'Jam'],
-    default = ['Low', 'Medium', 'High', 'Jam'],)
-    
-st.sidebar.markdown("""---""")
-# Uma espécie de "crédito" ao autor da página
-st.sidebar.markdown('### Powered by linkedin.com/in/maltape/')
-
-# ==========================================================================================================================
-# INÍCIO DA ESTRUTURA LÓGICA DO CÓDIGO
-# ==========================================================================================================================
-
-# Importando o dataset
-df = pd.read_csv('dataset/train.csv')
-
-# Limpando os dados
-df1 = clean_code(df)
-
-# ==========================================================================================================================
-# INTEGRANDO OS FILTROS DO STREAMLIT COM OS DADOS
-# ==========================================================================================================================
-
-# Aplicando o filtro de data no Dataframe
-filtro_data = df1['Order_Date'] <= date_slider
-
-# Aplicando o filtro de condição de tráfego no Dataframe
-filtro_trafeg = df1['Road_traffic_density'].isin(traffic_options) 
-
-# Filtrando o Dataframe
-df1 = df1.loc[filtro_data & filtro_trafeg, :]
-
-# ==========================================================================================================================
-# LAYOUT NO STREAMLIT
-# ==========================================================================================================================
-tab1, tab2, tab3 = st.tabs(['Visão Gerencial', 'Visão Tática', 'Visão Geográfica'])
-
-with tab1:
-    
-    with st.container():
-        # Quantidade de pedidos por dia
-        st.header('Pedidos por dia')
-        fig = order_by_day(df1)
-        st.plotly_chart(fig, use_container_width = True)
-        
-    st.markdown("""---""")
-    
-    with st.container():
-        col1, col2 = st.columns(2)
-        
-        with col1:
-            # Quantidade de pedidos por densidade de tráfego
-            st.header('Pedidos por densidade de tráfego')
-            fig = traffic_order_share(df1)
-            st.plotly_chart(fig, use_container_width = True)
-
-        with col2:
-            # Quantidade de pedidos por densidade de tráfego e por cidade
-            st.header('Pedidos por densidade de tráfego e cidade')
-            fig = city_and_traffic_order_share(df1)
-            st.plotly_chart(fig, use_container_width = True)
-
-with tab2:
-    with st.container():
-        # Quantidade de pedidos por semana
-        st.header('Quantidade de pedidos por semana')
-        fig = order_by_week(df1)
-        st.plotly_chart(fig, use_container_width = True)
-        
-    st.markdown("""---""")
-    
-    with st.container():
-        # Quantidade média de pedidos por entregador por semana
-        st.header('A quantidade média de pedidos por entregador por semana')
-        fig = week_personID_order_share(df1)
-        st.plotly_chart( fig, use_container_width = True)
-
-with tab3:
-    # Mapa geográfico das localizações centrais dos pedidos
-    st.header('Mapa geográfico das localizações centrais dos pedidos')
-    order_map(df1)
-
-st.markdown("""---""") 
\ No newline at end of file
+# Registrando os tempos desta execução da página (exibidos no painel de desempenho, quando habilitado). O registro é encerrado
+# no 'finally' mesmo quando a execução é interrompida (erro, nova execução ou parada pedida pelo Streamlit).
+rerun = start_rerun('Visão Empresa')
+try:
+    # ==========================================================================================================================
+    # BARRA LATERAL NO STREAMLIT
+    # ==========================================================================================================================
+    # Configuração e Upload de uma imagem na parte superior da barra lateral 
+    # (reduzida para a largura exibida uma única vez por processo, em 'utils.assets')
+    sidebar_logo()
+
+    # Textos a serem exibidos na barra lateral
+    st.sidebar.markdown('# Curry Company')
+    st.sidebar.markdown('## Fastest Delivery in Town')
+    st.sidebar.markdown("""---""")
+
+    st.sidebar.markdown('## Período a ser analisado:')
+    # Definindo primeiro filtro a ser aplicado na barra lateral, na forma de um controle deslizante
+    date_slider = st.sidebar.slider(
+        'Qual o intervalo?',
+        value = (datetime( 2022, 2, 11), datetime( 2022, 4, 6)),
+        min_value = datetime( 2022, 2, 11),
+        max_value = datetime( 2022, 4, 6),
+        format = 'DD-MM-YYYY',
+        label_visibility='hidden')
+
+    # O controle deslizante tem duas pontas: datas inicial e final (inclusive) do período
+    date_min, date_max = date_slider
+
+    st.sidebar.markdown("""---""")
+    # Definindo segundo filtro a ser aplicado na barra lateral, na forma de uma lista suspensa
+    traffic_options = st.sidebar.multiselect(
+        'Quais as condições do trânsito?',
+        ['Low', 'Medium', 'High', 'Jam'],
+        default = ['Low', 'Medium', 'High', 'Jam'],)
+
+    st.sidebar.markdown("""---""")
+    # Uma espécie de "crédito" ao autor da página
+    st.sidebar.markdown('### Powered by linkedin.com/in/maltape/')
+
+    # ==========================================================================================================================
+    # INÍCIO DA ESTRUTURA LÓGICA DO CÓDIGO
+    # ==========================================================================================================================
+
+    # ==========================================================================================================================
+    # INTEGRANDO OS FILTROS DO STREAMLIT COM OS DADOS
+    # ==========================================================================================================================
+
+    # Aplicando os filtros de data e de condição de tráfego na série semanal (ano ISO, semana ISO)
+    with span('filter: weekly'):
+        weekly = load_weekly_store().select(date_min = date_min, date_max = date_max, traffic = traffic_options)
+
+    # Consultas de pedidos com os mesmos filtros, pelo backend escolhido em CURRY_BACKEND ('utils.backends'): no padrão ('pandas'),
+    # os pedidos por dia vêm do cubo de agregados e os agregados do período inteiro, das somas acumuladas por dia
+    query = get_backend().select(date_min = date_min, date_max = date_max, Road_traffic_density = traffic_options)
+
+    # ==========================================================================================================================
+    # CONSTRUINDO OS GRÁFICOS EM PARALELO
+    # ==========================================================================================================================
+
+    # Os gráficos de todas as abas são construídos ao mesmo tempo, em um pool de threads; a página apenas exibe cada um quando fica pronto
+    charts = ChartScheduler()
+    charts.submit('order_by_day', order_by_day, query)
+    charts.submit('traffic_order_share', traffic_order_share, query)
+    charts.submit('city_and_traffic_order_share', city_and_traffic_order_share, query)
+    charts.submit('order_by_week', order_by_week, weekly)
+    charts.submit('week_personID_order_share', week_personID_order_share, weekly)
+    charts.submit('order_growth', order_growth, weekly)
+
+    # O mapa, o item mais pesado, só é construído depois que o usuário o abre pela primeira vez na aba 'Visão Geográfica'.
+    # O HTML do mapa é reaproveitado enquanto os filtros e o modo de exibição não mudarem.
+    raw_points = st.session_state.get('raw_points', False)
+    approximate = st.session_state.get('approximate_medians', False)
+    map_key = ('points' if raw_points else 'approximate' if approximate else 'central', str(date_slider), tuple(traffic_options))
+    if st.session_state.get('map_opened', False):
+        if raw_points:
+            charts.submit('order_map', cached_map_html, map_key, lambda: delivery_points_map(date_min, date_max, traffic_options))
+        else:
+            charts.submit('order_map', cached_map_html, map_key,
+                          lambda: order_map(load_location_sketch(approximate = approximate).select(date_min = date_min, date_max = date_max,
+                                                                                                   traffic = traffic_options)))
+
+    # ==========================================================================================================================
+    # LAYOUT NO STREAMLIT
+    # ==========================================================================================================================
+    tab1, tab2, tab3 = st.tabs(['Visão Gerencial', 'Visão Tática', 'Visão Geográfica'])
+
+    with tab1:
+
+        with st.container():
+            # Quantidade de pedidos por dia
+            st.header('Pedidos por dia')
+            fig = charts.result('order_by_day')
+            with span('render: order_by_day'):
+                st.plotly_chart(fig, use_container_width = True)
+
+        st.markdown("""---""")
+
+        with st.container():
+            col1, col2 = st.columns(2)
+
+            with col1:
+                # Quantidade de pedidos por densidade de tráfego
+                st.header('Pedidos por densidade de tráfego')
+                fig = charts.result('traffic_order_share')
+                with span('render: traffic_order_share'):
+                    st.plotly_chart(fig, use_container_width = True)
+
+            with col2:
+                # Quantidade de pedidos por densidade de tráfego e por cidade
+                st.header('Pedidos por densidade de tráfego e cidade')
+                fig = charts.result('city_and_traffic_order_share')
+                with span('render: city_and_traffic_order_share'):
+                    st.plotly_chart(fig, use_container_width = True)
+
+    with tab2:
+        with st.container():
+            # Quantidade de pedidos por semana
+            st.header('Quantidade de pedidos por semana')
+            fig = charts.result('order_by_week')
+            with span('render: order_by_week'):
+                st.plotly_chart(fig, use_container_width = True)
+
+        st.markdown("""---""")
+
+        with st.container():
+            # Quantidade média de pedidos por entregador por semana
+            st.header('A quantidade média de pedidos por entregador por semana')
+            fig = charts.result('week_personID_order_share')
+            with span('render: week_personID_order_share'):
+                st.plotly_chart( fig, use_container_width = True)
+
+        st.markdown("""---""")
+
+        with st.container():
+            # Crescimento semana a semana da quantidade de pedidos
+            st.header('Crescimento semanal dos pedidos')
+            fig = charts.result('order_growth')
+            with span('render: order_growth'):
+                st.plotly_chart(fig, use_container_width = True)
+
+    with tab3:
+        # Mapa geográfico das localizações centrais dos pedidos
+        st.header('Mapa geográfico das localizações centrais dos pedidos')
+        if 'order_map' in charts.futures:
+            st.toggle('Exibir todos os pontos de entrega', key = 'raw_points')
+            if not raw_points:
+                st.toggle('Medianas aproximadas (sketches de quantis)', key = 'approximate_medians')
+            html = charts.result('order_map')
+            with span('render: order_map'):
+                components.html(html, width = 1024, height = 610)
+        else:
+            st.button('Carregar mapa', on_click = lambda: st.session_state.update(map_opened = True))
+
+    st.markdown("""---""") 
+finally:
+    rerun.finish()
+
+# Exibindo o painel de desempenho, quando habilitado
+debug_panel(rerun)
@@ -0,0 +1,32 @@
+# ==========================================================================================================================
+# IMPORTANDO BIBLIOTECAS NECESSÁRIAS
+# ==========================================================================================================================
+import pytest
+
+from benchmarks.synthetic import write_train_csv
+from utils.ingest import ingest_batch
+
+# ==========================================================================================================================
+# CONFIGURAÇÕES INCIAIS
+# ==========================================================================================================================
+# Linhas do CSV sintético usado pelos testes e do lote ingerido depois dele
+TEST_ROWS = 20_000
+BATCH_ROWS = 2_000
+
+# ==========================================================================================================================
+# FIXTURES
+# ==========================================================================================================================
+@pytest.fixture(scope = 'session')
+def dataset_path(tmp_path_factory):
+    """ CSV sintético no formato do 'dataset/train.csv', gravado uma única vez por sessão de testes.
+    """
+    return write_train_csv(str(tmp_path_factory.mktemp('dataset') / 'train.csv'), TEST_ROWS, seed = 0)
+
+@pytest.fixture(scope = 'session')
+def batched_dataset_path(tmp_path_factory):
+    """ CSV sintético com um lote de pedidos posteriores já ingerido ('utils.ingest'), como após o 'python -m utils.ingest'.
+    """
+    directory = tmp_path_factory.mktemp('batched')
+    path = write_train_csv(str(directory / 'train.csv'), TEST_ROWS, seed = 1)
+    ingest_batch(write_train_csv(str(directory / 'batch.csv'), BATCH_ROWS, seed = 2, start = '2022-04-07', end = '2022-04-30'), path)
+    return path
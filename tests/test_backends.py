@@ -0,0 +1,64 @@
+# ==========================================================================================================================
+# IMPORTANDO BIBLIOTECAS NECESSÁRIAS
+# ==========================================================================================================================
+import math
+
+import pandas as pd
+import pytest
+
+from benchmarks.backend_parity import FILTER_STATES, differences
+from utils.backends import BACKEND_ENV, BACKENDS
+from utils.engine import VIEWS, compute_view
+
+# ==========================================================================================================================
+# CONFIGURAÇÕES INCIAIS
+# ==========================================================================================================================
+# Fontes das visões que aceitam apenas os filtros de data e de condição de tráfego
+TRAFFIC_ONLY_SOURCES = ['locations', 'approximate_locations', 'weekly']
+
+# ==========================================================================================================================
+# FUNÇÕES
+# ==========================================================================================================================
+def view_filters(name, filters):
+    """ Filtros aceitos pela visão: as visões dos sketches e da série semanal aceitam só as datas e o tráfego.
+    """
+    if VIEWS[name][1] in TRAFFIC_ONLY_SOURCES:
+        return {key: value for key, value in filters.items() if key in ['date_min', 'date_max', 'Road_traffic_density']}
+    return filters
+
+def dtypes(result):
+    """ Tipos das colunas (e do índice, no caso de uma Series), com as categorias das colunas categóricas.
+    """
+    frame = result.reset_index() if isinstance(result, pd.Series) else result
+    return {col: (str(dtype), list(dtype.categories) if isinstance(dtype, pd.CategoricalDtype) else None)
+            for col, dtype in frame.dtypes.items()}
+
+def same_metrics(left, right):
+    """ Compara dois dicionários de métricas (NaN é igual a NaN).
+    """
+    if isinstance(left, dict):
+        return left.keys() == right.keys() and all(same_metrics(left[key], right[key]) for key in left)
+    if isinstance(left, tuple):
+        return len(left) == len(right) and all(same_metrics(*pair) for pair in zip(left, right))
+    if isinstance(left, float) and math.isnan(left):
+        return isinstance(right, float) and math.isnan(right)
+    return math.isclose(left, right, rel_tol = 1e-9, abs_tol = 1e-9)
+
+# ==========================================================================================================================
+# TESTES
+# ==========================================================================================================================
+@pytest.mark.parametrize('filters', FILTER_STATES, ids = lambda filters: ','.join(filters) or 'all')
+@pytest.mark.parametrize('name', list(VIEWS))
+def test_backends_agree(batched_dataset_path, monkeypatch, name, filters):
+    results = {}
+    for backend in BACKENDS:
+        monkeypatch.setenv(BACKEND_ENV, backend)
+        results[backend] = compute_view(name, path = batched_dataset_path, **view_filters(name, filters))
+
+    pandas, arrow = results['pandas'], results['arrow']
+    if isinstance(pandas, dict):
+        assert same_metrics(pandas, arrow)
+    else:
+        assert differences(pandas, arrow) == []
+        # mesmos tipos e mesmas categorias: as páginas usam as chaves diretamente nos gráficos
+        assert dtypes(pandas) == dtypes(arrow)
@@ -0,0 +1,73 @@
+# ==========================================================================================================================
+# IMPORTANDO BIBLIOTECAS NECESSÁRIAS
+# ==========================================================================================================================
+import pandas as pd
+import pytest
+
+from benchmarks.bench_clean_code import clean_code_legacy
+from utils.data import CATEGORY_COLS, CLEAN_DTYPES, STRIP_COLS, clean_code, read_raw
+
+# ==========================================================================================================================
+# FIXTURES
+# ==========================================================================================================================
+@pytest.fixture(scope = 'module')
+def legacy(dataset_path):
+    """ Dataframe limpo pela versão original das páginas (a referência da limpeza vetorizada).
+    """
+    return clean_code_legacy(pd.read_csv(dataset_path))
+
+# ==========================================================================================================================
+# TESTES
+# ==========================================================================================================================
+@pytest.mark.parametrize('read', [read_raw, pd.read_csv], ids = ['read_raw', 'read_csv'])
+def test_matches_legacy_cleaning(dataset_path, legacy, read):
+    df1 = clean_code(read(dataset_path))
+
+    # as mesmas linhas descartadas e os mesmos valores, comparados como texto ou número
+    assert df1.index.equals(legacy.index)
+    for col in ['ID', 'Delivery_person_ID', 'Road_traffic_density', 'Weatherconditions', 'City', 'Festival', 'Type_of_order']:
+        assert df1[col].astype(str).tolist() == legacy[col].astype(str).tolist(), col
+    for col in ['Delivery_person_Age', 'Delivery_person_Ratings', 'Time_taken(min)']:
+        pd.testing.assert_series_equal(df1[col].astype('float64'), legacy[col].astype('float64'), check_names = False)
+    pd.testing.assert_series_equal(df1['Order_Date'], legacy['Order_Date'], check_names = False)
+
+def test_typed_output(dataset_path):
+    df1 = clean_code(read_raw(dataset_path))
+
+    assert all(isinstance(df1[col].dtype, pd.CategoricalDtype) for col in CATEGORY_COLS)
+    assert {col: str(df1[col].dtype) for col in CLEAN_DTYPES} == CLEAN_DTYPES
+    assert pd.api.types.is_datetime64_any_dtype(df1['Order_Date'])
+    # sem espaços nem o texto 'NaN' nas categorias limpas
+    for col in CATEGORY_COLS:
+        categories = df1[col].cat.categories.astype(str)
+        assert (categories == categories.str.strip()).all() and 'NaN' not in categories, col
+    assert not df1[STRIP_COLS].isna().any().any()
+
+def test_strips_typos_before_dropping_missing_values():
+    raw = pd.DataFrame({
+        'ID': ['0x1 ', '0x2 ', '0x3 '],
+        'Delivery_person_ID': ['A ', 'A', 'B '],
+        'Delivery_person_Age': ['30 ', 'NaN ', '25'],
+        'Delivery_person_Ratings': ['4.5', '4.0', '5 '],
+        'Restaurant_latitude': [12.9, 12.9, 12.9],
+        'Restaurant_longitude': [77.6, 77.6, 77.6],
+        'Delivery_location_latitude': [13.0, 13.0, 13.0],
+        'Delivery_location_longitude': [77.7, 77.7, 77.7],
+        'Order_Date': ['19-03-2022', '25-03-2022', '11-02-2022'],
+        'Time_Orderd': ['11:30:00', '19:45:00', '08:30:00'],
+        'Time_Order_picked': ['11:45:00', '19:50:00', '08:45:00'],
+        'Weatherconditions': ['conditions Sunny', 'conditions Fog', 'conditions Sunny'],
+        'Road_traffic_density': ['High ', 'Jam ', 'Low '],
+        'Vehicle_condition': [2, 1, 0],
+        'Type_of_order': ['Snack ', 'Meal ', 'Drinks '],
+        'Type_of_vehicle': ['motorcycle ', 'scooter ', 'motorcycle '],
+        'multiple_deliveries': [0.0, 1.0, 1.0],
+        'Festival': ['No ', 'No ', 'Yes '],
+        'City': ['Urban ', 'Metropolitian ', 'NaN '],
+        'Time_taken(min)': ['(min) 24', '(min) 33', '(min) 26']})
+
+    df1 = clean_code(raw)
+    assert df1['ID'].tolist() == ['0x1']
+    assert df1['Delivery_person_ID'].tolist() == ['A']
+    assert df1['Time_taken(min)'].tolist() == [24]
+    assert df1['Order_Date'].tolist() == [pd.Timestamp('2022-03-19')]
@@ -0,0 +1,51 @@
+# ==========================================================================================================================
+# IMPORTANDO BIBLIOTECAS NECESSÁRIAS
+# ==========================================================================================================================
+import numpy as np
+import pandas as pd
+import pytest
+
+from utils.couriers import COURIER_COLUMNS, CourierStats, load_courier_stats
+from utils.data import load_data
+
+# ==========================================================================================================================
+# TESTES
+# ==========================================================================================================================
+@pytest.mark.parametrize('by', ['Delivery_person_ID', ['City', 'Delivery_person_ID']])
+def test_means_match_groupby(dataset_path, by):
+    # as notas são float32 no Dataframe limpo; as células acumulam em float64
+    df1 = load_data(dataset_path, columns = COURIER_COLUMNS).astype({'Delivery_person_Ratings': 'float64'})
+    expected = df1.groupby(by, observed = True, sort = True)['Delivery_person_Ratings'].mean()
+
+    result = CourierStats.build(df1).means('Delivery_person_Ratings', by)
+    pd.testing.assert_series_equal(result, expected, check_index_type = False, check_categorical = False, rtol = 1e-12)
+
+def test_merged_halves_match_single_build(dataset_path):
+    # as duas metades têm entregadores e dias em comum, cujas células precisam ser unidas
+    df1 = load_data(dataset_path, columns = COURIER_COLUMNS)
+    first, second = df1.iloc[::2], df1.iloc[1::2]
+
+    merged = CourierStats.build(first).merge(CourierStats.build(second))
+    single = CourierStats.build(df1)
+    assert len(merged.cells) == len(single.cells)
+    for measure in ['Delivery_person_Ratings', 'Time_taken(min)']:
+        pd.testing.assert_series_equal(merged.means(measure, ['City', 'Delivery_person_ID']),
+                                       single.means(measure, ['City', 'Delivery_person_ID']), rtol = 1e-12)
+
+def test_select_matches_filtered_rows(dataset_path):
+    df1 = load_data(dataset_path, columns = COURIER_COLUMNS)
+    mask = (df1['Order_Date'] >= pd.Timestamp('2022-03-05')) & (df1['Order_Date'] <= pd.Timestamp('2022-03-20')) & \
+           df1['Road_traffic_density'].isin(['Jam', 'High'])
+    expected = df1.loc[mask, :].groupby('Delivery_person_ID', observed = True, sort = True)['Time_taken(min)'].mean()
+
+    selected = load_courier_stats(dataset_path).select('2022-03-05', '2022-03-20', Road_traffic_density = ['Jam', 'High'])
+    result = selected.means('Time_taken(min)')
+    np.testing.assert_allclose(result.to_numpy(), expected.to_numpy(), rtol = 1e-12)
+    assert list(result.index.astype(str)) == list(expected.index.astype(str))
+
+def test_batches_are_merged_into_the_store(batched_dataset_path):
+    df1 = load_data(batched_dataset_path, columns = COURIER_COLUMNS).astype({'Delivery_person_Ratings': 'float64'})
+    expected = df1.groupby('Delivery_person_ID', observed = True, sort = True)['Delivery_person_Ratings'].mean()
+
+    result = load_courier_stats(batched_dataset_path).means('Delivery_person_Ratings')
+    np.testing.assert_allclose(result.to_numpy(), expected.to_numpy(), rtol = 1e-12)
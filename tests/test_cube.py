@@ -0,0 +1,65 @@
+# ==========================================================================================================================
+# IMPORTANDO BIBLIOTECAS NECESSÁRIAS
+# ==========================================================================================================================
+import numpy as np
+import pandas as pd
+import pytest
+
+from utils.cube import CUBE_COLUMNS, OrderCube, load_cube
+from utils.data import load_data
+
+# ==========================================================================================================================
+# FIXTURES
+# ==========================================================================================================================
+@pytest.fixture(scope = 'module')
+def df1(dataset_path):
+    """ Colunas do cubo, com as medidas em float64 (a precisão das células).
+    """
+    df1 = load_data(dataset_path, columns = CUBE_COLUMNS)
+    return df1.astype({'Time_taken(min)': 'float64', 'Delivery_person_Ratings': 'float64'})
+
+# ==========================================================================================================================
+# TESTES
+# ==========================================================================================================================
+@pytest.mark.parametrize('by', ['Order_Date', 'Road_traffic_density', ['City', 'Road_traffic_density']])
+def test_counts_match_groupby(df1, by):
+    expected = df1.groupby(by, observed = True).size().reset_index(name = 'count')
+    pd.testing.assert_frame_equal(OrderCube.build(df1).counts(by), expected, check_categorical = False)
+
+@pytest.mark.parametrize('measure', ['Time_taken(min)', 'Delivery_person_Ratings', 'Distance_km'])
+def test_mean_std_match_groupby(df1, measure):
+    expected = df1.groupby(['City', 'Festival'], observed = True)[measure].agg(['mean', 'std']).reset_index()
+    result = OrderCube.build(df1).mean_std(measure, ['City', 'Festival'])
+    pd.testing.assert_frame_equal(result, expected, check_categorical = False, rtol = 1e-9)
+
+def test_merge_matches_single_build(df1):
+    # metades intercaladas: quase todas as células aparecem nos dois cubos e precisam ser unidas
+    merged = OrderCube.build(df1.iloc[::2]).merge(OrderCube.build(df1.iloc[1::2]))
+    single = OrderCube.build(df1)
+
+    assert len(merged.cells) == len(single.cells)
+    pd.testing.assert_frame_equal(merged.counts('Type_of_order'), single.counts('Type_of_order'))
+    pd.testing.assert_frame_equal(merged.mean_std('Time_taken(min)', 'Weatherconditions'),
+                                  single.mean_std('Time_taken(min)', 'Weatherconditions'), rtol = 1e-9)
+
+def test_select_matches_filtered_rows(df1):
+    mask = (df1['Order_Date'] >= pd.Timestamp('2022-03-10')) & (df1['Order_Date'] <= pd.Timestamp('2022-03-12')) & \
+           df1['Road_traffic_density'].isin(['Jam'])
+    expected = df1.loc[mask, :].groupby('City', observed = True)['Distance_km'].agg(['mean', 'std']).reset_index()
+
+    result = OrderCube.build(df1).select('2022-03-10', '2022-03-12', Road_traffic_density = ['Jam']).mean_std('Distance_km', 'City')
+    pd.testing.assert_frame_equal(result, expected, check_categorical = False, rtol = 1e-9)
+
+def test_select_rejects_unknown_dimensions(df1):
+    with pytest.raises(ValueError):
+        OrderCube.build(df1.iloc[:100]).select(Delivery_person_ID = ['x'])
+
+def test_single_order_cell_has_no_std(df1):
+    result = OrderCube.build(df1.iloc[:1]).mean_std('Time_taken(min)', 'City')
+    assert result['mean'].iloc[0] == df1['Time_taken(min)'].iloc[0]
+    assert np.isnan(result['std'].iloc[0])
+
+def test_batches_are_merged_into_the_cube(batched_dataset_path):
+    df1 = load_data(batched_dataset_path, columns = CUBE_COLUMNS)
+    expected = df1.groupby('Order_Date', observed = True).size().to_numpy()
+    np.testing.assert_array_equal(load_cube(batched_dataset_path).counts('Order_Date')['count'].to_numpy(), expected)
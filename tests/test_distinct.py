@@ -0,0 +1,87 @@
+# ==========================================================================================================================
+# IMPORTANDO BIBLIOTECAS NECESSÁRIAS
+# ==========================================================================================================================
+import numpy as np
+import pandas as pd
+import pytest
+
+from utils.data import load_data
+from utils.sketches import count_distinct_codes, hash_values, hll_count, hll_entries, hll_group_registers
+from utils.weekly import WEEKLY_COLUMNS, WeeklyStore
+
+# ==========================================================================================================================
+# CONFIGURAÇÕES INCIAIS
+# ==========================================================================================================================
+# Precisão dos testes do HyperLogLog e a tolerância de 3 erros padrão correspondente
+PRECISION = 12
+TOLERANCE = 3 * 1.04 / np.sqrt(2 ** PRECISION)
+
+# ==========================================================================================================================
+# FIXTURES
+# ==========================================================================================================================
+@pytest.fixture(scope = 'module')
+def df1(dataset_path):
+    return load_data(dataset_path, columns = WEEKLY_COLUMNS)
+
+# ==========================================================================================================================
+# FUNÇÕES
+# ==========================================================================================================================
+def estimate(values, precision = PRECISION):
+    """ Estimativa do HyperLogLog para uma coluna inteira de valores.
+    """
+    registers, ranks = hll_entries(hash_values(values), precision)
+    return hll_count(hll_group_registers(np.zeros(len(registers), dtype = np.int64), registers, ranks, 1, precision)[0])
+
+# ==========================================================================================================================
+# TESTES
+# ==========================================================================================================================
+def test_exact_count_on_codes():
+    couriers = pd.Categorical(['b', 'a', None, 'b', 'c', 'a'], categories = ['a', 'b', 'c', 'd'])
+    assert count_distinct_codes(couriers.codes, len(couriers.categories)) == 3
+    assert count_distinct_codes(np.array([], dtype = np.int8), 4) == 0
+
+def test_categorical_hashes_match_the_values():
+    values = pd.Series(['x1', 'x2', 'x1', None], dtype = 'category')
+    np.testing.assert_array_equal(hash_values(values), hash_values(values.astype(object)))
+
+@pytest.mark.parametrize('n', [100, 5_000, 200_000])
+def test_estimate_is_within_the_standard_error(n):
+    values = np.repeat(['DEL{:07d}'.format(i) for i in range(n)], 2)
+    assert abs(estimate(values) - n) / n < TOLERANCE
+
+def test_exact_store_matches_nunique(df1):
+    store = WeeklyStore.build(df1)
+    mask = (df1['Order_Date'] <= pd.Timestamp('2022-03-01')) & df1['Road_traffic_density'].isin(['Medium'])
+
+    assert store.distinct_couriers() == df1['Delivery_person_ID'].nunique()
+    assert store.distinct_couriers(date_max = '2022-03-01', traffic = ['Medium']) == df1.loc[mask, 'Delivery_person_ID'].nunique()
+    assert store.distinct_couriers(date_min = '2030-01-01') == 0
+
+def test_hll_store_is_within_the_standard_error(df1):
+    exact = WeeklyStore.build(df1).select()
+    approximate = WeeklyStore.build(df1, precision = PRECISION).select()
+
+    pd.testing.assert_series_equal(approximate['ID (count)'], exact['ID (count)'])
+    error = approximate['Delivery_person_ID (nunique)'] / exact['Delivery_person_ID (nunique)'] - 1
+    assert error.abs().max() < TOLERANCE
+
+def test_daily_sketches_merge_into_the_full_build(df1):
+    days = [WeeklyStore.build(day, precision = PRECISION) for _, day in df1.groupby('Order_Date')]
+    merged = days[0]
+    for day in days[1:]:
+        merged = merged.merge(day)
+
+    full = WeeklyStore.build(df1, precision = PRECISION)
+    assert merged.distinct_couriers('2022-02-20', '2022-03-20') == full.distinct_couriers('2022-02-20', '2022-03-20')
+    pd.testing.assert_frame_equal(merged.select(traffic = ['Jam']), full.select(traffic = ['Jam']))
+
+def test_exact_merge_adds_new_couriers_to_the_dictionary(df1):
+    history = WeeklyStore.build(df1)
+    batch = pd.DataFrame({'Order_Date': pd.to_datetime(['2022-04-07', '2022-04-07', '2022-04-08']),
+                          'Road_traffic_density': 'Low',
+                          'Delivery_person_ID': ['NEWRES01DEL01', df1['Delivery_person_ID'].iloc[0], 'NEWRES01DEL01']})
+    merged = history.merge(WeeklyStore.build(batch))
+
+    assert len(merged.ids) == len(history.ids) + 1
+    assert merged.distinct_couriers() == history.distinct_couriers() + 1
+    assert merged.distinct_couriers(date_min = '2022-04-07') == 2
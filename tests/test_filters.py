@@ -0,0 +1,77 @@
+# ==========================================================================================================================
+# IMPORTANDO BIBLIOTECAS NECESSÁRIAS
+# ==========================================================================================================================
+import pandas as pd
+import pytest
+
+from utils.data import load_data
+from utils.filters import FILTER_COLS, FilterIndex, load_filter_index
+from utils.metrics import METRIC_COLUMNS, compute_metrics, load_metrics
+
+# ==========================================================================================================================
+# FIXTURES
+# ==========================================================================================================================
+@pytest.fixture(scope = 'module')
+def df1(batched_dataset_path):
+    return load_data(batched_dataset_path, columns = ['Order_Date', 'ID'] + FILTER_COLS)
+
+def mask_select(df1, date_min = None, date_max = None, **options):
+    """ Os mesmos filtros aplicados com máscaras booleanas, linha a linha.
+    """
+    mask = pd.Series(True, index = df1.index)
+    if date_min is not None:
+        mask &= df1['Order_Date'] >= pd.Timestamp(date_min)
+    if date_max is not None:
+        mask &= df1['Order_Date'] <= pd.Timestamp(date_max)
+    for col, values in options.items():
+        mask &= df1[col].isin(values)
+    return df1[mask]
+
+# ==========================================================================================================================
+# TESTES
+# ==========================================================================================================================
+@pytest.mark.parametrize('filters', [
+    {'date_min': '2022-02-20', 'date_max': '2022-03-20', 'Road_traffic_density': ['Low', 'Medium', 'Jam']},
+    {'City': ['Urban', 'Semi-Urban'], 'Weatherconditions': ['conditions Fog']},
+    {'date_min': '2022-04-10', 'City': ['Metropolitian'], 'Road_traffic_density': ['High', 'Jam', 'Low', 'Medium']},
+    {'Weatherconditions': ['conditions Sunny', 'not a category']},
+])
+def test_select_matches_masks(df1, filters):
+    result = FilterIndex(df1).select(df1, **filters)
+    pd.testing.assert_frame_equal(result, mask_select(df1, **filters))
+
+def test_date_range_is_inclusive(df1):
+    index = FilterIndex(df1)
+    day = df1['Order_Date'].iloc[len(df1) // 2]
+    lo, hi = index.date_range(day, day)
+    assert (df1['Order_Date'].iloc[lo:hi] == day).all()
+    assert hi - lo == (df1['Order_Date'] == day).sum()
+
+    assert index.date_range('2030-01-01', None) == (len(df1), len(df1))
+    assert index.date_range(None, '2000-01-01') == (0, 0)
+    assert index.date_range('2022-03-20', '2022-03-01')[1] == index.date_range('2022-03-20', '2022-03-01')[0]
+
+def test_date_only_filters_return_a_slice(df1):
+    index = FilterIndex(df1)
+    assert isinstance(index.positions('2022-03-01', '2022-03-10'), slice)
+    # com todas as categorias selecionadas, a coluna também não gera bitmap
+    all_cities = list(df1['City'].cat.categories)
+    assert isinstance(index.positions('2022-03-01', '2022-03-10', City = all_cities), slice)
+
+def test_empty_multiselect_selects_nothing(df1):
+    assert FilterIndex(df1).select(df1, Road_traffic_density = []).empty
+
+def test_unsorted_and_misaligned_frames_are_rejected(df1):
+    with pytest.raises(ValueError):
+        FilterIndex(df1.iloc[::-1])
+    with pytest.raises(ValueError):
+        FilterIndex(df1).select(df1.iloc[1:])
+    with pytest.raises(ValueError):
+        FilterIndex(df1).positions(Festival = ['Yes'])
+
+def test_metrics_use_the_index(batched_dataset_path):
+    filters = {'date_min': '2022-03-01', 'date_max': '2022-04-15', 'City': ['Urban'], 'Weatherconditions': ['conditions Fog']}
+    df1 = load_data(batched_dataset_path, columns = METRIC_COLUMNS + FILTER_COLS)
+    expected = compute_metrics(mask_select(df1, **filters)[METRIC_COLUMNS])
+    assert load_metrics(path = batched_dataset_path, **filters) == expected
+    assert len(load_filter_index(batched_dataset_path).bitmaps) == len(FILTER_COLS)
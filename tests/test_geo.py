@@ -0,0 +1,36 @@
+# ==========================================================================================================================
+# IMPORTANDO BIBLIOTECAS NECESSÁRIAS
+# ==========================================================================================================================
+import math
+
+import numpy as np
+import pytest
+
+from utils.data import load_data
+from utils.geo import EARTH_RADIUS_KM, haversine_km
+
+# ==========================================================================================================================
+# TESTES
+# ==========================================================================================================================
+def test_known_distances():
+    # um grau ao longo de um meridiano, um quarto de meridiano e o mesmo ponto
+    np.testing.assert_allclose(haversine_km([12.0, 0.0, 22.5], [77.0, 10.0, 88.3], [13.0, 90.0, 22.5], [77.0, 10.0, 88.3]),
+                               [2 * math.pi * EARTH_RADIUS_KM / 360, math.pi * EARTH_RADIUS_KM / 2, 0.0], rtol = 1e-12)
+
+def test_matches_haversine_package():
+    haversine = pytest.importorskip('haversine').haversine
+    rng = np.random.default_rng(0)
+    lat1, lat2 = rng.uniform(-80, 80, (2, 200))
+    lon1, lon2 = rng.uniform(-180, 180, (2, 200))
+
+    expected = [haversine((a, b), (c, d)) for a, b, c, d in zip(lat1, lon1, lat2, lon2)]
+    np.testing.assert_allclose(haversine_km(lat1, lon1, lat2, lon2), expected, rtol = 1e-12)
+
+def test_distance_column(dataset_path):
+    df1 = load_data(dataset_path, columns = ['Restaurant_latitude', 'Restaurant_longitude', 'Delivery_location_latitude',
+                                             'Delivery_location_longitude', 'Distance_km'])
+    row = df1.iloc[0]
+    expected = haversine_km(row['Restaurant_latitude'], row['Restaurant_longitude'],
+                            row['Delivery_location_latitude'], row['Delivery_location_longitude'])
+    assert row['Distance_km'] == pytest.approx(float(expected), rel = 1e-12)
+    assert df1['Distance_km'].dtype == np.float64 and (df1['Distance_km'] >= 0).all()
@@ -0,0 +1,35 @@
+# ==========================================================================================================================
+# IMPORTANDO BIBLIOTECAS NECESSÁRIAS
+# ==========================================================================================================================
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+from benchmarks.import_time import DEFAULT_BUDGET, DEFERRED_MODULES, SCRIPTS, check, import_times, summarize
+
+# ==========================================================================================================================
+# CONFIGURAÇÕES INCIAIS
+# ==========================================================================================================================
+# Módulos que as camadas de dados e de visões não podem carregar ao serem importadas (só os caminhos que os usam)
+HEAVY_MODULES = ['folium', 'plotly', 'pyarrow.dataset'] + DEFERRED_MODULES
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# ==========================================================================================================================
+# TESTES
+# ==========================================================================================================================
+@pytest.mark.parametrize('module', ['utils.data', 'utils.engine', 'utils.backends', 'utils.service'])
+def test_modules_do_not_load_heavy_dependencies(module):
+    code = 'import json, sys, {}; print(json.dumps([name for name in {!r} if name in sys.modules]))'.format(module, HEAVY_MODULES)
+    result = subprocess.run([sys.executable, '-c', code], capture_output = True, text = True, cwd = ROOT, check = True)
+    assert json.loads(result.stdout) == []
+
+@pytest.mark.parametrize('script', SCRIPTS)
+def test_scripts_within_import_budget(script, monkeypatch):
+    monkeypatch.chdir(ROOT)
+    # a menor de três medições, como no 'python -m benchmarks.import_time'
+    summary = min((summarize(import_times(script)) for _ in range(3)), key = lambda summary: summary['total'])
+    assert check({script: summary}, DEFAULT_BUDGET) == []
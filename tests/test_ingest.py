@@ -0,0 +1,95 @@
+# ==========================================================================================================================
+# IMPORTANDO BIBLIOTECAS NECESSÁRIAS
+# ==========================================================================================================================
+import os
+
+import pandas as pd
+import pytest
+
+from benchmarks.synthetic import write_train_csv
+from utils import data
+from utils.data import clean_code, list_batches, load_data, load_derived, read_raw
+from utils.ingest import ingest_batch, ingest_pending
+
+# ==========================================================================================================================
+# FIXTURES
+# ==========================================================================================================================
+@pytest.fixture
+def csv_path(tmp_path, monkeypatch):
+    """ CSV sintético pequeno, com os caches do processo vazios.
+    """
+    monkeypatch.setattr(data, '_cache', {})
+    monkeypatch.setattr(data, '_derived', {})
+    return write_train_csv(str(tmp_path / 'train.csv'), 500, seed = 5)
+
+def write_batch(directory, name, seed):
+    """ Lote de pedidos posteriores ao CSV, gravado no diretório informado.
+    """
+    return write_train_csv(str(directory / name), 100, seed = seed, start = '2022-04-07', end = '2022-04-10')
+
+# ==========================================================================================================================
+# TESTES
+# ==========================================================================================================================
+def test_batch_is_appended_without_cleaning_the_csv_again(csv_path, tmp_path, monkeypatch):
+    columns = ['ID', 'Order_Date', 'City', 'Time_taken(min)']
+    before = load_data(csv_path, columns = columns)
+
+    batch = ingest_batch(write_batch(tmp_path, 'batch.csv', 6), csv_path)
+    monkeypatch.setattr(data, '_clean_from_csv', lambda path: pytest.fail('the CSV was cleaned again'))
+    after = load_data(csv_path, columns = columns)
+
+    assert len(after) == len(before) + len(batch)
+    assert after['Order_Date'].is_monotonic_increasing
+    assert isinstance(after['City'].dtype, pd.CategoricalDtype)
+    assert set(after['ID']) == set(before['ID']) | set(batch['ID'])
+
+def test_appended_data_matches_a_full_clean(csv_path, tmp_path):
+    batch_csv = write_batch(tmp_path, 'batch.csv', 7)
+    load_data(csv_path)
+    ingest_batch(batch_csv, csv_path)
+
+    expected = pd.concat([clean_code(read_raw(csv_path)), clean_code(read_raw(batch_csv))], ignore_index = True)
+    expected = expected.sort_values('Order_Date', kind = 'stable').reset_index(drop = True)
+    result = load_data(csv_path)
+    pd.testing.assert_series_equal(result['ID'].astype(str), expected['ID'].astype(str))
+    pd.testing.assert_series_equal(result['Distance_km'], expected['Distance_km'])
+
+def test_derived_structures_are_updated_with_the_new_batches_only(csv_path, tmp_path):
+    calls = []
+
+    def builder(path):
+        calls.append('build')
+        return 0
+
+    def updater(previous, path, batches):
+        calls.append(tuple(batches))
+        return previous + len(batches)
+
+    assert load_derived('batches', builder, csv_path, updater) == 0
+    ingest_batch(write_batch(tmp_path, 'first.csv', 8), csv_path)
+    ingest_batch(write_batch(tmp_path, 'second.csv', 9), csv_path)
+    assert load_derived('batches', builder, csv_path, updater) == 2
+    assert load_derived('batches', builder, csv_path, updater) == 2
+    assert calls == ['build', tuple(list_batches(csv_path))]
+
+def test_replaced_csv_rebuilds_derived_structures(csv_path, tmp_path):
+    calls = []
+    builder = lambda path: calls.append('build')
+    updater = lambda previous, path, batches: calls.append('update')
+
+    load_derived('replaced', builder, csv_path, updater)
+    write_train_csv(csv_path, 400, seed = 10)
+    load_derived('replaced', builder, csv_path, updater)
+    assert calls == ['build', 'build']
+
+def test_ingest_pending_moves_processed_files(csv_path, tmp_path):
+    drop_dir = tmp_path / 'incoming'
+    drop_dir.mkdir()
+    write_batch(drop_dir, 'b.csv', 11)
+    write_batch(drop_dir, 'a.csv', 12)
+    (drop_dir / 'c.csv.part').write_text('still copying')
+
+    assert ingest_pending(str(drop_dir), csv_path) == ['a.csv', 'b.csv']
+    assert len(list_batches(csv_path)) == 2
+    assert sorted(os.listdir(drop_dir / 'processed')) == ['a.csv', 'b.csv']
+    assert os.path.exists(drop_dir / 'c.csv.part')
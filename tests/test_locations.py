@@ -0,0 +1,69 @@
+# ==========================================================================================================================
+# IMPORTANDO BIBLIOTECAS NECESSÁRIAS
+# ==========================================================================================================================
+import numpy as np
+import pandas as pd
+import pytest
+
+from utils.data import load_data
+from utils.engine import compute_view
+from utils.locations import LOCATION_COLS, LOCATION_KEYS, LocationSketch
+from utils.sketches import QUANTILE_ALPHA
+
+# ==========================================================================================================================
+# FIXTURES
+# ==========================================================================================================================
+@pytest.fixture(scope = 'module')
+def df1(dataset_path):
+    return load_data(dataset_path, columns = LOCATION_KEYS + LOCATION_COLS)
+
+def exact_medians(df1, date_min = None, date_max = None, traffic = None):
+    """ Medianas calculadas diretamente das linhas, como o 'order_map()' original.
+    """
+    mask = pd.Series(True, index = df1.index)
+    if date_min is not None:
+        mask &= df1['Order_Date'] >= pd.Timestamp(date_min)
+    if date_max is not None:
+        mask &= df1['Order_Date'] <= pd.Timestamp(date_max)
+    if traffic is not None:
+        mask &= df1['Road_traffic_density'].isin(traffic)
+    return df1[mask].groupby(['City', 'Road_traffic_density'], observed = True)[LOCATION_COLS].median().reset_index()
+
+# ==========================================================================================================================
+# TESTES
+# ==========================================================================================================================
+@pytest.mark.parametrize('filters', [
+    {},
+    {'date_min': '2022-03-01', 'date_max': '2022-03-20', 'traffic': ['Low', 'Jam']},
+    {'date_min': '2022-03-13', 'date_max': '2022-03-13'},
+])
+def test_exact_medians_match_rows(df1, filters):
+    result = LocationSketch.build(df1).select(**filters).medians()
+    expected = exact_medians(df1, **filters)
+
+    assert list(result.columns) == ['City', 'Road_traffic_density'] + LOCATION_COLS
+    assert result[['City', 'Road_traffic_density']].astype(str).equals(expected[['City', 'Road_traffic_density']].astype(str))
+    np.testing.assert_array_equal(result[LOCATION_COLS].to_numpy(), expected[LOCATION_COLS].to_numpy())
+
+def test_approximate_medians_within_alpha(df1):
+    result = LocationSketch.build(df1, QUANTILE_ALPHA).medians()
+    expected = exact_medians(df1)
+
+    assert len(result) == len(expected)
+    error = np.abs(result[LOCATION_COLS].to_numpy() / expected[LOCATION_COLS].to_numpy() - 1)
+    assert error.max() <= QUANTILE_ALPHA * (1 + 1e-9)
+
+def test_merged_sketches_match_full_sketch(df1):
+    first, second = df1.iloc[:len(df1) // 2], df1.iloc[len(df1) // 2:]
+    merged = LocationSketch.build(first).merge(LocationSketch.build(second)).medians()
+    pd.testing.assert_frame_equal(merged, LocationSketch.build(df1).medians())
+
+@pytest.mark.parametrize('filters', [{'traffic': []}, {'date_min': '2030-01-01', 'date_max': '2030-12-31'}])
+def test_empty_selection(df1, filters):
+    result = LocationSketch.build(df1).select(**filters).medians()
+    assert result.empty
+    assert list(result.columns) == ['City', 'Road_traffic_density'] + LOCATION_COLS
+
+def test_central_locations_view_with_empty_traffic(dataset_path):
+    for name in ['central_locations', 'approximate_central_locations']:
+        assert compute_view(name, path = dataset_path, Road_traffic_density = []).empty
@@ -0,0 +1,60 @@
+# ==========================================================================================================================
+# IMPORTANDO BIBLIOTECAS NECESSÁRIAS
+# ==========================================================================================================================
+import folium
+import numpy as np
+import pandas as pd
+from folium.plugins import FastMarkerCluster
+
+from utils.maps import cached_map_html, central_locations_map, raw_points_map, render_map
+
+# ==========================================================================================================================
+# CONFIGURAÇÕES INCIAIS
+# ==========================================================================================================================
+MEDIANS = pd.DataFrame({
+    'City': pd.Categorical(['Metropolitian', 'Urban', 'Urban']),
+    'Road_traffic_density': pd.Categorical(['Jam', 'Low', 'High']),
+    'Delivery_location_latitude (median)': [12.97, 22.75, 22.80],
+    'Delivery_location_longitude (median)': [77.59, 75.89, 75.90]})
+
+# ==========================================================================================================================
+# FUNÇÕES
+# ==========================================================================================================================
+def layers(map, kind):
+    return [child for child in map._children.values() if isinstance(child, kind)]
+
+# ==========================================================================================================================
+# TESTES
+# ==========================================================================================================================
+def test_central_locations_are_a_single_geojson_layer():
+    layer, = layers(central_locations_map(MEDIANS), folium.GeoJson)
+    features = layer.data['features']
+
+    assert [feature['geometry']['coordinates'] for feature in features] == [[77.59, 12.97], [75.89, 22.75], [75.90, 22.80]]
+    assert features[0]['properties'] == {'City': 'Metropolitian', 'Road_traffic_density': 'Jam'}
+    assert not layers(central_locations_map(MEDIANS), folium.Marker)
+
+def test_empty_selection_renders_an_empty_map():
+    map = central_locations_map(MEDIANS.iloc[:0])
+    assert not layers(map, folium.GeoJson)
+    assert '<html>' in render_map(map)
+
+def test_raw_points_skip_missing_coordinates_and_are_capped():
+    latitudes = np.linspace(12, 13, 120)
+    latitudes[:10] = np.nan
+    cluster, = layers(raw_points_map(latitudes, np.linspace(77, 78, 120), max_points = 50), FastMarkerCluster)
+    assert len(cluster.data) == 50
+    np.testing.assert_allclose(cluster.data[0], [latitudes[10], 77 + 10 / 119], atol = 1e-6)
+
+def test_map_html_is_rendered_once_per_filter_state(dataset_path):
+    builds = []
+
+    def builder():
+        builds.append(1)
+        return central_locations_map(MEDIANS)
+
+    html = cached_map_html(('central', 'maps-test'), builder, dataset_path)
+    assert cached_map_html(('central', 'maps-test'), builder, dataset_path) is html
+    cached_map_html(('central', 'maps-test', 'Jam'), builder, dataset_path)
+    assert len(builds) == 2
+    assert 'leaflet' in html
@@ -0,0 +1,40 @@
+# ==========================================================================================================================
+# IMPORTANDO BIBLIOTECAS NECESSÁRIAS
+# ==========================================================================================================================
+import numpy as np
+import pytest
+
+from utils.data import load_data
+from utils.metrics import METRIC_COLUMNS, compute_metrics, filter_key, load_metrics
+
+# ==========================================================================================================================
+# TESTES
+# ==========================================================================================================================
+def test_metrics_match_pandas(dataset_path):
+    df1 = load_data(dataset_path, columns = METRIC_COLUMNS)
+    metrics = compute_metrics(df1)
+
+    assert (metrics['age_min'], metrics['age_max']) == (df1['Delivery_person_Age'].min(), df1['Delivery_person_Age'].max())
+    assert (metrics['vehicle_condition_min'], metrics['vehicle_condition_max']) == (df1['Vehicle_condition'].min(),
+                                                                                    df1['Vehicle_condition'].max())
+    assert metrics['unique_couriers'] == df1['Delivery_person_ID'].nunique()
+    assert metrics['distance_mean'] == pytest.approx(df1['Distance_km'].mean(), rel = 1e-12)
+
+def test_unique_couriers_ignores_categories_without_rows(dataset_path):
+    # o recorte mantém todas as categorias de IDs do dataset, mas só as presentes contam
+    df1 = load_data(dataset_path, columns = METRIC_COLUMNS).iloc[:50]
+    assert compute_metrics(df1)['unique_couriers'] == df1['Delivery_person_ID'].nunique()
+
+def test_empty_selection(dataset_path):
+    metrics = compute_metrics(load_data(dataset_path, columns = METRIC_COLUMNS).iloc[:0])
+    assert metrics['unique_couriers'] == 0
+    assert all(np.isnan(metrics[key]) for key in ['age_min', 'age_max', 'vehicle_condition_min', 'vehicle_condition_max', 'distance_mean'])
+
+def test_filter_key_ignores_option_order():
+    assert filter_key('2022-03-01', None, City = ['Urban', 'Metropolitian'], Festival = ['No']) == \
+           filter_key('2022-03-01', None, Festival = ['No'], City = ['Metropolitian', 'Urban'])
+
+def test_load_metrics_is_memoized_per_filter_state(dataset_path):
+    first = load_metrics(path = dataset_path, City = ['Urban'])
+    assert load_metrics(path = dataset_path, City = ['Urban']) is first
+    assert load_metrics(path = dataset_path, City = ['Semi-Urban']) is not first
@@ -0,0 +1,63 @@
+# ==========================================================================================================================
+# IMPORTANDO BIBLIOTECAS NECESSÁRIAS
+# ==========================================================================================================================
+import pandas as pd
+import pytest
+
+from benchmarks.synthetic import write_train_csv
+from utils.data import load_data
+from utils.metrics import METRIC_COLUMNS, load_metrics
+from utils.partitions import load_partition_manifest, load_partitions, prune_partitions
+
+# ==========================================================================================================================
+# CONFIGURAÇÕES INCIAIS
+# ==========================================================================================================================
+FILTERS = [
+    {},
+    {'date_min': '2022-03-01', 'date_max': '2022-03-20', 'Road_traffic_density': ['Low', 'Jam']},
+    {'City': ['Urban'], 'Weatherconditions': ['conditions Fog', 'conditions Sunny']},
+    {'date_min': '2022-04-10', 'City': ['Metropolitian', 'Semi-Urban']},
+    {'date_min': '2022-03-13', 'date_max': '2022-03-13'},
+    {'Road_traffic_density': []},
+    {'date_min': '2030-01-01'},
+]
+
+# ==========================================================================================================================
+# TESTES
+# ==========================================================================================================================
+@pytest.mark.parametrize('filters', FILTERS)
+def test_partitions_match_filtered_rows(batched_dataset_path, filters):
+    df1 = load_data(batched_dataset_path, columns = METRIC_COLUMNS + ['City', 'Road_traffic_density', 'Weatherconditions'])
+    mask = pd.Series(True, index = df1.index)
+    if 'date_min' in filters:
+        mask &= df1['Order_Date'] >= pd.Timestamp(filters['date_min'])
+    if 'date_max' in filters:
+        mask &= df1['Order_Date'] <= pd.Timestamp(filters['date_max'])
+    for col in ['City', 'Road_traffic_density', 'Weatherconditions']:
+        if col in filters:
+            mask &= df1[col].isin(filters[col])
+    expected = df1.loc[mask, METRIC_COLUMNS].reset_index(drop = True)
+
+    result = load_partitions(batched_dataset_path, columns = METRIC_COLUMNS, **filters)
+    assert result['Order_Date'].is_monotonic_increasing
+    sort = METRIC_COLUMNS
+    pd.testing.assert_frame_equal(result.sort_values(sort, ignore_index = True), expected.sort_values(sort, ignore_index = True),
+                                  check_categorical = False)
+
+def test_pruning_skips_partitions(batched_dataset_path):
+    entries = load_partition_manifest(batched_dataset_path)
+    selected = prune_partitions(entries, '2022-03-01', '2022-03-07', ['Urban'])
+    assert 0 < len(selected) < len(entries)
+    assert all(entry['cities'] == ['Urban'] for entry in selected)
+
+def test_empty_dataset(tmp_path):
+    path = write_train_csv(str(tmp_path / 'train.csv'), 10)
+    with open(path) as file:
+        header = file.readline()
+    with open(path, 'w') as file:
+        file.write(header)
+
+    result = load_partitions(path, date_min = '2022-03-01', columns = METRIC_COLUMNS)
+    assert result.empty
+    assert list(result.columns) == METRIC_COLUMNS
+    assert load_metrics(path = path)['unique_couriers'] == 0
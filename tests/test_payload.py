@@ -0,0 +1,77 @@
+# ==========================================================================================================================
+# IMPORTANDO BIBLIOTECAS NECESSÁRIAS
+# ==========================================================================================================================
+import numpy as np
+import pandas as pd
+import pytest
+
+from utils.payload import aggregate_by_time, bucket_dates, downsample, lttb_indices, page_count, paginate, time_bucket
+
+# ==========================================================================================================================
+# FUNÇÕES
+# ==========================================================================================================================
+def daily(start, periods):
+    """ Série diária de contagens, uma linha por data.
+    """
+    return pd.DataFrame({'Order_Date': pd.date_range(start, periods = periods, freq = 'D'), 'count': np.arange(periods) % 7 + 1})
+
+# ==========================================================================================================================
+# TESTES
+# ==========================================================================================================================
+def test_lttb_keeps_the_ends_and_the_extremes():
+    x = np.arange(1_000)
+    y = np.sin(x / 50)
+    y[437], y[812] = 25, -25
+
+    selected = lttb_indices(x, y, 50)
+    assert len(selected) == 50
+    assert (selected[0], selected[-1]) == (0, 999)
+    assert (np.diff(selected) > 0).all()
+    assert {437, 812} <= set(selected.tolist())
+
+@pytest.mark.parametrize('n_out', [2, 10, 20])
+def test_lttb_keeps_short_series(n_out):
+    np.testing.assert_array_equal(lttb_indices(np.arange(10), np.ones(10), n_out), np.arange(10))
+
+def test_downsample_keeps_the_rows_within_the_budget():
+    df2 = daily('2020-01-01', 2_000).assign(label = lambda df2: df2['Order_Date'].dt.strftime('%Y-%m-%d'))
+    result = downsample(df2, 'Order_Date', 'count', max_points = 100)
+
+    assert len(result) == 100
+    assert list(result.columns) == list(df2.columns)
+    pd.testing.assert_frame_equal(result.iloc[[0, -1]], df2.iloc[[0, -1]])
+    short = df2.iloc[:100]
+    assert downsample(short, 'Order_Date', 'count', max_points = 100) is short
+    # rótulos de texto usam a posição da linha como eixo x
+    pd.testing.assert_frame_equal(downsample(df2, 'label', 'count', max_points = 100), result)
+
+def test_week_and_month_buckets():
+    dates = pd.Series(pd.to_datetime(['2021-01-03', '2021-01-04', '2022-02-28', '2022-03-01']))
+    assert list(bucket_dates(dates, 'W').dt.strftime('%Y-%m-%d')) == ['2020-12-28', '2021-01-04', '2022-02-28', '2022-02-28']
+    assert list(bucket_dates(dates, 'M').dt.strftime('%Y-%m-%d')) == ['2021-01-01', '2021-01-01', '2022-02-01', '2022-03-01']
+    with pytest.raises(ValueError):
+        bucket_dates(dates, 'Y')
+
+def test_aggregation_picks_the_finest_bucket_within_the_budget():
+    short = daily('2022-02-11', 55)
+    assert aggregate_by_time(short, 'Order_Date', ['count'], max_points = 100)[0] is short
+
+    df2, freq = aggregate_by_time(daily('2020-01-06', 700), 'Order_Date', ['count'], max_points = 120)
+    assert freq == 'W'
+    assert len(df2) == 100
+    assert df2['count'].sum() == daily('2020-01-06', 700)['count'].sum()
+
+    assert time_bucket(daily('2000-01-01', 5_000)['Order_Date'], max_points = 200) == 'M'
+
+def test_pages_are_clamped_to_the_table():
+    df2 = pd.DataFrame({'row': range(450)})
+    assert page_count(450) == 3
+    assert page_count(0) == 1
+
+    page, number = paginate(df2, 3)
+    assert (number, page['row'].tolist()) == (3, list(range(400, 450)))
+    assert paginate(df2, 99)[1] == 3
+    assert paginate(df2, 0)[1] == 1
+
+    page, number = paginate(df2.iloc[:0], 2)
+    assert (number, len(page)) == (1, 0)
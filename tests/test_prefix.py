@@ -0,0 +1,77 @@
+# ==========================================================================================================================
+# IMPORTANDO BIBLIOTECAS NECESSÁRIAS
+# ==========================================================================================================================
+import pandas as pd
+import pytest
+
+from utils.cube import CUBE_COLUMNS, OrderCube
+from utils.data import load_data
+from utils.prefix import DailyPrefix, load_daily_prefix
+
+# ==========================================================================================================================
+# FIXTURES
+# ==========================================================================================================================
+@pytest.fixture(scope = 'module')
+def df1(dataset_path):
+    df1 = load_data(dataset_path, columns = CUBE_COLUMNS)
+    return df1.astype({'Time_taken(min)': 'float64', 'Delivery_person_Ratings': 'float64'})
+
+@pytest.fixture(scope = 'module')
+def prefix(df1):
+    return DailyPrefix.build(OrderCube.build(df1))
+
+# ==========================================================================================================================
+# FUNÇÕES
+# ==========================================================================================================================
+def rows(df1, date_min = None, date_max = None, **options):
+    """ Linhas do intervalo de datas (inclusive) e dos filtros informados.
+    """
+    mask = pd.Series(True, index = df1.index)
+    if date_min is not None:
+        mask &= df1['Order_Date'] >= pd.Timestamp(date_min)
+    if date_max is not None:
+        mask &= df1['Order_Date'] <= pd.Timestamp(date_max)
+    for col, values in options.items():
+        mask &= df1[col].isin(values)
+    return df1.loc[mask, :]
+
+# ==========================================================================================================================
+# TESTES
+# ==========================================================================================================================
+@pytest.mark.parametrize('date_min, date_max', [(None, None), ('2022-03-01', '2022-03-15'), ('2022-03-08', '2022-03-08'),
+                                                ('2021-12-01', '2022-02-20'), ('2022-04-01', '2023-01-01')])
+def test_ranges_match_groupby(df1, prefix, date_min, date_max):
+    df2 = rows(df1, date_min, date_max)
+    result = prefix.select(date_min, date_max)
+
+    expected = df2.groupby('City', observed = True).size().reset_index(name = 'count')
+    pd.testing.assert_frame_equal(result.counts('City'), expected, check_categorical = False)
+    expected = df2.groupby(['Road_traffic_density', 'Type_of_order'], observed = True)['Time_taken(min)'].agg(['mean', 'std'])
+    pd.testing.assert_frame_equal(result.mean_std('Time_taken(min)', ['Road_traffic_density', 'Type_of_order']),
+                                  expected.reset_index(), check_categorical = False, rtol = 1e-9)
+
+def test_filters_match_the_cube(df1, prefix):
+    options = {'Road_traffic_density': ['Jam', 'High'], 'Festival': ['No']}
+    result = prefix.select('2022-02-15', '2022-03-20', **options)
+    expected = OrderCube.build(df1).select('2022-02-15', '2022-03-20', **options)
+
+    pd.testing.assert_frame_equal(result.counts('Weatherconditions'), expected.counts('Weatherconditions'), check_categorical = False)
+    pd.testing.assert_frame_equal(result.mean_std('Distance_km', 'City'), expected.mean_std('Distance_km', 'City'),
+                                  check_categorical = False, rtol = 1e-9)
+
+def test_times_of_day_do_not_widen_the_range(df1, prefix):
+    result = prefix.select('2022-03-09 12:00', '2022-03-10 23:59')
+    assert result.counts('City')['count'].sum() == len(rows(df1, '2022-03-10', '2022-03-10'))
+
+@pytest.mark.parametrize('date_min, date_max', [('2022-03-10', '2022-03-09'), ('2030-01-01', None), (None, '2000-01-01')])
+def test_empty_ranges_have_no_cells(prefix, date_min, date_max):
+    assert prefix.select(date_min, date_max).cells.empty
+
+def test_select_rejects_unknown_dimensions(prefix):
+    with pytest.raises(ValueError):
+        prefix.select(Order_Date = ['2022-03-10'])
+
+def test_batches_are_included(batched_dataset_path):
+    df1 = load_data(batched_dataset_path, columns = CUBE_COLUMNS)
+    result = load_daily_prefix(batched_dataset_path).select('2022-04-01', None)
+    assert result.counts('City')['count'].sum() == len(rows(df1, '2022-04-01'))
@@ -0,0 +1,43 @@
+# ==========================================================================================================================
+# IMPORTANDO BIBLIOTECAS NECESSÁRIAS
+# ==========================================================================================================================
+import sys
+
+import pytest
+
+from utils.profiling import Rerun, current_rerun, recent_reruns, span
+
+# ==========================================================================================================================
+# TESTES
+# ==========================================================================================================================
+def test_interrupted_rerun_is_finished_in_finally():
+    rerun = Rerun('page', session = 'interrupted').start(profile = True)
+    with pytest.raises(RuntimeError):
+        try:
+            with span('aggregate'):
+                raise RuntimeError('page failed')
+        finally:
+            rerun.finish()
+
+    assert sys.getprofile() is None
+    assert current_rerun() is None
+    assert rerun.profile_report is not None
+    assert [name for name, *_ in rerun.spans] == ['aggregate', 'rerun']
+
+def test_start_stops_a_leftover_rerun():
+    leftover = Rerun('page', session = 'leftover').start(profile = True)
+    rerun = Rerun('page', session = 'leftover').start()
+    try:
+        assert sys.getprofile() is None
+        assert not leftover.is_profiling()
+        assert current_rerun() is rerun
+    finally:
+        rerun.finish()
+    assert current_rerun() is None
+
+def test_finish_is_idempotent():
+    rerun = Rerun('page', session = 'idempotent').start()
+    rerun.finish()
+    rerun.finish()
+    assert recent_reruns('idempotent') == [rerun]
+    assert [name for name, *_ in rerun.spans] == ['rerun']
@@ -0,0 +1,110 @@
+# ==========================================================================================================================
+# IMPORTANDO BIBLIOTECAS NECESSÁRIAS
+# ==========================================================================================================================
+import os
+import subprocess
+import sys
+import threading
+import time
+
+import pytest
+
+from benchmarks.synthetic import write_train_csv
+from utils import data, publish as publish_module
+from utils.data import cache_path, clean_code, dataset_version, load_data, publish_snapshot, read_raw
+from utils.partitions import partitions_dir
+from utils.publish import publish, swap_dataset
+
+# ==========================================================================================================================
+# FIXTURES
+# ==========================================================================================================================
+@pytest.fixture
+def csv_path(tmp_path, monkeypatch):
+    """ CSV sintético pequeno, com os caches do processo vazios.
+    """
+    monkeypatch.setattr(data, '_cache', {})
+    monkeypatch.setattr(data, '_derived', {})
+    return write_train_csv(str(tmp_path / 'train.csv'), 500, seed = 20)
+
+@pytest.fixture
+def clean_calls(monkeypatch):
+    """ Registro das limpezas do CSV feitas pelo processo.
+    """
+    calls = []
+    clean_from_csv = data._clean_from_csv
+
+    def counted(path):
+        calls.append(path)
+        # dá tempo para as demais publicações chegarem à trava
+        time.sleep(0.2)
+        return clean_from_csv(path)
+
+    monkeypatch.setattr(data, '_clean_from_csv', counted)
+    return calls
+
+# ==========================================================================================================================
+# TESTES
+# ==========================================================================================================================
+def test_published_snapshot_is_reused_by_load_data(csv_path, clean_calls):
+    assert publish(csv_path) == cache_path(csv_path)
+    assert os.path.isdir(partitions_dir(csv_path))
+
+    load_data(csv_path, columns = ['ID', 'City'])
+    assert clean_calls == [csv_path]
+
+def test_concurrent_publishers_clean_the_csv_once(csv_path, clean_calls):
+    caches = []
+
+    def worker():
+        caches.append(publish_snapshot(csv_path))
+
+    threads = [threading.Thread(target = worker) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert clean_calls == [csv_path]
+    assert caches == [cache_path(csv_path)] * 4
+
+def test_snapshot_columns_are_read_only_and_mapped(csv_path):
+    df1 = load_data(csv_path, columns = ['Distance_km', 'Time_taken(min)'])
+    assert not df1['Distance_km'].to_numpy().flags.writeable
+    assert not df1['Time_taken(min)'].to_numpy().flags.writeable
+
+def test_swap_publishes_before_replacing_the_csv(csv_path, tmp_path, clean_calls):
+    before = load_data(csv_path, columns = ['ID', 'Distance_km'])
+    new_csv = write_train_csv(str(tmp_path / 'new.csv'), 300, seed = 21)
+
+    snapshot = swap_dataset(new_csv, csv_path)
+    assert snapshot == cache_path(csv_path)
+    assert not [name for name in os.listdir(tmp_path) if name.endswith('.staging')]
+
+    # a versão nova já foi limpa antes da troca; o Dataframe anterior continua legível
+    calls = len(clean_calls)
+    after = load_data(csv_path, columns = ['ID', 'Distance_km'])
+    assert len(clean_calls) == calls
+    assert sorted(after['ID']) == sorted(clean_code(read_raw(new_csv))['ID'])
+    assert before['Distance_km'].notna().any()
+
+def test_failed_swap_keeps_the_current_dataset(csv_path, tmp_path, monkeypatch):
+    version = dataset_version(csv_path)
+    new_csv = write_train_csv(str(tmp_path / 'new.csv'), 300, seed = 22)
+
+    def fail(path, source):
+        raise OSError('disk full')
+
+    monkeypatch.setattr(publish_module, 'publish_partitions', fail)
+    with pytest.raises(OSError):
+        swap_dataset(new_csv, csv_path)
+    assert dataset_version(csv_path) == version
+    assert not [name for name in os.listdir(tmp_path) if name.endswith('.staging')]
+
+def test_command_line_swaps_the_dataset(csv_path, tmp_path):
+    new_csv = write_train_csv(str(tmp_path / 'new.csv'), 300, seed = 23)
+    result = subprocess.run([sys.executable, '-m', 'utils.publish', new_csv, '--dataset', csv_path],
+                            capture_output = True, text = True, check = True)
+
+    assert 'Dataset trocado' in result.stdout
+    assert os.path.getsize(csv_path) == os.path.getsize(new_csv)
+    assert os.path.exists(cache_path(csv_path))
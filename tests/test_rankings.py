@@ -0,0 +1,28 @@
+# ==========================================================================================================================
+# IMPORTANDO BIBLIOTECAS NECESSÁRIAS
+# ==========================================================================================================================
+import pandas as pd
+
+from utils.data import load_data
+from utils.rankings import rank_couriers
+
+# ==========================================================================================================================
+# TESTES
+# ==========================================================================================================================
+def test_rankings_match_full_sort(dataset_path):
+    df1 = load_data(dataset_path, columns = ['City', 'Delivery_person_ID', 'Time_taken(min)'])
+    means = df1.groupby(['City', 'Delivery_person_ID'], observed = True, sort = True)['Time_taken(min)'].mean()
+
+    rankings = rank_couriers(means, 5)
+    assert list(rankings) == list(means.index.get_level_values('City').unique())
+    for city, (fastest, slowest) in rankings.items():
+        group = means.xs(city, level = 'City')
+        pd.testing.assert_series_equal(fastest, group.sort_values(kind = 'stable').iloc[:5])
+        pd.testing.assert_series_equal(slowest, group.sort_values(ascending = False, kind = 'stable').iloc[:5])
+
+def test_city_without_couriers_gets_empty_rankings(dataset_path):
+    df1 = load_data(dataset_path, columns = ['City', 'Delivery_person_ID', 'Time_taken(min)'])
+    means = df1.loc[df1['City'] == 'Urban', :].groupby(['City', 'Delivery_person_ID'], observed = True)['Time_taken(min)'].mean()
+
+    fastest, slowest = rank_couriers(means, cities = ['Urban', 'Semi-Urban'])['Semi-Urban']
+    assert fastest.empty and slowest.empty
@@ -0,0 +1,65 @@
+# ==========================================================================================================================
+# IMPORTANDO BIBLIOTECAS NECESSÁRIAS
+# ==========================================================================================================================
+import threading
+
+import pytest
+from streamlit.testing.v1 import AppTest
+
+from utils.profiling import Rerun
+from utils.scheduler import ChartScheduler
+
+# ==========================================================================================================================
+# TESTES
+# ==========================================================================================================================
+def test_charts_are_built_concurrently():
+    # cada gráfico só termina quando o outro também começou: em série, a barreira estouraria o tempo
+    barrier = threading.Barrier(2, timeout = 5)
+
+    def build(name):
+        barrier.wait()
+        return name
+
+    charts = ChartScheduler()
+    charts.submit('first', build, 'first')
+    charts.submit('second', build, 'second')
+    assert (charts.result('first'), charts.result('second')) == ('first', 'second')
+
+def test_errors_are_raised_by_result():
+    charts = ChartScheduler()
+    charts.submit('broken', lambda: 1 / 0)
+    with pytest.raises(ZeroDivisionError):
+        charts.result('broken')
+
+def test_chart_spans_are_recorded_in_the_page_rerun():
+    rerun = Rerun('page', session = 'scheduler').start()
+    try:
+        charts = ChartScheduler()
+        charts.submit('chart', sum, [1, 2])
+        assert charts.result('chart') == 3
+    finally:
+        rerun.finish()
+
+    threads = {name: thread for name, _, thread in rerun.spans}
+    assert threads['chart: chart'].startswith('charts')
+    assert threads['wait: chart'] == threading.current_thread().name
+
+def test_charts_run_on_the_page_thread_while_profiling():
+    rerun = Rerun('page', session = 'scheduler-profile').start(profile = True)
+    try:
+        charts = ChartScheduler()
+        charts.submit('chart', lambda: threading.current_thread().name)
+        assert charts.result('chart') == threading.current_thread().name
+    finally:
+        rerun.finish()
+
+def test_map_is_built_only_after_it_is_opened():
+    at = AppTest.from_file('pages/1_Visão_Empresa.py', default_timeout = 120).run()
+    assert not at.exception
+    assert [button.label for button in at.button] == ['Carregar mapa']
+    assert not at.get('iframe')
+
+    at.button[0].click().run()
+    assert not at.exception
+    assert not at.button
+    assert len(at.get('iframe')) == 1
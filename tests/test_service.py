@@ -0,0 +1,75 @@
+# ==========================================================================================================================
+# IMPORTANDO BIBLIOTECAS NECESSÁRIAS
+# ==========================================================================================================================
+import http.client
+import json
+import socket
+import threading
+
+import pytest
+
+from utils import service
+from utils.backends import get_backend
+from utils.service import MetricsHandler, PooledHTTPServer, render_view
+
+# ==========================================================================================================================
+# FIXTURES
+# ==========================================================================================================================
+@pytest.fixture
+def server(dataset_path, monkeypatch):
+    """ Serviço com apenas duas threads no pool, em uma porta livre, e conexões paradas encerradas rapidamente.
+    """
+    monkeypatch.setattr(MetricsHandler, 'timeout', 0.5)
+    server = PooledHTTPServer(('127.0.0.1', 0), MetricsHandler, workers = 2, path = dataset_path)
+    thread = threading.Thread(target = server.serve_forever, daemon = True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+def get(server, url, timeout = 3):
+    connection = http.client.HTTPConnection('127.0.0.1', server.server_port, timeout = timeout)
+    connection.request('GET', url)
+    response = connection.getresponse()
+    return connection, response, response.read()
+
+# ==========================================================================================================================
+# TESTES
+# ==========================================================================================================================
+def test_keep_alive_clients_do_not_hold_workers(server):
+    idle = []
+    for _ in range(2):
+        connection, response, _ = get(server, '/')
+        assert response.status == 200
+        assert response.getheader('Connection') == 'close'
+        idle.append(connection)
+
+    _, response, body = get(server, '/orders_by_traffic')
+    assert response.status == 200
+    assert json.loads(body)
+
+def test_idle_connections_time_out(server):
+    idle = [socket.create_connection(('127.0.0.1', server.server_port)) for _ in range(2)]
+    _, response, _ = get(server, '/')
+    assert response.status == 200
+    for sock in idle:
+        sock.close()
+
+def test_empty_multiselect(server):
+    _, response, body = get(server, '/central_locations?traffic=')
+    assert response.status == 200
+    assert json.loads(body) == []
+
+def test_responses_are_memoized_per_backend(dataset_path, monkeypatch):
+    computed = []
+    compute_view = service.compute_view
+
+    def compute(*args, **kwargs):
+        computed.append(get_backend().name)
+        return compute_view(*args, **kwargs)
+    monkeypatch.setattr(service, 'compute_view', compute)
+
+    for backend in ['pandas', 'arrow', 'pandas', 'arrow']:
+        monkeypatch.setenv('CURRY_BACKEND', backend)
+        render_view('time_by_city', date_min = '2022-03-07', path = dataset_path)
+    assert computed == ['pandas', 'arrow']
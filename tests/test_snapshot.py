@@ -0,0 +1,77 @@
+# ==========================================================================================================================
+# IMPORTANDO BIBLIOTECAS NECESSÁRIAS
+# ==========================================================================================================================
+import os
+
+import pandas as pd
+import pyarrow.feather as feather
+import pytest
+
+from benchmarks.synthetic import write_train_csv
+from utils import data
+from utils.data import cache_path, clean_code, load_data, read_raw
+
+# ==========================================================================================================================
+# FIXTURES
+# ==========================================================================================================================
+@pytest.fixture
+def csv_path(tmp_path, monkeypatch):
+    """ CSV sintético pequeno, com o cache do processo vazio (como em um processo recém-iniciado).
+    """
+    monkeypatch.setattr(data, '_cache', {})
+    return write_train_csv(str(tmp_path / 'train.csv'), 500, seed = 3)
+
+def without_csv_cleaning(monkeypatch):
+    """ Impede a limpeza do CSV: a leitura precisa vir do snapshot.
+    """
+    def fail(path):
+        raise AssertionError('the CSV was cleaned again')
+    monkeypatch.setattr(data, '_clean_from_csv', fail)
+
+# ==========================================================================================================================
+# TESTES
+# ==========================================================================================================================
+def test_snapshot_is_reused_by_a_new_process(csv_path, monkeypatch):
+    df1 = load_data(csv_path)
+    assert os.path.exists(cache_path(csv_path))
+
+    monkeypatch.setattr(data, '_cache', {})
+    without_csv_cleaning(monkeypatch)
+    pd.testing.assert_frame_equal(load_data(csv_path), df1)
+
+def test_snapshot_matches_cleaned_csv(csv_path):
+    expected = clean_code(read_raw(csv_path)).sort_values('Order_Date', kind = 'stable').reset_index(drop = True)
+    df1 = load_data(csv_path, columns = ['Order_Date', 'City', 'Time_taken(min)', 'Distance_km'])
+
+    assert list(df1.columns) == ['Order_Date', 'City', 'Time_taken(min)', 'Distance_km']
+    pd.testing.assert_frame_equal(df1, expected[list(df1.columns)])
+
+def test_changed_csv_gets_a_new_snapshot(csv_path):
+    first = load_data(csv_path, columns = ['Order_Date'])
+    old_cache = cache_path(csv_path)
+
+    write_train_csv(csv_path, 300, seed = 4)
+    second = load_data(csv_path, columns = ['Order_Date'])
+    assert cache_path(csv_path) != old_cache and os.path.exists(cache_path(csv_path))
+    assert len(second) != len(first)
+
+def test_snapshot_from_another_cleaning_version_is_rebuilt(csv_path, monkeypatch):
+    df1 = load_data(csv_path)
+    cache = cache_path(csv_path)
+    # substituído (e não sobrescrito), pois o Dataframe anterior ainda mapeia o arquivo
+    table = feather.read_table(cache)
+    feather.write_feather(table.replace_schema_metadata({b'cache_version': b'0'}), cache + '.tmp', compression = 'uncompressed')
+    os.replace(cache + '.tmp', cache)
+
+    monkeypatch.setattr(data, '_cache', {})
+    pd.testing.assert_frame_equal(load_data(csv_path), df1)
+    assert feather.read_table(cache).schema.metadata[b'cache_version'] == data.CACHE_VERSION
+
+def test_old_snapshots_are_removed(csv_path):
+    for seed in range(data.KEEP_SNAPSHOTS + 2):
+        write_train_csv(csv_path, 200 + seed, seed = seed)
+        load_data(csv_path, columns = ['Order_Date'])
+
+    snapshots = [name for name in os.listdir(os.path.dirname(csv_path)) if name.endswith('.feather')]
+    assert len(snapshots) == data.KEEP_SNAPSHOTS
+    assert os.path.basename(cache_path(csv_path)) in snapshots
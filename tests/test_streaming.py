@@ -0,0 +1,58 @@
+# ==========================================================================================================================
+# IMPORTANDO BIBLIOTECAS NECESSÁRIAS
+# ==========================================================================================================================
+import pandas as pd
+import pytest
+
+from utils.cube import OrderCube
+from utils.data import clean_code, read_raw
+from utils.locations import LocationSketch
+from utils.streaming import chunk_rows, summarize_csv
+from utils.weekly import WeeklyStore
+
+# ==========================================================================================================================
+# FIXTURES
+# ==========================================================================================================================
+@pytest.fixture(scope = 'module')
+def full(dataset_path):
+    """ CSV inteiro limpo de uma só vez (a referência dos agregados em pedaços).
+    """
+    return clean_code(read_raw(dataset_path))
+
+@pytest.fixture(scope = 'module')
+def summary(dataset_path):
+    """ Agregados do mesmo CSV lido em 7 pedaços; os últimos pedidos de um dia caem em outro pedaço.
+    """
+    return summarize_csv(dataset_path, chunksize = 3_000)
+
+# ==========================================================================================================================
+# TESTES
+# ==========================================================================================================================
+def test_all_rows_are_summarized(summary, full):
+    assert summary.rows == len(full)
+
+def test_cube_matches_full_build(summary, full):
+    cube = OrderCube.build(full)
+    pd.testing.assert_frame_equal(summary.cube.counts(['Order_Date', 'City']), cube.counts(['Order_Date', 'City']),
+                                  check_categorical = False)
+    pd.testing.assert_frame_equal(summary.cube.mean_std('Time_taken(min)', 'Road_traffic_density'),
+                                  cube.mean_std('Time_taken(min)', 'Road_traffic_density'), check_categorical = False, rtol = 1e-9)
+
+def test_weekly_matches_full_build(summary, full):
+    pd.testing.assert_frame_equal(summary.weekly(traffic = ['Low', 'Jam']), WeeklyStore.build(full).select(traffic = ['Low', 'Jam']),
+                                  check_dtype = False, check_categorical = False)
+
+def test_exact_map_medians_match_full_build(summary, full):
+    pd.testing.assert_frame_equal(summary.map_medians(date_max = '2022-03-15'),
+                                  LocationSketch.build(full).select(date_max = '2022-03-15').medians(), check_categorical = False)
+
+def test_courier_means_match_groupby(summary, full):
+    expected = full.astype({'Time_taken(min)': 'float64'}).groupby(['City', 'Delivery_person_ID'], observed = True, sort = True)
+    expected = expected['Time_taken(min)'].mean().reset_index()
+    # os pedaços têm categorias diferentes, então as chaves somadas podem voltar como texto
+    result = summary.courier_means('Time_taken(min)')
+    pd.testing.assert_frame_equal(result, expected, check_dtype = False, check_categorical = False, rtol = 1e-12)
+
+def test_chunk_rows_follows_the_memory_cap(dataset_path):
+    assert chunk_rows(dataset_path, 64) > chunk_rows(dataset_path, 8) > 1_000
+    assert chunk_rows(dataset_path, 0.001) == 1_000
@@ -0,0 +1,93 @@
+# ==========================================================================================================================
+# IMPORTANDO BIBLIOTECAS NECESSÁRIAS
+# ==========================================================================================================================
+import numpy as np
+import pandas as pd
+import pytest
+
+from utils.data import load_data
+from utils.weekly import WEEKLY_COLUMNS, WeeklyStore, iso_year_week, load_weekly_store, week_labels, week_start, weekly_growth
+
+# ==========================================================================================================================
+# FIXTURES
+# ==========================================================================================================================
+@pytest.fixture(scope = 'module')
+def df1(dataset_path):
+    return load_data(dataset_path, columns = WEEKLY_COLUMNS)
+
+# ==========================================================================================================================
+# FUNÇÕES
+# ==========================================================================================================================
+def weekly_groupby(df1):
+    """ Série semanal calculada direto sobre as linhas, com o calendário ISO do pandas.
+    """
+    iso = df1['Order_Date'].dt.isocalendar()
+    df2 = df1.assign(iso_year = iso['year'].astype(np.int64), iso_week = iso['week'].astype(np.int64))
+    df2 = df2.groupby(['iso_year', 'iso_week']).agg(**{'ID (count)': ('Order_Date', 'size'),
+                                                       'Delivery_person_ID (nunique)': ('Delivery_person_ID', 'nunique')})
+    return df2.reset_index()
+
+# ==========================================================================================================================
+# TESTES
+# ==========================================================================================================================
+def test_iso_weeks_across_year_boundaries():
+    dates = pd.to_datetime(['2018-12-31', '2020-12-31', '2021-01-03', '2021-01-04', '2022-01-01', '2022-03-13', '2022-03-14'])
+    iso = dates.isocalendar()
+
+    iso_year, iso_week = iso_year_week(dates)
+    np.testing.assert_array_equal(iso_year, iso['year'].to_numpy(dtype = np.int64))
+    np.testing.assert_array_equal(iso_week, iso['week'].to_numpy(dtype = np.int64))
+    assert week_labels(iso_year, iso_week)[:4] == ['2019-W01', '2020-W53', '2020-W53', '2021-W01']
+
+def test_week_starts_on_monday():
+    dates = pd.Series(pd.to_datetime(['2021-01-03', '2021-01-04', '2022-03-13', '2022-03-14']))
+    starts = pd.DatetimeIndex(week_start(dates))
+    assert (starts.dayofweek == 0).all()
+    assert list(starts.strftime('%Y-%m-%d')) == ['2020-12-28', '2021-01-04', '2022-03-07', '2022-03-14']
+
+def test_select_matches_groupby(df1):
+    result = WeeklyStore.build(df1).select()
+    expected = weekly_groupby(df1)
+
+    pd.testing.assert_frame_equal(result[expected.columns], expected, check_dtype = False)
+    assert result['week_start'].is_monotonic_increasing
+    np.testing.assert_allclose(result['media_por_entreg_unico'], result['ID (count)'] / result['Delivery_person_ID (nunique)'])
+
+def test_select_filters_dates_and_traffic(df1):
+    mask = (df1['Order_Date'] >= pd.Timestamp('2022-02-20')) & (df1['Order_Date'] <= pd.Timestamp('2022-03-16')) & \
+           df1['Road_traffic_density'].isin(['Jam', 'Low'])
+    result = WeeklyStore.build(df1).select('2022-02-20', '2022-03-16', ['Jam', 'Low'])
+    expected = weekly_groupby(df1.loc[mask, :])
+    pd.testing.assert_frame_equal(result[expected.columns], expected, check_dtype = False)
+
+def test_select_does_not_change_the_frame(df1):
+    before = df1.copy()
+    WeeklyStore.build(df1).select()
+    pd.testing.assert_frame_equal(df1, before)
+
+def test_merge_matches_single_build(df1):
+    middle = len(df1) // 2
+    merged = WeeklyStore.build(df1.iloc[:middle]).merge(WeeklyStore.build(df1.iloc[middle:]))
+    pd.testing.assert_frame_equal(merged.select(traffic = ['High']), WeeklyStore.build(df1).select(traffic = ['High']))
+
+def test_growth_fills_empty_weeks():
+    df2 = WeeklyStore.build(pd.DataFrame({
+        'Order_Date': pd.to_datetime(['2022-01-03', '2022-01-04', '2022-01-17', '2022-01-24', '2022-01-25', '2022-01-26']),
+        'Road_traffic_density': 'Low',
+        'Delivery_person_ID': ['a', 'b', 'a', 'a', 'b', 'c']})).select()
+    df3 = weekly_growth(df2, window = 2)
+
+    assert list(df3['Week_of_year']) == ['2022-W01', '2022-W02', '2022-W03', '2022-W04']
+    assert list(df3['ID (count)']) == [2, 0, 1, 3]
+    assert list(df3['ID (count) (rolling mean)']) == [2, 1, 0.5, 2]
+    np.testing.assert_array_equal(df3['ID (count) (WoW %)'], [np.nan, -100, np.nan, 200])
+
+def test_growth_of_an_empty_selection(df1):
+    df3 = weekly_growth(WeeklyStore.build(df1).select(date_min = '2030-01-01'))
+    assert df3.empty
+    assert 'media_por_entreg_unico (rolling mean)' in df3.columns
+
+def test_batches_are_merged_into_the_store(batched_dataset_path):
+    expected = weekly_groupby(load_data(batched_dataset_path, columns = WEEKLY_COLUMNS))
+    result = load_weekly_store(batched_dataset_path).select()
+    pd.testing.assert_frame_equal(result[expected.columns], expected, check_dtype = False)
@@ -0,0 +1,59 @@
+# ==========================================================================================================================
+# IMPORTANDO BIBLIOTECAS NECESSÁRIAS
+# ==========================================================================================================================
+import io
+import threading
+
+import streamlit as st
+
+# ==========================================================================================================================
+# CONFIGURAÇÕES INCIAIS
+# ==========================================================================================================================
+# Imagem exibida no topo da barra lateral de todas as páginas
+LOGO_PATH = 'images/logo.jpg'
+
+# Largura (px) da imagem na barra lateral
+LOGO_WIDTH = 240
+
+# Imagens já preparadas neste processo -> {(caminho, largura): bytes}
+_lock = threading.Lock()
+_images = {}
+
+# ==========================================================================================================================
+# FUNÇÕES
+# ==========================================================================================================================
+def image_bytes(path = LOGO_PATH, width = LOGO_WIDTH):
+    """ Esta função tem a responsabilidade de preparar uma imagem estática uma única vez por processo: o arquivo é lido, reduzido
+        para a largura de exibição e guardado como JPEG em memória.
+
+        Como os bytes já têm a largura exibida, o Streamlit os envia sem decodificar, redimensionar e recodificar a imagem original
+        a cada execução da página (o que acontece quando recebe um 'PIL.Image' ou uma imagem maior que a largura pedida).
+
+        Input:  1. Caminho da imagem;
+                2. Largura de exibição (px).
+        Output: bytes (JPEG)
+    """
+    key = (path, width)
+    with _lock:
+        if key not in _images:
+            # o Pillow só é importado na primeira preparação de cada imagem
+            from PIL import Image
+
+            with Image.open(path) as image:
+                # o modo 'draft' decodifica o JPEG já em escala reduzida, sem passar pela resolução original inteira
+                image.draft('RGB', (width, width))
+                image = image.convert('RGB')
+                height = round(image.height * width / image.width)
+                output = io.BytesIO()
+                image.resize((width, height), Image.LANCZOS).save(output, format = 'JPEG', quality = 90)
+            _images[key] = output.getvalue()
+        return _images[key]
+
+def sidebar_logo(path = LOGO_PATH, width = LOGO_WIDTH):
+    """ Esta função tem a responsabilidade de exibir o logo no topo da barra lateral, a partir da imagem preparada em 'image_bytes()'.
+
+        Input:  1. Caminho da imagem;
+                2. Largura de exibição (px).
+        Output: Nenhum.
+    """
+    st.sidebar.image(image_bytes(path, width), width = width)
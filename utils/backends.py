@@ -0,0 +1,312 @@
+# ==========================================================================================================================
+# IMPORTANDO BIBLIOTECAS NECESSÁRIAS
+# ==========================================================================================================================
+import os
+import threading
+
+import pandas as pd
+import pyarrow as pa
+
+from utils.couriers import load_courier_stats
+from utils.cube import load_cube
+from utils.data import DATASET_PATH, load_derived
+from utils.partitions import load_partition_manifest, prune_partitions
+from utils.prefix import load_daily_prefix
+from utils.profiling import span
+
+# ==========================================================================================================================
+# CONFIGURAÇÕES INCIAIS
+# ==========================================================================================================================
+# Variável de ambiente que escolhe o backend das consultas das páginas e do serviço de métricas
+BACKEND_ENV = 'CURRY_BACKEND'
+
+# Backend usado quando a variável de ambiente não está definida
+DEFAULT_BACKEND = 'pandas'
+
+# ==========================================================================================================================
+# CLASSES - BACKEND PANDAS (ESTRUTURAS DERIVADAS EM MEMÓRIA)
+# ==========================================================================================================================
+class PandasSelection:
+    """ Esta classe tem a responsabilidade de responder as consultas de um estado dos filtros com as estruturas derivadas em memória:
+        contagens por data no cubo de agregados, as demais contagens, médias e desvios padrão nas somas acumuladas por dia e as médias
+        por entregador nas estatísticas por entregador.
+
+        Cada estrutura é recortada somente na primeira consulta que precisa dela (com uma trava, pois os gráficos de uma página
+        são construídos em paralelo).
+    """
+    def __init__(self, path, date_min, date_max, options):
+        """ Input:  1. Caminho do arquivo CSV;
+                    2. Datas inicial e final (inclusive), opcionais;
+                    3. Dicionário {coluna: valores aceitos}.
+        """
+        self.path = path
+        self.date_min = date_min
+        self.date_max = date_max
+        self.options = options
+        self._selected = {}
+        self._lock = threading.Lock()
+
+    def _store(self, name):
+        """ Esta função tem a responsabilidade de recortar (uma única vez) uma das estruturas derivadas com os filtros da seleção.
+
+            Input:  'cube', 'window' ou 'couriers'
+            Output: OrderCube (cube, window) ou CourierStats (couriers) recortado
+        """
+        with self._lock:
+            if name not in self._selected:
+                loader = {'cube': load_cube, 'window': load_daily_prefix, 'couriers': load_courier_stats}[name]
+                with span('filter: ' + name):
+                    self._selected[name] = loader(self.path).select(self.date_min, self.date_max, **self.options)
+            return self._selected[name]
+
+    def counts(self, by):
+        """ Esta função tem a responsabilidade de contar os pedidos por uma ou mais colunas.
+
+            Input:  Coluna ou lista de colunas
+            Output: Dataframe com as colunas e a coluna 'count'
+        """
+        return _present_categories(self._store('cube' if 'Order_Date' in _keys(by) else 'window').counts(by))
+
+    def mean_std(self, measure, by):
+        """ Esta função tem a responsabilidade de calcular a média e o desvio padrão amostral de uma medida por uma ou mais colunas.
+
+            Input:  1. Medida;
+                    2. Coluna ou lista de colunas.
+            Output: Dataframe com as colunas e as colunas 'mean' e 'std'
+        """
+        return _present_categories(self._store('cube' if 'Order_Date' in _keys(by) else 'window').mean_std(measure, by))
+
+    def means(self, measure, by):
+        """ Esta função tem a responsabilidade de calcular a média de uma medida por uma ou mais chaves que incluem o entregador.
+
+            Input:  1. Medida;
+                    2. Chave ou lista de chaves.
+            Output: Series com o nome da medida, indexada pelas chaves e ordenada
+        """
+        return _present_categories(self._store('couriers').means(measure, by))
+
+class PandasBackend:
+    """ Esta classe tem a responsabilidade de consultar o conjunto de dados pelas estruturas derivadas em memória (cubo de agregados,
+        somas acumuladas por dia e estatísticas por entregador), construídas uma única vez por processo e por versão do dataset.
+    """
+    name = 'pandas'
+
+    def __init__(self, path = DATASET_PATH):
+        """ Input:  Caminho do arquivo CSV
+        """
+        self.path = path
+
+    def select(self, date_min = None, date_max = None, **options):
+        """ Esta função tem a responsabilidade de receber os filtros da barra lateral.
+
+            Input:  1. Data inicial (inclusive), opcional;
+                    2. Data final (inclusive), opcional;
+                    3. Valores aceitos de cada coluna, por exemplo Road_traffic_density = ['Low', 'High'].
+            Output: PandasSelection
+        """
+        return PandasSelection(self.path, date_min, date_max, options)
+
+# ==========================================================================================================================
+# CLASSES - BACKEND ARROW (MOTOR COLUNAR EMBARCADO)
+# ==========================================================================================================================
+class ArrowSelection:
+    """ Esta classe tem a responsabilidade de responder as consultas de um estado dos filtros diretamente sobre os arquivos colunares
+        do conjunto de dados (as partições do período e das cidades selecionados), com o motor de consultas do Arrow.
+
+        Cada consulta lê somente as colunas que usa (projeção), aplica os filtros durante a leitura (predicados), antes de montar
+        qualquer tabela, e agrega com o 'group_by' multi-thread do Arrow. Nada além do resultado fica em memória entre as consultas.
+    """
+    def __init__(self, dataset, date_min, date_max, options):
+        """ Input:  1. pyarrow.dataset.Dataset das partições selecionadas;
+                    2. Datas inicial e final (inclusive), opcionais;
+                    3. Dicionário {coluna: valores aceitos}.
+        """
+        self.dataset = dataset
+        self.filter = _filter_expression(dataset.schema, date_min, date_max, options)
+
+    def _aggregate(self, by, columns, aggregations, names):
+        """ Esta função tem a responsabilidade de ler as colunas necessárias com os filtros e agregá-las por uma ou mais chaves.
+
+            Input:  1. Chave ou lista de chaves;
+                    2. Colunas lidas além das chaves;
+                    3. Agregações no formato de 'pyarrow.TableGroupBy.aggregate()';
+                    4. Nomes das colunas de resultado, na ordem das agregações.
+            Output: Dataframe com as chaves (categóricas, exceto datas) e as colunas de resultado, ordenado pelas chaves
+        """
+        keys = _keys(by)
+        for col in keys + columns:
+            if col not in self.dataset.schema.names:
+                raise ValueError("Invalid column '{}'! Expected one of {}.".format(col, self.dataset.schema.names))
+
+        with span('scan: arrow'):
+            table = self.dataset.to_table(columns = list(dict.fromkeys(keys + columns)), filter = self.filter, use_threads = True)
+        with span('group_by: arrow'):
+            table = table.group_by(keys, use_threads = True).aggregate(aggregations)
+
+        df2 = table.to_pandas()
+        df2 = df2.loc[:, keys + [col for col in df2.columns if col not in keys]]
+        df2.columns = keys + names
+        for col in keys:
+            if not pd.api.types.is_datetime64_any_dtype(df2[col]):
+                df2[col] = _categorical(df2[col])
+        return df2.sort_values(keys, kind = 'stable').reset_index(drop = True)
+
+    def counts(self, by):
+        """ Esta função tem a responsabilidade de contar os pedidos por uma ou mais colunas.
+
+            Input:  Coluna ou lista de colunas
+            Output: Dataframe com as colunas e a coluna 'count'
+        """
+        df2 = self._aggregate(by, [], [([], 'count_all')], ['count'])
+        df2['count'] = df2['count'].astype('int64')
+        return df2
+
+    def mean_std(self, measure, by):
+        """ Esta função tem a responsabilidade de calcular a média e o desvio padrão amostral de uma medida por uma ou mais colunas.
+
+            Input:  1. Medida;
+                    2. Coluna ou lista de colunas.
+            Output: Dataframe com as colunas e as colunas 'mean' e 'std'
+        """
+        import pyarrow.compute as pc
+
+        df2 = self._aggregate(by, [measure], [(measure, 'mean'), (measure, 'stddev', pc.VarianceOptions(ddof = 1))], ['mean', 'std'])
+        return df2.astype({'mean': 'float64', 'std': 'float64'})
+
+    def means(self, measure, by):
+        """ Esta função tem a responsabilidade de calcular a média de uma medida por uma ou mais chaves.
+
+            Input:  1. Medida;
+                    2. Chave ou lista de chaves.
+            Output: Series com o nome da medida, indexada pelas chaves e ordenada
+        """
+        keys = _keys(by)
+        df2 = self._aggregate(keys, [measure], [(measure, 'mean')], [measure])
+        index = pd.MultiIndex.from_frame(df2[keys]) if len(keys) > 1 else pd.Index(df2[keys[0]])
+        return pd.Series(df2[measure].to_numpy(dtype = 'float64'), index = index, name = measure)
+
+class ArrowBackend:
+    """ Esta classe tem a responsabilidade de consultar o conjunto de dados com o motor colunar embarcado do Arrow, diretamente sobre
+        as partições já publicadas ('utils.partitions'), sem carregar o Dataframe limpo nem construir as estruturas derivadas.
+    """
+    name = 'arrow'
+
+    def __init__(self, path = DATASET_PATH):
+        """ Input:  Caminho do arquivo CSV
+        """
+        self.path = path
+
+    def select(self, date_min = None, date_max = None, **options):
+        """ Esta função tem a responsabilidade de receber os filtros da barra lateral.
+
+            Input:  1. Data inicial (inclusive), opcional;
+                    2. Data final (inclusive), opcional;
+                    3. Valores aceitos de cada coluna, por exemplo Road_traffic_density = ['Low', 'High'].
+            Output: ArrowSelection
+        """
+        import pyarrow.dataset as ds
+
+        # somente as partições que podem ter pedidos do período e das cidades selecionados entram no dataset (as demais não são abertas)
+        entries = prune_partitions(load_partition_manifest(self.path), date_min, date_max, options.get('City'))
+        dataset = ds.dataset([entry['file'] for entry in entries], format = 'feather', schema = load_arrow_schema(self.path))
+        return ArrowSelection(dataset, date_min, date_max, options)
+
+# Backends disponíveis: nome -> classe
+BACKENDS = {'pandas': PandasBackend, 'arrow': ArrowBackend}
+
+# ==========================================================================================================================
+# FUNÇÕES
+# ==========================================================================================================================
+def _keys(by):
+    """ Esta função tem a responsabilidade de padronizar uma chave ou lista de chaves como lista.
+
+        Input:  Chave ou lista de chaves
+        Output: Lista de chaves
+    """
+    return [by] if isinstance(by, str) else list(by)
+
+def _categorical(values):
+    """ Esta função tem a responsabilidade de converter uma coluna de chaves em categórica somente com as categorias presentes, ordenadas.
+
+        Input:  Series
+        Output: Categorical
+    """
+    return pd.Categorical(values, categories = sorted(pd.Series(values).dropna().unique()))
+
+def _present_categories(result):
+    """ Esta função tem a responsabilidade de manter nas chaves categóricas de um resultado somente as categorias presentes nele.
+
+        As estruturas derivadas guardam as categorias do conjunto de dados inteiro; sem este passo, um recorte (ou uma seleção vazia)
+        levaria categorias sem linhas para os gráficos, que as tratam como valores (o sunburst da página de restaurantes, por exemplo,
+        falha). O backend Arrow já devolve as chaves neste formato.
+
+        Input:  Dataframe (chaves nas colunas) ou Series (chaves no índice)
+        Output: Mesmo tipo, com as chaves categóricas restritas às categorias presentes
+    """
+    if isinstance(result, pd.Series):
+        keys = list(result.index.names)
+        return _present_categories(result.reset_index()).set_index(keys)[result.name]
+
+    result = result.copy()
+    for col in result.columns:
+        if isinstance(result[col].dtype, pd.CategoricalDtype):
+            result[col] = _categorical(result[col])
+    return result
+
+def _filter_expression(schema, date_min, date_max, options):
+    """ Esta função tem a responsabilidade de traduzir os filtros da barra lateral em uma expressão do Arrow, avaliada durante a leitura.
+
+        Input:  1. Esquema do dataset;
+                2. Datas inicial e final (inclusive), opcionais;
+                3. Dicionário {coluna: valores aceitos}.
+        Output: pyarrow.dataset.Expression
+    """
+    import pyarrow.dataset as ds
+
+    expression = ds.scalar(True)
+    date_type = schema.field('Order_Date').type
+    if date_min is not None:
+        expression &= ds.field('Order_Date') >= pa.scalar(pd.Timestamp(date_min), type = date_type)
+    if date_max is not None:
+        expression &= ds.field('Order_Date') <= pa.scalar(pd.Timestamp(date_max), type = date_type)
+    for col, values in options.items():
+        if col not in schema.names:
+            raise ValueError("Invalid filter column '{}'! Expected one of {}.".format(col, schema.names))
+        expression &= ds.field(col).isin(pa.array(list(values), type = schema.field(col).type))
+    return expression
+
+def build_arrow_schema(path = DATASET_PATH):
+    """ Esta função tem a responsabilidade de definir o esquema comum das partições e dos lotes ingeridos, a partir da primeira partição.
+
+        As colunas categóricas (dicionários, cujos valores e tipos de índice variam entre os arquivos) são lidas como texto, o que
+        permite agrupar e filtrar todos os arquivos da mesma forma.
+
+        Input:  Caminho do arquivo CSV
+        Output: pyarrow.Schema
+    """
+    import pyarrow.dataset as ds
+
+    schema = ds.dataset(load_partition_manifest(path)[0]['file'], format = 'feather').schema
+    return pa.schema([pa.field(field.name, field.type.value_type if pa.types.is_dictionary(field.type) else field.type)
+                      for field in schema])
+
+def load_arrow_schema(path = DATASET_PATH):
+    """ Esta função tem a responsabilidade de fornecer o esquema das partições, definido uma única vez por processo e por versão do dataset.
+
+        Input:  Caminho do arquivo CSV
+        Output: pyarrow.Schema
+    """
+    return load_derived('arrow_schema', build_arrow_schema, path)
+
+def get_backend(name = None, path = DATASET_PATH):
+    """ Esta função tem a responsabilidade de fornecer o backend das consultas: o informado ou, por padrão, o definido na variável
+        de ambiente CURRY_BACKEND ('pandas' quando ela não está definida).
+
+        Input:  1. Nome do backend (uma das chaves de BACKENDS), opcional;
+                2. Caminho do arquivo CSV.
+        Output: PandasBackend ou ArrowBackend
+    """
+    name = name or os.environ.get(BACKEND_ENV, DEFAULT_BACKEND)
+    if name not in BACKENDS:
+        raise ValueError("Unknown backend '{}'! Expected one of {}.".format(name, list(BACKENDS)))
+    return BACKENDS[name](path)
@@ -0,0 +1,185 @@
+# ==========================================================================================================================
+# IMPORTANDO BIBLIOTECAS NECESSÁRIAS
+# ==========================================================================================================================
+import numpy as np
+import pandas as pd
+
+from utils.data import DATASET_PATH, concat_clean, load_data, load_derived, read_batches
+
+# ==========================================================================================================================
+# CONFIGURAÇÕES INCIAIS
+# ==========================================================================================================================
+# Dimensões das partições diárias (os filtros da Visão Entregadores são aplicados sobre elas)
+COURIER_DIMS = ['Order_Date', 'Road_traffic_density', 'Weatherconditions', 'City']
+
+# Chaves das células: uma célula por entregador em cada partição
+COURIER_KEYS = COURIER_DIMS + ['Delivery_person_ID']
+
+# Medidas guardadas em cada célula como estatísticas suficientes para as médias (contagem e média)
+COURIER_MEASURES = ['Delivery_person_Ratings', 'Time_taken(min)']
+
+# Colunas do dataset necessárias para construir o repositório
+COURIER_COLUMNS = COURIER_KEYS + COURIER_MEASURES
+
+# ==========================================================================================================================
+# CLASSES
+# ==========================================================================================================================
+class CourierStats:
+    """ Esta classe tem a responsabilidade de guardar as estatísticas suficientes das medidas de cada entregador por partição diária
+        (data x tráfego x clima x cidade x entregador).
+
+        Cada célula guarda, por medida, a contagem e a média, o que basta para as médias por entregador das tabelas e dos rankings
+        (os desvios padrão por tráfego e por clima vêm do cubo de agregados). Qualquer recorte da barra lateral é respondido unindo
+        as células selecionadas pela média ponderada pelas contagens.
+
+        O custo das tabelas depende do número de células (entregadores x dias do recorte), e não do número de pedidos,
+        e novos lotes são incorporados com 'merge()'.
+    """
+    def __init__(self, cells):
+        """ Input:  Dataframe das células (COURIER_KEYS, '<medida> (count)' e '<medida> (mean)' para cada medida)
+        """
+        self.cells = cells
+
+    @classmethod
+    def build(cls, df1):
+        """ Esta função tem a responsabilidade de construir as células a partir do Dataframe limpo, em uma única passada agrupada.
+
+            Input:  Dataframe limpo (com COURIER_COLUMNS)
+            Output: CourierStats
+        """
+        cell_id = df1.groupby(COURIER_KEYS, observed = True, sort = True).ngroup().to_numpy()
+        valid = cell_id >= 0
+        df1 = df1.loc[valid, :]
+        cell_id = cell_id[valid]
+        n_cells = int(cell_id.max()) + 1 if len(cell_id) else 0
+
+        _, first_row = np.unique(cell_id, return_index = True)
+        cells = df1[COURIER_KEYS].iloc[first_row].reset_index(drop = True)
+
+        # Cada linha é uma parte com contagem 1 (0 quando o valor está ausente) e média igual ao valor
+        for measure in COURIER_MEASURES:
+            values = df1[measure].to_numpy(dtype = np.float64)
+            cells = cells.assign(**_moments(measure, cell_id, n_cells, (~np.isnan(values)).astype(np.float64), values))
+        return cls(cells)
+
+    def merge(self, other):
+        """ Esta função tem a responsabilidade de unir dois repositórios (por exemplo, o histórico e um novo lote de pedidos),
+            combinando as estatísticas das células em comum.
+
+            Input:  Outro CourierStats
+            Output: Novo CourierStats
+        """
+        both = concat_clean([self.cells, other.cells])
+        cell_id = both.groupby(COURIER_KEYS, observed = True, sort = True).ngroup().to_numpy()
+        n_cells = int(cell_id.max()) + 1 if len(cell_id) else 0
+
+        _, first_row = np.unique(cell_id, return_index = True)
+        cells = both[COURIER_KEYS].iloc[first_row].reset_index(drop = True)
+        for measure in COURIER_MEASURES:
+            cells = cells.assign(**_moments(measure, cell_id, n_cells, both[measure + ' (count)'], both[measure + ' (mean)']))
+        return CourierStats(cells)
+
+    def select(self, date_min = None, date_max = None, **options):
+        """ Esta função tem a responsabilidade de recortar as células de acordo com os filtros da barra lateral.
+
+            Input:  1. Data inicial (inclusive), opcional;
+                    2. Data final (inclusive), opcional;
+                    3. Valores aceitos de cada dimensão, por exemplo Road_traffic_density = ['Low', 'High'].
+            Output: Novo CourierStats, somente com as células selecionadas.
+        """
+        mask = np.ones(len(self.cells), dtype = bool)
+        if date_min is not None:
+            mask &= (self.cells['Order_Date'] >= pd.Timestamp(date_min)).to_numpy()
+        if date_max is not None:
+            mask &= (self.cells['Order_Date'] <= pd.Timestamp(date_max)).to_numpy()
+        for col, values in options.items():
+            if col not in COURIER_DIMS:
+                raise ValueError("Invalid dimension '{}'! Expected one of {}.".format(col, COURIER_DIMS))
+            mask &= self.cells[col].isin(values).to_numpy()
+
+        return CourierStats(self.cells.loc[mask, :])
+
+    def means(self, measure, by = 'Delivery_person_ID'):
+        """ Esta função tem a responsabilidade de calcular a média de uma medida por uma ou mais chaves, unindo as células do recorte atual.
+
+            Input:  1. Medida (uma de COURIER_MEASURES);
+                    2. Chave ou lista de chaves (de COURIER_KEYS).
+            Output: Series com o nome da medida, indexada pelas chaves e ordenada
+        """
+        df2, group_id, n_groups = _groups(self.cells, by)
+        stats = _moments(measure, group_id, n_groups, self.cells[measure + ' (count)'], self.cells[measure + ' (mean)'])
+        return pd.Series(stats[measure + ' (mean)'], index = pd.MultiIndex.from_frame(df2) if df2.shape[1] > 1 else pd.Index(df2.iloc[:, 0]),
+                         name = measure)
+
+# ==========================================================================================================================
+# FUNÇÕES
+# ==========================================================================================================================
+def _groups(cells, by):
+    """ Esta função tem a responsabilidade de numerar os grupos das células por uma ou mais chaves, em ordem.
+
+        Quando todas as chaves são categóricas (como 'Delivery_person_ID' e 'City'), o número do grupo é calculado diretamente
+        dos códigos das categorias, sem ordenar as células; caso contrário, é usado o 'ngroup()' do pandas.
+
+        Input:  1. Dataframe das células;
+                2. Chave ou lista de chaves.
+        Output: Tupla (Dataframe com as chaves de cada grupo, array com o grupo de cada célula, número de grupos)
+    """
+    keys = [by] if isinstance(by, str) else list(by)
+    columns = [cells[key] for key in keys]
+
+    if all(isinstance(col.dtype, pd.CategoricalDtype) for col in columns):
+        shape = tuple(len(col.cat.categories) for col in columns)
+        codes = [col.cat.codes.to_numpy().astype(np.int64) for col in columns]
+        if all(code.min(initial = 0) >= 0 for code in codes):
+            dense = np.ravel_multi_index(codes, shape) if codes else np.zeros(0, dtype = np.int64)
+            present = np.flatnonzero(np.bincount(dense, minlength = int(np.prod(shape))))
+            lookup = np.zeros(int(np.prod(shape)), dtype = np.int64)
+            lookup[present] = np.arange(len(present))
+            df2 = pd.DataFrame({key: pd.Categorical.from_codes(code, dtype = col.dtype)
+                                for key, col, code in zip(keys, columns, np.unravel_index(present, shape))})
+            return df2, lookup[dense], len(present)
+
+    groups = cells.groupby(keys, observed = True, sort = True)
+    return groups.size().index.to_frame(index = False), groups.ngroup().to_numpy(), groups.ngroups
+
+def _moments(measure, groups, n_groups, count, mean):
+    """ Esta função tem a responsabilidade de unir a contagem e a média de uma medida por grupo (média ponderada pelas contagens).
+
+        Input:  1. Medida;
+                2. Array com o grupo de cada parte e número de grupos;
+                3. Arrays com a contagem e a média de cada parte.
+        Output: Dicionário {'<medida> (<estatística>)': array por grupo}
+    """
+    count = np.asarray(count, dtype = np.float64)
+    mean = np.where(count > 0, np.asarray(mean, dtype = np.float64), 0.0)
+
+    total = np.bincount(groups, weights = count, minlength = n_groups)
+    with np.errstate(divide = 'ignore', invalid = 'ignore'):
+        group_mean = np.bincount(groups, weights = count * mean, minlength = n_groups) / total
+    return {measure + ' (count)': total, measure + ' (mean)': group_mean}
+
+def build_courier_stats(path = DATASET_PATH):
+    """ Esta função tem a responsabilidade de construir as estatísticas por entregador a partir do conjunto de dados limpo.
+
+        Input:  Caminho do arquivo CSV
+        Output: CourierStats
+    """
+    return CourierStats.build(load_data(path, columns = COURIER_COLUMNS))
+
+def update_courier_stats(stats, path, batches):
+    """ Esta função tem a responsabilidade de atualizar as estatísticas por entregador com novos lotes de pedidos, sem reprocessar o histórico.
+
+        Input:  1. CourierStats atual;
+                2. Caminho do arquivo CSV;
+                3. Nomes dos novos lotes.
+        Output: CourierStats atualizado
+    """
+    return stats.merge(CourierStats.build(concat_clean(read_batches(path, batches, COURIER_COLUMNS))))
+
+def load_courier_stats(path = DATASET_PATH):
+    """ Esta função tem a responsabilidade de fornecer as estatísticas por entregador, construídas uma única vez por processo e por versão do dataset.
+
+        Input:  Caminho do arquivo CSV
+        Output: CourierStats
+    """
+    return load_derived('courier_stats', build_courier_stats, path, update_courier_stats)
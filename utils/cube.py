@@ -0,0 +1,168 @@
+# ==========================================================================================================================
+# IMPORTANDO BIBLIOTECAS NECESSÁRIAS
+# ==========================================================================================================================
+import numpy as np
+import pandas as pd
+
+from utils.data import DATASET_PATH, concat_clean, load_data, load_derived, read_batches
+from utils.sketches import combine_moments, sample_std
+
+# ==========================================================================================================================
+# CONFIGURAÇÕES INCIAIS
+# ==========================================================================================================================
+# Dimensões (granularidade) do cubo: uma célula para cada combinação observada destes valores
+CUBE_DIMS = ['Order_Date', 'Road_traffic_density', 'Weatherconditions', 'City', 'Festival', 'Type_of_order']
+
+# Medidas numéricas guardadas em cada célula como média e M2 (soma dos quadrados dos desvios em relação à média)
+CUBE_MEASURES = ['Time_taken(min)', 'Delivery_person_Ratings', 'Distance_km']
+
+# Colunas do dataset necessárias para construir o cubo
+CUBE_COLUMNS = CUBE_DIMS + CUBE_MEASURES
+
+# ==========================================================================================================================
+# CLASSES
+# ==========================================================================================================================
+class OrderCube:
+    """ Esta classe tem a responsabilidade de guardar os pedidos pré-agregados na granularidade
+        (data x tráfego x clima x cidade x festival x tipo de pedido).
+
+        Cada célula guarda a contagem de pedidos e a média e o M2 de cada medida, o que basta para responder contagens, médias e
+        desvios padrão de qualquer recorte (as células são unidas com a fórmula de Chan, em 'combine_moments()'). Os entregadores
+        distintos ficam na série semanal ('utils.weekly'), no modo exato ou no HyperLogLog.
+
+        O custo das consultas depende do número de células, e não do número de pedidos do histórico.
+    """
+    def __init__(self, cells):
+        """ Input:  Dataframe das células (dimensões, 'cell', 'count', '<medida> (mean)' e '<medida> (m2)')
+        """
+        self.cells = cells
+
+    @classmethod
+    def build(cls, df1):
+        """ Esta função tem a responsabilidade de construir o cubo a partir do Dataframe limpo, em uma única passada agrupada.
+
+            Input:  Dataframe limpo (com as colunas de CUBE_COLUMNS)
+            Output: OrderCube
+        """
+        cell_id = df1.groupby(CUBE_DIMS, observed = True, sort = True).ngroup().to_numpy()
+        valid = cell_id >= 0
+        df1 = df1.loc[valid, :]
+        cell_id = cell_id[valid]
+
+        _, first_row = np.unique(cell_id, return_index = True)
+        cells = df1[CUBE_DIMS].iloc[first_row].reset_index(drop = True)
+        cells['cell'] = np.arange(len(cells))
+        cells = cells.assign(**_cell_moments(cell_id, len(cells), np.ones(len(df1)),
+                                             {measure: (df1[measure], np.zeros(len(df1))) for measure in CUBE_MEASURES}))
+        return cls(cells)
+
+    def merge(self, other):
+        """ Esta função tem a responsabilidade de unir dois cubos (por exemplo, o histórico e um novo lote de pedidos),
+            combinando as estatísticas das células em comum.
+
+            Input:  Outro OrderCube
+            Output: Novo OrderCube
+        """
+        both = pd.concat([self.cells, other.cells], ignore_index = True)
+        for col in CUBE_DIMS:
+            if isinstance(self.cells[col].dtype, pd.CategoricalDtype) and not isinstance(both[col].dtype, pd.CategoricalDtype):
+                both[col] = both[col].astype('category')
+
+        new_id = both.groupby(CUBE_DIMS, observed = True, sort = True).ngroup().to_numpy()
+        _, first_row = np.unique(new_id, return_index = True)
+        cells = both[CUBE_DIMS].iloc[first_row].reset_index(drop = True)
+        cells['cell'] = np.arange(len(cells))
+        cells = cells.assign(**_cell_moments(new_id, len(cells), both['count'],
+                                             {measure: (both[measure + ' (mean)'], both[measure + ' (m2)']) for measure in CUBE_MEASURES}))
+        return OrderCube(cells)
+
+    def select(self, date_min = None, date_max = None, **options):
+        """ Esta função tem a responsabilidade de recortar o cubo de acordo com os filtros da barra lateral.
+
+            Input:  1. Data inicial (inclusive), opcional;
+                    2. Data final (inclusive), opcional;
+                    3. Valores aceitos de cada dimensão, por exemplo Road_traffic_density = ['Low', 'High'].
+            Output: Novo OrderCube, somente com as células selecionadas.
+        """
+        mask = np.ones(len(self.cells), dtype = bool)
+        if date_min is not None:
+            mask &= (self.cells['Order_Date'] >= pd.Timestamp(date_min)).to_numpy()
+        if date_max is not None:
+            mask &= (self.cells['Order_Date'] <= pd.Timestamp(date_max)).to_numpy()
+        for col, values in options.items():
+            if col not in CUBE_DIMS:
+                raise ValueError("Invalid dimension '{}'! Expected one of {}.".format(col, CUBE_DIMS))
+            mask &= self.cells[col].isin(values).to_numpy()
+
+        return OrderCube(self.cells.loc[mask, :])
+
+    def counts(self, by):
+        """ Esta função tem a responsabilidade de contar os pedidos por uma ou mais dimensões.
+
+            Input:  Dimensão ou lista de dimensões
+            Output: Dataframe com as dimensões e a coluna 'count'
+        """
+        return self.cells.groupby(by, observed = True)['count'].sum().reset_index()
+
+    def mean_std(self, measure, by):
+        """ Esta função tem a responsabilidade de calcular a média e o desvio padrão amostral de uma medida por uma ou mais dimensões,
+            unindo a contagem, a média e o M2 das células com a fórmula de Chan.
+
+            Input:  1. Medida (uma de CUBE_MEASURES);
+                    2. Dimensão ou lista de dimensões.
+            Output: Dataframe com as dimensões e as colunas 'mean' e 'std'
+        """
+        groups = self.cells.groupby(by, observed = True, sort = True)
+        count, mean, m2 = combine_moments(groups.ngroup().to_numpy(), groups.ngroups, self.cells['count'].to_numpy(),
+                                          self.cells[measure + ' (mean)'].to_numpy(), self.cells[measure + ' (m2)'].to_numpy())
+
+        df2 = groups.size().index.to_frame(index = False)
+        df2['mean'] = mean
+        df2['std'] = sample_std(count, m2)
+        return df2
+
+# ==========================================================================================================================
+# FUNÇÕES
+# ==========================================================================================================================
+def _cell_moments(cell_id, n_cells, count, measures):
+    """ Esta função tem a responsabilidade de calcular as estatísticas das células unindo as suas partes (linhas ou células
+        de outros cubos) com a fórmula de Chan.
+
+        Input:  1. Array com a célula de cada parte e número de células;
+                2. Contagem de cada parte;
+                3. Dicionário {medida: (média de cada parte, M2 de cada parte)}.
+        Output: Dicionário com as colunas 'count', '<medida> (mean)' e '<medida> (m2)' das células
+    """
+    count = np.asarray(count, dtype = np.float64)
+    stats = {'count': np.bincount(cell_id, weights = count, minlength = n_cells).astype(np.int64)}
+    for measure, (mean, m2) in measures.items():
+        _, stats[measure + ' (mean)'], stats[measure + ' (m2)'] = combine_moments(cell_id, n_cells, count, mean, m2)
+    return stats
+
+def build_cube(path = DATASET_PATH):
+    """ Esta função tem a responsabilidade de construir o cubo de agregados a partir do conjunto de dados limpo.
+
+        Input:  Caminho do arquivo CSV
+        Output: OrderCube
+    """
+    df1 = load_data(path, columns = CUBE_COLUMNS)
+    return OrderCube.build(df1)
+
+def update_cube(cube, path, batches):
+    """ Esta função tem a responsabilidade de atualizar o cubo com novos lotes de pedidos, sem reprocessar o histórico.
+
+        Input:  1. OrderCube atual;
+                2. Caminho do arquivo CSV;
+                3. Nomes dos novos lotes.
+        Output: OrderCube atualizado
+    """
+    df1 = concat_clean(read_batches(path, batches, CUBE_COLUMNS))
+    return cube.merge(OrderCube.build(df1))
+
+def load_cube(path = DATASET_PATH):
+    """ Esta função tem a responsabilidade de fornecer o cubo de agregados, construído uma única vez por processo e por versão do dataset.
+
+        Input:  Caminho do arquivo CSV
+        Output: OrderCube
+    """
+    return load_derived('cube', build_cube, path, update_cube)
@@ -0,0 +1,526 @@
+# ==========================================================================================================================
+# IMPORTANDO BIBLIOTECAS NECESSÁRIAS
+# ==========================================================================================================================
+import os
+import re
+import threading
+import warnings
+from collections import OrderedDict
+from contextlib import contextmanager
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+from pyarrow import feather, ipc
+
+from utils.geo import haversine_km
+from utils.profiling import span
+
+try:
+    import fcntl
+except ImportError:
+    # Sem fcntl (Windows), não há trava entre processos: cada processo pode publicar o snapshot por conta própria
+    fcntl = None
+
+# ==========================================================================================================================
+# CONFIGURAÇÕES INCIAIS
+# ==========================================================================================================================
+# Com o copy-on-write ativo, qualquer alteração feita por uma página no Dataframe recebido gera uma cópia local,
+# de modo que o Dataframe compartilhado entre as sessões nunca é modificado.
+pd.set_option('mode.copy_on_write', True)
+
+# Caminho padrão do conjunto de dados
+DATASET_PATH = 'dataset/train.csv'
+
+# Valores interpretados como dados ausentes na leitura do CSV
+NA_VALUES = ['NaN', 'NaN ']
+
+# Tipos de dados da leitura do CSV bruto: textos repetitivos são lidos diretamente como categorias
+RAW_DTYPES = {
+    'ID': 'object',
+    'Delivery_person_ID': 'category',
+    'Delivery_person_Age': 'float32',
+    'Delivery_person_Ratings': 'float32',
+    'Restaurant_latitude': 'float64',
+    'Restaurant_longitude': 'float64',
+    'Delivery_location_latitude': 'float64',
+    'Delivery_location_longitude': 'float64',
+    'Order_Date': 'category',
+    'Time_Orderd': 'category',
+    'Time_Order_picked': 'category',
+    'Weatherconditions': 'category',
+    'Road_traffic_density': 'category',
+    'Vehicle_condition': 'int8',
+    'Type_of_order': 'category',
+    'Type_of_vehicle': 'category',
+    'multiple_deliveries': 'float32',
+    'Festival': 'category',
+    'City': 'category',
+    'Time_taken(min)': 'category'}
+
+# Colunas de texto que recebem a limpeza dos espaços (typos) e cujos dados ausentes descartam a linha
+STRIP_COLS = ['ID', 'Delivery_person_ID', 'Delivery_person_Age', 'Delivery_person_Ratings', 'Road_traffic_density',
+              'Type_of_order', 'Type_of_vehicle', 'Festival', 'City']
+
+# Colunas entregues como categorias no Dataframe limpo. Os IDs dos entregadores também ficam codificados em dicionário
+# (cada ID é guardado uma única vez e as linhas guardam códigos inteiros), o que permite contar entregadores distintos sobre os códigos.
+CATEGORY_COLS = ['City', 'Road_traffic_density', 'Weatherconditions', 'Type_of_order', 'Type_of_vehicle', 'Festival', 'Delivery_person_ID']
+
+# Tipos numéricos do Dataframe limpo
+CLEAN_DTYPES = {
+    'Delivery_person_Age': 'int8',
+    'Delivery_person_Ratings': 'float32',
+    'Vehicle_condition': 'int8',
+    'multiple_deliveries': 'float32',
+    'Time_taken(min)': 'int16'}
+
+# Versão do formato do cache colunar em disco; deve ser incrementada sempre que 'clean_code()' mudar a saída
+CACHE_VERSION = b'3'
+
+# Quantidade de snapshots (versões do dataset limpo) mantidos em disco: o atual e o anterior, que ainda pode estar
+# mapeado por processos que não perceberam a troca
+KEEP_SNAPSHOTS = 2
+
+# Cache do processo: guarda apenas a versão mais recente do Dataframe limpo de cada arquivo (por conjunto de colunas)
+_cache = {}
+_lock = threading.RLock()
+
+# Cache do processo para as estruturas derivadas do conjunto de dados (cubos, índices...), também por versão do arquivo
+_derived = {}
+
+# Cache do processo para resultados que dependem dos filtros (métricas, mapas renderizados...): um LRU por nome
+_memo = {}
+
+# ==========================================================================================================================
+# FUNÇÕES
+# ==========================================================================================================================
+def _as_category(col):
+    """ Esta função tem a responsabilidade de garantir que uma coluna seja categórica, para que as operações de texto sejam aplicadas apenas sobre os valores únicos.
+
+        Input:  Series
+        Output: Series categórica
+    """
+    if isinstance(col.dtype, pd.CategoricalDtype):
+        return col
+    return col.astype('category')
+
+def _strip_categories(col, to_strip = None):
+    """ Esta função tem a responsabilidade de remover os espaços (typos) de uma coluna categórica, operando somente sobre as categorias.
+        Categorias que passam a coincidir após a limpeza são unificadas e o texto 'NaN' passa a ser tratado como dado ausente.
+
+        Input:  1. Series;
+                2. Caracteres a serem removidos (padrão: espaços).
+        Output: Series categórica limpa.
+    """
+    col = _as_category(col)
+    categories = col.cat.categories.astype(str).str.strip(to_strip)
+    categories = categories.where(categories != 'NaN')
+    labels, uniques = pd.factorize(categories)
+    # o código -1 (dado ausente) aponta para o último elemento, que também é -1
+    labels = np.append(labels, -1)
+    codes = labels[col.cat.codes.to_numpy()]
+    return pd.Series(pd.Categorical.from_codes(codes, uniques), index = col.index, name = col.name)
+
+def _convert_categories(col, func):
+    """ Esta função tem a responsabilidade de converter os valores de uma coluna aplicando 'func' apenas uma vez por valor único.
+
+        Input:  1. Series;
+                2. Função de conversão que recebe e devolve um Index.
+        Output: Series convertida.
+    """
+    col = _as_category(col)
+    values = pd.Index(func(col.cat.categories)).to_numpy()
+    values = pd.api.extensions.take(values, col.cat.codes.to_numpy(), allow_fill = True)
+    return pd.Series(values, index = col.index, name = col.name)
+
+def read_raw(path = DATASET_PATH, **kwargs):
+    """ Esta função tem a responsabilidade de ler o CSV bruto já com os tipos de dados definidos, reconhecendo 'NaN' e 'NaN ' como dados ausentes.
+
+        Input:  Caminho do arquivo CSV (e parâmetros extras para o pd.read_csv, como 'chunksize')
+        Output: Dataframe bruto
+    """
+    return pd.read_csv(path, dtype = RAW_DTYPES, na_values = NA_VALUES, **kwargs)
+
+def clean_code(df1):
+    """ Esta função tem a responsabilidade de limpar o dataframe
+
+        Tipos de limpeza:
+        1. Remoção os dados NaN;
+        2. Mudança nos tipos de dados das colunas;
+        3. Remoção dos espaços presentes nos dados strings (typos);
+        4. Formatação da coluna de datas;
+        5. Limpeza da coluna de tempo ( remoção do texto '(min)' da variável numérica;
+        6. Criação da coluna 'Distance_km' (distância entre o restaurante e o local de entrega).
+
+        Todas as etapas são vetorizadas: os textos são limpos sobre as categorias (valores únicos) e as linhas com dados
+        ausentes são removidas com uma única máscara. Aceita tanto o Dataframe de 'read_raw()' quanto o de um pd.read_csv simples.
+
+        Input:  Dataframe
+        Output: Dataframe
+    """
+    df1 = df1.copy(deep = False)
+
+    # Retirando os espaços indesejados (typos) do conjunto de dados
+    df1['ID'] = df1['ID'].str.strip()
+    for col in STRIP_COLS[1:]:
+        if pd.api.types.is_numeric_dtype(df1[col]):
+            continue
+        df1[col] = _strip_categories(df1[col])
+
+    # Convertendo as colunas numéricas lidas como texto
+    for col in ['Delivery_person_Age', 'Delivery_person_Ratings']:
+        if not pd.api.types.is_numeric_dtype(df1[col]):
+            df1[col] = _convert_categories(df1[col], lambda c: pd.to_numeric(c, errors = 'coerce'))
+
+    # Descartando (dropando) de uma só vez todas as linhas que contenham 'NaN'
+    linhas_excl = df1[STRIP_COLS].isna().any(axis = 1)
+    df1 = df1.loc[~linhas_excl.to_numpy(), :]
+
+    # Convertendo a coluna 'Order_Date' para o tipo datetime
+    df1['Order_Date'] = _convert_categories(df1['Order_Date'], lambda c: pd.to_datetime(c, format = '%d-%m-%Y'))
+
+    # Limpando a coluna "Time_taken (min)" ( remoção do texto '(min)' )
+    df1['Time_taken(min)'] = _convert_categories(df1['Time_taken(min)'], lambda c: pd.to_numeric(c.astype(str).str.strip('(min) ')))
+
+    # Calculando a distância entre o restaurante e o local de entrega (km), uma única vez para todo o conjunto de dados
+    df1['Distance_km'] = haversine_km(df1['Restaurant_latitude'], df1['Restaurant_longitude'],
+                                      df1['Delivery_location_latitude'], df1['Delivery_location_longitude'])
+
+    # Convertendo as colunas numéricas para os tipos mais estreitos possíveis
+    df1 = df1.astype(CLEAN_DTYPES)
+
+    # Convertendo as colunas de texto repetitivo em categorias
+    for col in CATEGORY_COLS + ['Time_Orderd', 'Time_Order_picked']:
+        df1[col] = _as_category(df1[col]).cat.remove_unused_categories()
+
+    return df1
+
+def batches_dir(path = DATASET_PATH):
+    """ Esta função tem a responsabilidade de definir o diretório onde ficam os lotes de pedidos já limpos, ingeridos após o CSV ('utils.ingest').
+
+        Input:  Caminho do arquivo CSV
+        Output: Caminho do diretório dos lotes
+    """
+    return os.path.splitext(path)[0] + '.batches'
+
+def list_batches(path = DATASET_PATH):
+    """ Esta função tem a responsabilidade de listar, em ordem de ingestão, os lotes já limpos do conjunto de dados.
+
+        Input:  Caminho do arquivo CSV
+        Output: Lista com os nomes dos arquivos dos lotes
+    """
+    try:
+        names = os.listdir(batches_dir(path))
+    except FileNotFoundError:
+        return []
+    return sorted(name for name in names if name.endswith('.feather'))
+
+def dataset_version(path = DATASET_PATH):
+    """ Esta função tem a responsabilidade de identificar a versão atual do conjunto de dados, a partir da data de modificação e do tamanho do CSV
+        e da lista de lotes ingeridos após ele.
+
+        Input:  Caminho do arquivo CSV
+        Output: Tupla ((data de modificação em ns, tamanho em bytes), nomes dos lotes).
+    """
+    stat = os.stat(path)
+    return ((stat.st_mtime_ns, stat.st_size), tuple(list_batches(path)))
+
+def _appended_batches(old_version, new_version):
+    """ Esta função tem a responsabilidade de verificar se uma versão do conjunto de dados difere da anterior apenas por novos lotes
+        (mesmo CSV e lotes anteriores preservados), caso em que as estruturas em cache podem ser atualizadas de forma incremental.
+
+        Input:  Versões anterior e atual
+        Output: Nomes dos novos lotes, ou None se for necessária uma reconstrução completa.
+    """
+    old_csv, old_batches = old_version
+    new_csv, new_batches = new_version
+    if old_csv != new_csv or new_batches[:len(old_batches)] != old_batches:
+        return None
+    return new_batches[len(old_batches):]
+
+def cache_path(path = DATASET_PATH, source = None):
+    """ Esta função tem a responsabilidade de definir o caminho do snapshot colunar (Feather) que guarda o conjunto de dados já limpo,
+        ao lado do CSV. O nome leva a versão do CSV (data de modificação e tamanho), então cada versão tem o seu próprio arquivo
+        e um snapshot nunca é sobrescrito enquanto outros processos o leem.
+
+        Input:  1. Caminho do arquivo CSV;
+                2. Versão do CSV - tupla (data de modificação em ns, tamanho) - ou None para a versão atual.
+        Output: Caminho do arquivo Feather
+    """
+    mtime_ns, size = dataset_version(path)[0] if source is None else source
+    return '{}.{}-{}.feather'.format(os.path.splitext(path)[0], mtime_ns, size)
+
+def _cache_is_fresh(cache):
+    """ Esta função tem a responsabilidade de verificar se o snapshot pode ser utilizado: ele deve existir e ter sido gerado
+        pela versão atual da limpeza ('CACHE_VERSION').
+
+        Input:  Caminho do arquivo Feather
+        Output: True ou False
+    """
+    try:
+        with pa.memory_map(cache) as source:
+            metadata = ipc.open_file(source).schema.metadata or {}
+    except (OSError, pa.ArrowInvalid):
+        return False
+    return metadata.get(b'cache_version') == CACHE_VERSION
+
+def write_feather(df1, target):
+    """ Esta função tem a responsabilidade de gravar um Dataframe limpo em um arquivo Feather sem compressão (o que permite a leitura via memory-map).
+        A gravação é feita em um arquivo temporário e depois renomeada, para que nenhuma sessão leia um arquivo pela metade.
+
+        Input:  1. Dataframe limpo;
+                2. Caminho do arquivo Feather.
+        Output: Nenhum (erros de gravação são propagados).
+    """
+    table = pa.Table.from_pandas(df1, preserve_index = False)
+    table = table.replace_schema_metadata({**(table.schema.metadata or {}), b'cache_version': CACHE_VERSION})
+
+    tmp = '{}.{}.tmp'.format(target, os.getpid())
+    try:
+        feather.write_feather(table, tmp, compression = 'uncompressed')
+        os.replace(tmp, target)
+    finally:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+
+def read_cache(cache, columns = None):
+    """ Esta função tem a responsabilidade de ler o arquivo Feather via memory-map, carregando somente as colunas solicitadas.
+
+        Os arrays do Dataframe apontam diretamente para o arquivo mapeado (sem cópia e somente leitura), então todos os processos
+        do host compartilham as mesmas páginas de memória do sistema operacional. As colunas de texto simples (como 'ID') ficam
+        como strings do Arrow, em vez de um objeto Python por linha.
+
+        Input:  1. Caminho do arquivo Feather;
+                2. Lista de colunas (None para todas).
+        Output: Dataframe limpo
+    """
+    return arrow_to_pandas(feather.read_table(cache, columns = columns, memory_map = True))
+
+def arrow_to_pandas(table):
+    """ Esta função tem a responsabilidade de converter uma tabela do Arrow lida dos arquivos do dataset em um Dataframe limpo:
+        dicionários viram categorias e as colunas de texto simples ficam como strings do Arrow.
+
+        Input:  pyarrow.Table
+        Output: Dataframe
+    """
+    return table.to_pandas(split_blocks = True, types_mapper = {pa.string(): pd.ArrowDtype(pa.string())}.get)
+
+@contextmanager
+def host_lock(path = DATASET_PATH):
+    """ Esta função tem a responsabilidade de serializar, entre todos os processos do host, a publicação dos snapshots de um dataset
+        (trava exclusiva em um arquivo '.lock' ao lado do CSV). Sem fcntl ou sem permissão de escrita, não trava.
+
+        Input:  Caminho do arquivo CSV
+        Output: Nenhum.
+    """
+    try:
+        file = open(os.path.splitext(path)[0] + '.lock', 'a')
+    except OSError:
+        file = None
+    try:
+        if file is not None and fcntl is not None:
+            fcntl.flock(file.fileno(), fcntl.LOCK_EX)
+        yield
+    finally:
+        if file is not None:
+            file.close()
+
+def _remove_old_snapshots(path, keep = KEEP_SNAPSHOTS):
+    """ Esta função tem a responsabilidade de apagar os snapshots mais antigos do dataset, mantendo os 'keep' mais recentes.
+        Processos que ainda mapeiam um snapshot apagado continuam lendo-o normalmente até trocarem de versão.
+
+        Input:  1. Caminho do arquivo CSV;
+                2. Quantidade de snapshots mantidos.
+        Output: Nenhum.
+    """
+    folder, base = os.path.split(os.path.splitext(path)[0])
+    pattern = re.compile(re.escape(base) + r'\.\d+-\d+\.feather$')
+    snapshots = [os.path.join(folder, name) for name in os.listdir(folder or '.') if pattern.match(name)]
+    for snapshot in sorted(snapshots, key = os.path.getmtime, reverse = True)[keep:]:
+        try:
+            os.remove(snapshot)
+        except OSError:
+            pass
+
+def publish_snapshot(path = DATASET_PATH, source = None, csv_path = None):
+    """ Esta função tem a responsabilidade de publicar o snapshot limpo de uma versão do CSV uma única vez por host: o primeiro
+        processo a precisar dele limpa o CSV e grava o snapshot, e os demais aguardam a trava e apenas o reutilizam.
+
+        Input:  1. Caminho do arquivo CSV;
+                2. Versão do CSV - tupla (data de modificação em ns, tamanho) - ou None para a versão atual;
+                3. CSV a ser limpo (por padrão, o próprio 'path'; na troca de versão, o CSV novo antes de ir para o lugar).
+        Output: Caminho do snapshot (erros de gravação são propagados)
+    """
+    cache = cache_path(path, source)
+    if _cache_is_fresh(cache):
+        return cache
+
+    with host_lock(path):
+        if not _cache_is_fresh(cache):
+            write_feather(_clean_from_csv(csv_path or path), cache)
+            _remove_old_snapshots(path)
+    return cache
+
+def concat_clean(frames):
+    """ Esta função tem a responsabilidade de concatenar Dataframes limpos preservando as colunas categóricas
+        (as categorias de cada coluna são unificadas antes da concatenação) e a ordenação por data.
+
+        Input:  Lista de Dataframes limpos, com as mesmas colunas
+        Output: Dataframe limpo
+    """
+    frames = [df for df in frames if len(df)] or frames[:1]
+    if len(frames) == 1:
+        return frames[0]
+
+    for col in frames[0].columns:
+        if isinstance(frames[0][col].dtype, pd.CategoricalDtype):
+            categories = pd.api.types.union_categoricals([df[col] for df in frames], sort_categories = True).categories
+            frames = [df.assign(**{col: df[col].cat.set_categories(categories)}) for df in frames]
+
+    df1 = pd.concat(frames, ignore_index = True)
+    if 'Order_Date' in df1.columns and not df1['Order_Date'].is_monotonic_increasing:
+        df1 = df1.sort_values('Order_Date', kind = 'stable').reset_index(drop = True)
+    return df1
+
+def read_batches(path = DATASET_PATH, names = None, columns = None):
+    """ Esta função tem a responsabilidade de ler os lotes já limpos do conjunto de dados.
+
+        Input:  1. Caminho do arquivo CSV;
+                2. Nomes dos lotes (None para todos);
+                3. Lista de colunas (None para todas).
+        Output: Lista de Dataframes limpos
+    """
+    names = list_batches(path) if names is None else names
+    return [read_cache(os.path.join(batches_dir(path), name), columns) for name in names]
+
+def _clean_from_csv(path):
+    """ Esta função tem a responsabilidade de ler e limpar o CSV e ordenar os pedidos por data.
+
+        Input:  Caminho do arquivo CSV
+        Output: Dataframe limpo
+    """
+    # O Dataframe é guardado ordenado por data, o que permite filtrar o período com uma busca binária ('utils.filters.FilterIndex')
+    # e gravar as partições semanais em sequência ('utils.partitions')
+    with span('read_csv'):
+        df1 = read_raw(path)
+    with span('clean_code'):
+        return clean_code(df1).sort_values('Order_Date', kind = 'stable').reset_index(drop = True)
+
+def load_data(path = DATASET_PATH, columns = None):
+    """ Esta função tem a responsabilidade de carregar e limpar o conjunto de dados uma única vez por processo, compartilhando o resultado entre todas as páginas e sessões.
+        O Dataframe limpo só é recalculado quando a data de modificação ou o tamanho do arquivo mudam.
+
+        Os dados são lidos do snapshot colunar (Feather) da versão atual do CSV, via memory-map (sem cópia) e somente com as colunas
+        solicitadas; o snapshot é publicado uma única vez por host ('publish_snapshot()'), pelo primeiro processo que precisar dele.
+        Os lotes ingeridos após o CSV ('utils.ingest') são acrescentados ao final; quando surgem novos lotes, apenas eles são lidos
+        e acrescentados.
+
+        O Dataframe devolvido é uma cópia rasa do Dataframe em cache: com o copy-on-write ativo, alterações feitas pela página
+        (novas colunas, atribuições) ficam restritas a ela e não afetam o cache.
+
+        Input:  1. Caminho do arquivo CSV;
+                2. Lista de colunas necessárias (None para todas).
+        Output: Dataframe limpo
+    """
+    key = os.path.abspath(path)
+    version = dataset_version(path)
+    columns = tuple(columns) if columns is not None else None
+
+    with _lock:
+        cached = _cache.get(key)
+        if cached is not None and cached[0] != version:
+            new_batches = _appended_batches(cached[0], version)
+            if new_batches is None:
+                cached = None
+            else:
+                with span('read_batches'):
+                    frames = {cols: concat_clean([df] + read_batches(path, new_batches, list(cols) if cols else None))
+                              for cols, df in cached[1].items()}
+                cached = (version, frames)
+                _cache[key] = cached
+        if cached is None:
+            cached = (version, {})
+            _cache[key] = cached
+        frames = cached[1]
+
+        if columns not in frames:
+            try:
+                cache = publish_snapshot(path, version[0])
+            except OSError as error:
+                # Sem permissão de escrita, o painel continua funcionando, apenas sem o snapshot em disco
+                warnings.warn('Não foi possível publicar o snapshot de {}: {}'.format(path, error))
+                cache = None
+
+            if None in frames:
+                frames[columns] = frames[None].loc[:, list(columns)]
+            elif cache is not None:
+                with span('read_cache'):
+                    base = read_cache(cache, list(columns) if columns else None)
+                    frames[columns] = concat_clean([base] + read_batches(path, version[1], list(columns) if columns else None))
+            else:
+                frames[None] = concat_clean([_clean_from_csv(path)] + read_batches(path, version[1]))
+                if columns is not None:
+                    frames[columns] = frames[None].loc[:, list(columns)]
+
+        df1 = frames[columns]
+
+    return df1.copy(deep = False)
+
+def load_derived(name, builder, path = DATASET_PATH, updater = None):
+    """ Esta função tem a responsabilidade de construir uma estrutura derivada do conjunto de dados (cubo de agregados, índices etc.)
+        uma única vez por processo e por versão do arquivo, compartilhando-a entre todas as páginas e sessões.
+
+        Quando a nova versão difere da anterior apenas por lotes ingeridos e há um 'updater', a estrutura é atualizada de forma
+        incremental, com 'updater(estrutura_anterior, caminho, novos_lotes)', em vez de reconstruída.
+
+        Input:  1. Nome da estrutura;
+                2. Função que recebe o caminho do dataset e constrói a estrutura;
+                3. Caminho do arquivo CSV;
+                4. Função de atualização incremental (opcional).
+        Output: A estrutura construída por 'builder'.
+    """
+    key = (os.path.abspath(path), name)
+    version = dataset_version(path)
+
+    with _lock:
+        cached = _derived.get(key)
+        if cached is None or cached[0] != version:
+            new_batches = None if cached is None or updater is None else _appended_batches(cached[0], version)
+            if new_batches is None:
+                with span('build: ' + name):
+                    cached = (version, builder(path))
+            else:
+                with span('update: ' + name):
+                    cached = (version, updater(cached[1], path, new_batches))
+            _derived[key] = cached
+
+    return cached[1]
+
+def load_memoized(name, key, builder, path = DATASET_PATH, maxsize = 64):
+    """ Esta função tem a responsabilidade de memorizar um resultado que depende do estado dos filtros (métricas, mapas renderizados etc.),
+        calculado uma única vez por processo, por versão do dataset e por chave. Cada nome mantém os 'maxsize' resultados
+        usados mais recentemente.
+
+        Input:  1. Nome do resultado;
+                2. Chave com o estado dos filtros (valores imutáveis, por exemplo tuplas);
+                3. Função sem argumentos que calcula o resultado (chamada apenas quando ele não está em cache);
+                4. Caminho do arquivo CSV;
+                5. Quantidade máxima de resultados guardados para este nome.
+        Output: O resultado de 'builder()'.
+    """
+    key = (os.path.abspath(path), dataset_version(path), key)
+
+    with _lock:
+        memo = _memo.setdefault(name, OrderedDict())
+        if key in memo:
+            memo.move_to_end(key)
+            return memo[key]
+
+    with span('compute: ' + name):
+        result = builder()
+
+    with _lock:
+        memo[key] = result
+        while len(memo) > maxsize:
+            memo.popitem(last = False)
+    return result
@@ -0,0 +1,71 @@
+# ==========================================================================================================================
+# IMPORTANDO BIBLIOTECAS NECESSÁRIAS
+# ==========================================================================================================================
+import os
+
+import streamlit as st
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+from utils.profiling import Rerun, profile_dump, recent_reruns, to_jsonl, to_prometheus, totals
+
+# ==========================================================================================================================
+# CONFIGURAÇÕES INCIAIS
+# ==========================================================================================================================
+# Variável de ambiente que habilita o painel de desempenho na barra lateral (por exemplo CURRY_DEBUG=1 streamlit run Home.py)
+DEBUG_ENV = 'CURRY_DEBUG'
+
+# Chave do session_state que pede a captura do perfil da próxima execução
+PROFILE_NEXT_KEY = 'profile_next_rerun'
+
+# ==========================================================================================================================
+# FUNÇÕES
+# ==========================================================================================================================
+def debug_enabled():
+    """ Esta função tem a responsabilidade de informar se o painel de desempenho está habilitado (variável DEBUG_ENV).
+
+        Input:  Nenhum
+        Output: bool
+    """
+    return os.environ.get(DEBUG_ENV, '').strip().lower() in ['1', 'true', 'yes']
+
+def start_rerun(page):
+    """ Esta função tem a responsabilidade de iniciar o registro dos tempos da execução atual de uma página. Quando o usuário
+        pediu, no painel de desempenho, o perfil desta execução, o cProfile também é iniciado.
+
+        Input:  Nome da página
+        Output: Rerun ativo na thread da página
+    """
+    ctx = get_script_run_ctx()
+    profile = debug_enabled() and st.session_state.pop(PROFILE_NEXT_KEY, False)
+    return Rerun(page, ctx.session_id if ctx is not None else None).start(profile)
+
+def debug_panel(rerun):
+    """ Esta função tem a responsabilidade de encerrar o registro da execução (quando a página ainda não o encerrou) e, com o painel
+        habilitado, exibir na barra lateral:
+        os tempos desta execução, os tempos acumulados da sessão por página, as exportações (JSON lines e Prometheus)
+        e a captura do perfil de uma execução.
+
+        Input:  Rerun iniciado por 'start_rerun()'
+        Output: Nenhum.
+    """
+    rerun.finish()
+    if not debug_enabled():
+        return
+
+    with st.sidebar.expander('Desempenho'):
+        st.markdown('###### Esta execução')
+        st.dataframe(rerun.summary(), hide_index = True)
+
+        st.markdown('###### Acumulado da sessão')
+        st.dataframe(totals(rerun.session).drop(columns = 'session'), hide_index = True)
+
+        st.download_button('Exportar JSON lines', to_jsonl(recent_reruns(rerun.session)), file_name = 'timings.jsonl',
+                           mime = 'application/x-ndjson')
+        st.download_button('Exportar Prometheus', to_prometheus(), file_name = 'timings.prom', mime = 'text/plain')
+
+        st.button('Perfilar a próxima execução', on_click = lambda: st.session_state.update({PROFILE_NEXT_KEY: True}))
+        if rerun.profile_report is not None:
+            st.markdown('###### Perfil desta execução (cProfile)')
+            st.code(rerun.profile_report, language = None)
+            st.download_button('Baixar perfil (.prof)', profile_dump(rerun.profile), file_name = 'rerun.prof',
+                               mime = 'application/octet-stream')
@@ -0,0 +1,224 @@
+# ==========================================================================================================================
+# IMPORTANDO BIBLIOTECAS NECESSÁRIAS
+# ==========================================================================================================================
+import pandas as pd
+
+from utils.backends import get_backend
+from utils.data import DATASET_PATH, load_memoized
+from utils.filters import FILTER_COLS
+from utils.locations import load_location_sketch
+from utils.metrics import filter_key, load_metrics
+from utils.rankings import TOP_N, rank_couriers
+from utils.weekly import ROLLING_WEEKS, load_weekly_store, weekly_growth
+
+# ==========================================================================================================================
+# CONFIGURAÇÕES INCIAIS
+# ==========================================================================================================================
+# Quantidade máxima de resultados (por visão) memorizados
+VIEWS_CACHE_SIZE = 128
+
+# ==========================================================================================================================
+# FUNÇÕES - VISÃO EMPRESA
+# ==========================================================================================================================
+def orders_by_day(cube):
+    """ Esta função tem a responsabilidade de contar os pedidos por dia.
+
+        Input:  Cubo de agregados (OrderCube) ou consulta do backend ('get_backend().select()') já filtrados
+        Output: Dataframe com 'Order_Date' e 'ID (count)'
+    """
+    return cube.counts('Order_Date').rename(columns = {'count' : 'ID (count)'})
+
+def orders_by_traffic(cube):
+    """ Esta função tem a responsabilidade de contar os pedidos por densidade de tráfego e calcular a participação de cada densidade.
+
+        Input:  Cubo de agregados (OrderCube) ou consulta do backend ('get_backend().select()') já filtrados
+        Output: Dataframe com 'Road_traffic_density', 'ID (count)' e 'Delivery_percents_by_traffic'
+    """
+    df2 = cube.counts('Road_traffic_density').rename(columns = {'count' : 'ID (count)'})
+    df2['Delivery_percents_by_traffic'] = df2['ID (count)'] / df2['ID (count)'].sum()
+    return df2
+
+def orders_by_city_and_traffic(cube):
+    """ Esta função tem a responsabilidade de contar os pedidos por densidade de tráfego e cidade.
+
+        Input:  Cubo de agregados (OrderCube) ou consulta do backend ('get_backend().select()') já filtrados
+        Output: Dataframe com 'Road_traffic_density', 'City' e 'ID (count)'
+    """
+    return cube.counts(['Road_traffic_density', 'City']).rename(columns = {'count' : 'ID (count)'})
+
+def orders_by_week(weekly):
+    """ Esta função tem a responsabilidade de listar os pedidos por semana ISO.
+
+        Input:  Série semanal de 'WeeklyStore.select()'
+        Output: Dataframe com 'iso_year', 'iso_week', 'week_start', 'Week_of_year' e 'ID (count)'
+    """
+    return weekly.loc[:, ['iso_year', 'iso_week', 'week_start', 'Week_of_year', 'ID (count)']]
+
+def orders_per_courier_by_week(weekly):
+    """ Esta função tem a responsabilidade de listar, por semana ISO, os pedidos, os entregadores distintos e a média de pedidos por entregador.
+
+        Input:  Série semanal de 'WeeklyStore.select()'
+        Output: Dataframe com 'iso_year', 'iso_week', 'week_start', 'Week_of_year', 'ID (count)', 'Delivery_person_ID (nunique)'
+                e 'media_por_entreg_unico'
+    """
+    return weekly
+
+def order_growth_by_week(weekly, window = ROLLING_WEEKS):
+    """ Esta função tem a responsabilidade de calcular as médias móveis e o crescimento semana a semana dos pedidos e dos pedidos por entregador.
+
+        Input:  1. Série semanal de 'WeeklyStore.select()';
+                2. Janela das médias móveis, em semanas.
+        Output: Dataframe de 'weekly_growth()'
+    """
+    return weekly_growth(weekly, window)
+
+def central_locations(locations):
+    """ Esta função tem a responsabilidade de calcular as localizações centrais (medianas) dos pedidos por cidade e condição de tráfego.
+
+        Input:  LocationSketch já filtrado (exato ou aproximado)
+        Output: Dataframe com 'City', 'Road_traffic_density' e as medianas das coordenadas
+    """
+    return locations.medians()
+
+# ==========================================================================================================================
+# FUNÇÕES - VISÃO ENTREGADORES
+# ==========================================================================================================================
+def ratings_by_courier(stats):
+    """ Esta função tem a responsabilidade de calcular a avaliação média de cada entregador.
+
+        Input:  Estatísticas por entregador (CourierStats) ou consulta do backend ('get_backend().select()') já filtradas
+        Output: Dataframe com 'Delivery_person_ID' e 'Delivery_person_Ratings'
+    """
+    return stats.means('Delivery_person_Ratings', 'Delivery_person_ID').reset_index()
+
+def ratings_by_traffic(cube):
+    """ Esta função tem a responsabilidade de calcular a média e o desvio padrão das avaliações por densidade de tráfego.
+
+        Input:  Cubo de agregados (OrderCube) ou consulta do backend ('get_backend().select()') já filtrados
+        Output: Dataframe com 'Road_traffic_density', 'mean' e 'std'
+    """
+    return cube.mean_std('Delivery_person_Ratings', 'Road_traffic_density')
+
+def ratings_by_weather(cube):
+    """ Esta função tem a responsabilidade de calcular a média e o desvio padrão das avaliações por condição climática.
+
+        Input:  Cubo de agregados (OrderCube) ou consulta do backend ('get_backend().select()') já filtrados
+        Output: Dataframe com 'Weatherconditions', 'mean' e 'std'
+    """
+    return cube.mean_std('Delivery_person_Ratings', 'Weatherconditions')
+
+def delivery_speed_rankings(stats, n = TOP_N):
+    """ Esta função tem a responsabilidade de listar, para cada cidade, os N entregadores mais rápidos e os N mais lentos.
+
+        Input:  1. Estatísticas por entregador (CourierStats) ou consulta do backend ('get_backend().select()') já filtradas;
+                2. Quantidade de entregadores em cada ranking.
+        Output: Dataframe com 'City', 'Ranking' ('fastest' ou 'slowest'), 'Delivery_person_ID' e 'Time_taken(min)'
+    """
+    frames = []
+    for city, (fastest, slowest) in rank_couriers(stats.means('Time_taken(min)', ['City', 'Delivery_person_ID']), n).items():
+        for ranking, series in [('fastest', fastest), ('slowest', slowest)]:
+            df2 = series.reset_index()
+            df2.insert(0, 'Ranking', ranking)
+            df2.insert(0, 'City', city)
+            frames.append(df2)
+    if not frames:
+        return pd.DataFrame(columns = ['City', 'Ranking', 'Delivery_person_ID', 'Time_taken(min)'])
+    return pd.concat(frames, ignore_index = True)
+
+# ==========================================================================================================================
+# FUNÇÕES - VISÃO RESTAURANTES
+# ==========================================================================================================================
+def time_by_city(cube):
+    """ Esta função tem a responsabilidade de calcular a média e o desvio padrão do tempo de entrega por cidade.
+
+        Input:  Cubo de agregados (OrderCube) ou consulta do backend ('get_backend().select()') já filtrados
+        Output: Dataframe com 'City', 'mean' e 'std'
+    """
+    return cube.mean_std('Time_taken(min)', 'City')
+
+def time_by_city_and_order_type(cube):
+    """ Esta função tem a responsabilidade de calcular a média e o desvio padrão do tempo de entrega por cidade e tipo de pedido.
+
+        Input:  Cubo de agregados (OrderCube) ou consulta do backend ('get_backend().select()') já filtrados
+        Output: Dataframe com 'City', 'Type_of_order', 'mean' e 'std'
+    """
+    return cube.mean_std('Time_taken(min)', ['City', 'Type_of_order'])
+
+def time_by_city_and_traffic(cube):
+    """ Esta função tem a responsabilidade de calcular a média e o desvio padrão do tempo de entrega por cidade e condição do trânsito.
+
+        Input:  Cubo de agregados (OrderCube) ou consulta do backend ('get_backend().select()') já filtrados
+        Output: Dataframe com 'City', 'Road_traffic_density', 'mean' e 'std'
+    """
+    return cube.mean_std('Time_taken(min)', ['City', 'Road_traffic_density'])
+
+def distance_by_city(cube):
+    """ Esta função tem a responsabilidade de calcular a distância média entre restaurante e local de entrega por cidade.
+
+        Input:  Cubo de agregados (OrderCube) ou consulta do backend ('get_backend().select()') já filtrados
+        Output: Dataframe com 'City' e 'Distance (mean)'
+    """
+    return cube.mean_std('Distance_km', 'City').drop(columns = 'std').rename(columns = {'mean' : 'Distance (mean)'})
+
+# ==========================================================================================================================
+# FUNÇÕES - ACESSO POR NOME (SEM STREAMLIT)
+# ==========================================================================================================================
+# Visões disponíveis: nome -> (função, fonte dos dados). Fontes: 'orders', 'weekly' (série semanal), 'locations' e
+# 'approximate_locations' (sketches de localização exatos e aproximados) e 'metrics' (métricas globais)
+# A fonte 'orders' é a consulta do backend escolhido em CURRY_BACKEND ('get_backend().select()'): no backend 'pandas', as contagens
+# por data vêm do cubo de agregados, as médias por entregador das estatísticas por entregador e o restante das somas acumuladas por dia
+VIEWS = {
+    'orders_by_day': (orders_by_day, 'orders'),
+    'orders_by_traffic': (orders_by_traffic, 'orders'),
+    'orders_by_city_and_traffic': (orders_by_city_and_traffic, 'orders'),
+    'orders_by_week': (orders_by_week, 'weekly'),
+    'orders_per_courier_by_week': (orders_per_courier_by_week, 'weekly'),
+    'order_growth_by_week': (order_growth_by_week, 'weekly'),
+    'central_locations': (central_locations, 'locations'),
+    'approximate_central_locations': (central_locations, 'approximate_locations'),
+    'ratings_by_courier': (ratings_by_courier, 'orders'),
+    'ratings_by_traffic': (ratings_by_traffic, 'orders'),
+    'ratings_by_weather': (ratings_by_weather, 'orders'),
+    'delivery_speed_rankings': (delivery_speed_rankings, 'orders'),
+    'time_by_city': (time_by_city, 'orders'),
+    'time_by_city_and_order_type': (time_by_city_and_order_type, 'orders'),
+    'time_by_city_and_traffic': (time_by_city_and_traffic, 'orders'),
+    'distance_by_city': (distance_by_city, 'orders'),
+    'metrics': (None, 'metrics'),
+}
+
+def compute_view(name, date_min = None, date_max = None, path = DATASET_PATH, **options):
+    """ Esta função tem a responsabilidade de calcular uma visão pelo nome, aplicando os mesmos filtros da barra lateral,
+        com o resultado memorizado por versão do dataset e por estado dos filtros.
+
+        Input:  1. Nome da visão (uma das chaves de VIEWS);
+                2. Datas inicial e final (inclusive), opcionais;
+                3. Caminho do arquivo CSV;
+                4. Valores aceitos de cada coluna de FILTER_COLS, por exemplo City = ['Urban'].
+        Output: Dataframe (ou dicionário, no caso de 'metrics')
+    """
+    if name not in VIEWS:
+        raise KeyError("Unknown view '{}'! Expected one of {}.".format(name, list(VIEWS)))
+    for col in options:
+        if col not in FILTER_COLS:
+            raise ValueError("Invalid filter column '{}'! Expected one of {}.".format(col, FILTER_COLS))
+
+    func, source = VIEWS[name]
+    if source == 'metrics':
+        return load_metrics(date_min, date_max, path, **options)
+
+    backend = get_backend(path = path)
+
+    def builder():
+        if source == 'orders':
+            return func(backend.select(date_min, date_max, **options))
+        unsupported = set(options) - {'Road_traffic_density'}
+        if unsupported:
+            raise ValueError("View '{}' only accepts the date and 'Road_traffic_density' filters.".format(name))
+        store = (load_weekly_store(path) if source == 'weekly' else
+                 load_location_sketch(path, approximate = source == 'approximate_locations'))
+        return func(store.select(date_min, date_max, options.get('Road_traffic_density')))
+
+    df2 = load_memoized('view:{}:{}'.format(backend.name, name), filter_key(date_min, date_max, **options), builder, path, VIEWS_CACHE_SIZE)
+    # cópia rasa: com o copy-on-write ativo, alterações feitas por quem chamou não afetam o resultado memorizado
+    return df2.copy(deep = False)
@@ -0,0 +1,121 @@
+# ==========================================================================================================================
+# IMPORTANDO BIBLIOTECAS NECESSÁRIAS
+# ==========================================================================================================================
+import numpy as np
+import pandas as pd
+
+from utils.data import DATASET_PATH, load_data, load_derived
+
+# ==========================================================================================================================
+# CONFIGURAÇÕES INCIAIS
+# ==========================================================================================================================
+# Colunas categóricas dos filtros da barra lateral que recebem um bitmap por categoria
+FILTER_COLS = ['Road_traffic_density', 'Weatherconditions', 'City']
+
+# ==========================================================================================================================
+# CLASSES
+# ==========================================================================================================================
+class FilterIndex:
+    """ Esta classe tem a responsabilidade de acelerar os filtros da barra lateral sobre o Dataframe limpo, que é guardado ordenado por data.
+
+        1. O filtro de data é uma busca binária sobre as datas ordenadas, que resulta em um intervalo contínuo de linhas;
+        2. Cada categoria das colunas de FILTER_COLS tem um bitmap pré-calculado (1 bit por linha, via np.packbits),
+           e as multiseleções são combinadas com OR (dentro da coluna) e AND (entre colunas) sobre os bytes.
+
+        O índice guarda apenas as datas e os bitmaps: ele se aplica a qualquer Dataframe com as mesmas linhas, na mesma ordem,
+        como os Dataframes com colunas reduzidas que cada página recebe de 'load_data()'.
+    """
+    def __init__(self, df1, columns = FILTER_COLS):
+        """ Input:  1. Dataframe limpo, ordenado por 'Order_Date';
+                    2. Colunas categóricas que recebem bitmaps.
+        """
+        self.dates = df1['Order_Date'].to_numpy()
+        if len(self.dates) and not (self.dates[1:] >= self.dates[:-1]).all():
+            raise ValueError("The dataset must be sorted by 'Order_Date' to build a FilterIndex.")
+
+        self.size = len(df1)
+        self.bitmaps = {}
+        for col in columns:
+            values = df1[col]
+            if not isinstance(values.dtype, pd.CategoricalDtype):
+                values = values.astype('category')
+            codes = values.cat.codes.to_numpy()
+            self.bitmaps[col] = {category: np.packbits(codes == i) for i, category in enumerate(values.cat.categories)}
+
+    def date_range(self, date_min = None, date_max = None):
+        """ Esta função tem a responsabilidade de localizar, por busca binária, o intervalo de linhas entre duas datas (inclusive).
+
+            Input:  Datas inicial e final (None para não limitar)
+            Output: Tupla (primeira linha, linha seguinte à última)
+        """
+        lo = 0 if date_min is None else int(np.searchsorted(self.dates, np.datetime64(pd.Timestamp(date_min)), side = 'left'))
+        hi = self.size if date_max is None else int(np.searchsorted(self.dates, np.datetime64(pd.Timestamp(date_max)), side = 'right'))
+        return lo, max(lo, hi)
+
+    def positions(self, date_min = None, date_max = None, **options):
+        """ Esta função tem a responsabilidade de calcular as linhas selecionadas pelos filtros.
+
+            Input:  1. Datas inicial e final (inclusive), opcionais;
+                    2. Valores aceitos de cada coluna de FILTER_COLS, por exemplo City = ['Urban'].
+            Output: Um slice (quando só há filtro de data) ou um array com as posições das linhas.
+        """
+        lo, hi = self.date_range(date_min, date_max)
+        byte_lo, byte_hi = lo // 8, -(-hi // 8)
+
+        combined = None
+        for col, values in options.items():
+            if col not in self.bitmaps:
+                raise ValueError("Invalid filter column '{}'! Expected one of {}.".format(col, list(self.bitmaps)))
+            bitmaps = self.bitmaps[col]
+            # Com todas as categorias selecionadas, o filtro da coluna não elimina nenhuma linha
+            if set(bitmaps).issubset(values):
+                continue
+
+            selected = np.zeros(byte_hi - byte_lo, dtype = np.uint8)
+            for value in values:
+                if value in bitmaps:
+                    selected |= bitmaps[value][byte_lo:byte_hi]
+            combined = selected if combined is None else combined & selected
+
+        if combined is None:
+            return slice(lo, hi)
+
+        bits = np.unpackbits(combined)[lo - byte_lo * 8:hi - byte_lo * 8]
+        return lo + np.flatnonzero(bits)
+
+    def select(self, df1, date_min = None, date_max = None, **options):
+        """ Esta função tem a responsabilidade de aplicar os filtros da barra lateral a um Dataframe alinhado com o índice.
+            Quando só há o filtro de data, o resultado é uma visão (sem cópia) das linhas; caso contrário, é feito um único 'take'
+            somente das colunas presentes no Dataframe recebido.
+
+            Input:  1. Dataframe com as mesmas linhas (e na mesma ordem) do índice;
+                    2. Datas inicial e final (inclusive), opcionais;
+                    3. Valores aceitos de cada coluna de FILTER_COLS.
+            Output: Dataframe filtrado
+        """
+        if len(df1) != self.size:
+            raise ValueError('The dataframe is not aligned with the FilterIndex ({} rows, expected {}).'.format(len(df1), self.size))
+
+        rows = self.positions(date_min, date_max, **options)
+        if isinstance(rows, slice):
+            return df1.iloc[rows]
+        return df1.take(rows)
+
+# ==========================================================================================================================
+# FUNÇÕES
+# ==========================================================================================================================
+def build_filter_index(path = DATASET_PATH):
+    """ Esta função tem a responsabilidade de construir o índice de filtragem a partir do conjunto de dados limpo.
+
+        Input:  Caminho do arquivo CSV
+        Output: FilterIndex
+    """
+    return FilterIndex(load_data(path, columns = ['Order_Date'] + FILTER_COLS))
+
+def load_filter_index(path = DATASET_PATH):
+    """ Esta função tem a responsabilidade de fornecer o índice de filtragem, construído uma única vez por processo e por versão do dataset.
+
+        Input:  Caminho do arquivo CSV
+        Output: FilterIndex
+    """
+    return load_derived('filter_index', build_filter_index, path)
@@ -0,0 +1,25 @@
+# ==========================================================================================================================
+# IMPORTANDO BIBLIOTECAS NECESSÁRIAS
+# ==========================================================================================================================
+import numpy as np
+
+# ==========================================================================================================================
+# CONFIGURAÇÕES INCIAIS
+# ==========================================================================================================================
+# Raio médio da Terra em km (o mesmo utilizado pelo pacote 'haversine')
+EARTH_RADIUS_KM = 6371.0088
+
+# ==========================================================================================================================
+# FUNÇÕES
+# ==========================================================================================================================
+def haversine_km(lat1, lon1, lat2, lon2):
+    """ Esta função tem a responsabilidade de calcular, de forma vetorizada, a distância do grande círculo (fórmula de haversine) entre dois conjuntos de coordenadas.
+        Equivale a aplicar 'haversine((lat1, lon1), (lat2, lon2))' linha a linha, porém sobre arrays inteiros de uma só vez.
+
+        Input:  Latitudes e longitudes (em graus) dos pontos de origem e de destino - escalares, arrays ou Series.
+        Output: Array com as distâncias em km.
+    """
+    lat1, lon1, lat2, lon2 = (np.radians(np.asarray(x, dtype = np.float64)) for x in (lat1, lon1, lat2, lon2))
+
+    d = np.sin((lat2 - lat1) * 0.5) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) * 0.5) ** 2
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(d))
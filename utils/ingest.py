@@ -0,0 +1,76 @@
+# ==========================================================================================================================
+# IMPORTANDO BIBLIOTECAS NECESSÁRIAS
+# ==========================================================================================================================
+import argparse
+import os
+import time
+
+from utils.data import DATASET_PATH, batches_dir, clean_code, read_raw, write_feather
+
+# ==========================================================================================================================
+# CONFIGURAÇÕES INCIAIS
+# ==========================================================================================================================
+# Diretório onde a operação deposita os novos lotes de pedidos (CSV no mesmo formato do 'dataset/train.csv')
+INCOMING_DIR = 'dataset/incoming'
+
+# ==========================================================================================================================
+# FUNÇÕES
+# ==========================================================================================================================
+def ingest_batch(csv_path, path = DATASET_PATH):
+    """ Esta função tem a responsabilidade de ingerir um novo lote de pedidos: o CSV passa pela mesma limpeza do dataset ('clean_code()')
+        e é gravado, já limpo e ordenado por data, no diretório de lotes do conjunto de dados.
+
+        Na próxima execução de cada página, 'load_data()' acrescenta somente o novo lote ao Dataframe em cache e as estruturas
+        derivadas com atualização incremental (como o cubo de agregados) são atualizadas somente com ele.
+
+        Input:  1. Caminho do CSV do lote;
+                2. Caminho do CSV do conjunto de dados.
+        Output: Dataframe limpo do lote
+    """
+    df1 = clean_code(read_raw(csv_path)).sort_values('Order_Date', kind = 'stable').reset_index(drop = True)
+
+    os.makedirs(batches_dir(path), exist_ok = True)
+    # O nome leva o instante da ingestão, o que mantém a ordem dos lotes
+    name = 'batch-{:020d}.feather'.format(time.time_ns())
+    write_feather(df1, os.path.join(batches_dir(path), name))
+    return df1
+
+def ingest_pending(drop_dir = INCOMING_DIR, path = DATASET_PATH):
+    """ Esta função tem a responsabilidade de ingerir, em ordem alfabética, todos os CSVs depositados no diretório de entrada,
+        movendo cada um para o subdiretório 'processed' após a ingestão.
+
+        Para evitar a leitura de um arquivo ainda em cópia, o lote deve ser gravado com outra extensão e renomeado para '.csv' ao final.
+
+        Input:  1. Diretório de entrada;
+                2. Caminho do CSV do conjunto de dados.
+        Output: Lista com os nomes dos arquivos ingeridos
+    """
+    processed_dir = os.path.join(drop_dir, 'processed')
+    os.makedirs(processed_dir, exist_ok = True)
+
+    ingested = []
+    for name in sorted(os.listdir(drop_dir)):
+        source = os.path.join(drop_dir, name)
+        if not name.endswith('.csv') or not os.path.isfile(source):
+            continue
+        ingest_batch(source, path)
+        os.replace(source, os.path.join(processed_dir, name))
+        ingested.append(name)
+    return ingested
+
+# ==========================================================================================================================
+# INÍCIO DA ESTRUTURA LÓGICA DO CÓDIGO
+# ==========================================================================================================================
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description = 'Ingestão incremental de novos lotes de pedidos.')
+    parser.add_argument('batches', nargs = '*', help = 'CSVs a serem ingeridos; sem argumentos, processa o diretório de entrada.')
+    parser.add_argument('--drop-dir', default = INCOMING_DIR)
+    parser.add_argument('--dataset', default = DATASET_PATH)
+    args = parser.parse_args()
+
+    if args.batches:
+        for batch in args.batches:
+            print('{}: {} pedidos ingeridos'.format(batch, len(ingest_batch(batch, args.dataset))))
+    else:
+        for name in ingest_pending(args.drop_dir, args.dataset):
+            print('{}: ingerido'.format(name))
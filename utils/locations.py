@@ -0,0 +1,163 @@
+# ==========================================================================================================================
+# IMPORTANDO BIBLIOTECAS NECESSÁRIAS
+# ==========================================================================================================================
+import numpy as np
+import pandas as pd
+
+from utils.data import DATASET_PATH, concat_clean, load_data, load_derived, read_batches
+from utils.sketches import QUANTILE_ALPHA, quantile_buckets
+
+# ==========================================================================================================================
+# CONFIGURAÇÕES INCIAIS
+# ==========================================================================================================================
+# Colunas de coordenadas cujas medianas são exibidas no mapa
+LOCATION_COLS = ['Delivery_location_latitude', 'Delivery_location_longitude']
+
+# Chaves de cada sketch: um por dia, cidade e condição de tráfego
+LOCATION_KEYS = ['Order_Date', 'City', 'Road_traffic_density']
+
+# Chaves das medianas exibidas no mapa
+MEDIAN_KEYS = ['City', 'Road_traffic_density']
+
+# ==========================================================================================================================
+# CLASSES
+# ==========================================================================================================================
+class LocationSketch:
+    """ Esta classe tem a responsabilidade de guardar, para cada (data, cidade, condição de tráfego), um sketch de quantis de cada
+        coordenada de entrega, de onde saem as localizações centrais (medianas) do mapa.
+
+        Cada sketch é a contagem dos representantes dos buckets logarítmicos das coordenadas ('quantile_buckets()'):
+        1. Com alpha = None (padrão) os representantes são as próprias coordenadas e as medianas são exatas;
+        2. Com alpha (por exemplo, QUANTILE_ALPHA), cada coordenada fica a no máximo alpha (erro relativo) do seu representante, e portanto a mediana estimada
+           também fica a no máximo alpha da mediana exata (com alpha = 1e-5, ~100 m em coordenadas de até 80 graus).
+
+        Sketches de dias diferentes são unidos somando as contagens, então qualquer período é respondido sem acessar as linhas.
+    """
+    def __init__(self, counts, alpha = None):
+        """ Input:  1. Dicionário {coluna: Series de contagens indexada por LOCATION_KEYS + representante};
+                    2. Erro relativo máximo (None para o modo exato).
+        """
+        self.counts = counts
+        self.alpha = alpha
+
+    @classmethod
+    def build(cls, df1, alpha = None):
+        """ Esta função tem a responsabilidade de construir os sketches a partir do Dataframe limpo.
+
+            Input:  1. Dataframe limpo (com LOCATION_KEYS e LOCATION_COLS);
+                    2. Erro relativo máximo (None para o modo exato).
+            Output: LocationSketch
+        """
+        counts = {}
+        for col in LOCATION_COLS:
+            buckets = pd.Series(quantile_buckets(df1[col], alpha), index = df1.index, name = col)
+            counts[col] = df1[LOCATION_KEYS].groupby([df1[key] for key in LOCATION_KEYS] + [buckets], observed = True).size()
+        return cls(counts, alpha)
+
+    def merge(self, other):
+        """ Esta função tem a responsabilidade de unir dois conjuntos de sketches (somando as contagens).
+
+            Input:  Outro LocationSketch, com o mesmo alpha
+            Output: Novo LocationSketch
+        """
+        counts = {}
+        for col in LOCATION_COLS:
+            both = pd.concat([self.counts[col], other.counts[col]])
+            counts[col] = both.groupby(level = list(range(both.index.nlevels)), observed = True).sum()
+        return LocationSketch(counts, self.alpha)
+
+    def select(self, date_min = None, date_max = None, traffic = None):
+        """ Esta função tem a responsabilidade de recortar os sketches de acordo com os filtros da barra lateral.
+
+            Input:  1. Datas inicial e final (inclusive), opcionais;
+                    2. Condições de tráfego aceitas, opcional.
+            Output: Novo LocationSketch
+        """
+        counts = {}
+        for col in LOCATION_COLS:
+            series = self.counts[col]
+            mask = pd.Series(True, index = series.index)
+            dates = series.index.get_level_values('Order_Date')
+            if date_min is not None:
+                mask &= dates >= pd.Timestamp(date_min)
+            if date_max is not None:
+                mask &= dates <= pd.Timestamp(date_max)
+            if traffic is not None:
+                mask &= series.index.get_level_values('Road_traffic_density').isin(traffic)
+            counts[col] = series[mask.to_numpy()]
+        return LocationSketch(counts, self.alpha)
+
+    def medians(self):
+        """ Esta função tem a responsabilidade de calcular as medianas das coordenadas por cidade e condição de tráfego.
+
+            Input:  Nenhum
+            Output: Dataframe com 'City', 'Road_traffic_density' e as medianas de LOCATION_COLS (sem linhas quando a seleção é vazia)
+        """
+        medians = []
+        for col in LOCATION_COLS:
+            # contagens ordenadas por cidade, condição de tráfego e valor
+            counts = self.counts[col].groupby(level = MEDIAN_KEYS + [col], observed = True).sum()
+            counts = counts[counts.to_numpy() > 0].reset_index(name = 'count')
+            medians.append(_grouped_medians(counts, col).set_index(MEDIAN_KEYS))
+        return pd.concat(medians, axis = 1).reset_index()
+
+# ==========================================================================================================================
+# FUNÇÕES
+# ==========================================================================================================================
+def _grouped_medians(counts, col):
+    """ Esta função tem a responsabilidade de calcular, de uma só vez para todos os grupos, a mediana ponderada pelas contagens, com a mesma
+        convenção do pandas (média dos dois valores centrais quando o total é par).
+
+        As contagens acumuladas de todos os grupos formam uma única sequência crescente, então as posições centrais de cada grupo
+        são encontradas com um 'searchsorted', deslocando o alvo pelo acumulado dos grupos anteriores.
+
+        Input:  1. Dataframe com MEDIAN_KEYS, a coluna e 'count', ordenado pelas chaves e pelo valor;
+                2. Nome da coluna.
+        Output: Dataframe com MEDIAN_KEYS e a mediana da coluna de cada grupo
+    """
+    if counts.empty:
+        return counts[MEDIAN_KEYS].assign(**{col: np.array([], dtype = np.float64)})
+
+    groups = counts.groupby(MEDIAN_KEYS, observed = True, sort = False).ngroup().to_numpy()
+    starts = np.flatnonzero(np.r_[True, groups[1:] != groups[:-1]])
+    cumulative = np.cumsum(counts['count'].to_numpy())
+    before = np.r_[0, cumulative[starts[1:] - 1]]
+    total = np.diff(np.r_[before, cumulative[-1]])
+
+    values = counts[col].to_numpy(dtype = np.float64)
+    low = values[np.searchsorted(cumulative, before + (total + 1) // 2)]
+    high = values[np.searchsorted(cumulative, before + total // 2 + 1)]
+    return counts[MEDIAN_KEYS].iloc[starts].assign(**{col: (low + high) / 2}).reset_index(drop = True)
+
+def build_location_sketch(path = DATASET_PATH, alpha = None):
+    """ Esta função tem a responsabilidade de construir os sketches de localização a partir do conjunto de dados limpo.
+
+        Input:  1. Caminho do arquivo CSV;
+                2. Erro relativo máximo (None para o modo exato).
+        Output: LocationSketch
+    """
+    return LocationSketch.build(load_data(path, columns = LOCATION_KEYS + LOCATION_COLS), alpha)
+
+def update_location_sketch(sketch, path, batches):
+    """ Esta função tem a responsabilidade de atualizar os sketches com novos lotes de pedidos, sem reprocessar o histórico.
+
+        Input:  1. LocationSketch atual;
+                2. Caminho do arquivo CSV;
+                3. Nomes dos novos lotes.
+        Output: LocationSketch atualizado
+    """
+    df1 = concat_clean(read_batches(path, batches, LOCATION_KEYS + LOCATION_COLS))
+    return sketch.merge(LocationSketch.build(df1, sketch.alpha))
+
+def load_location_sketch(path = DATASET_PATH, approximate = False):
+    """ Esta função tem a responsabilidade de fornecer os sketches de localização, construídos uma única vez por processo e por versão do dataset.
+
+        Input:  1. Caminho do arquivo CSV;
+                2. False (padrão) para medianas exatas, True para sketches com erro relativo de no máximo QUANTILE_ALPHA
+                   (menores quando há muitas coordenadas distintas).
+        Output: LocationSketch
+    """
+    if approximate:
+        return load_derived('location_sketch:approximate', lambda path: build_location_sketch(path, QUANTILE_ALPHA), path,
+                            update_location_sketch)
+    return load_derived('location_sketch', build_location_sketch, path, update_location_sketch)
@@ -0,0 +1,90 @@
+# ==========================================================================================================================
+# IMPORTANDO BIBLIOTECAS NECESSÁRIAS
+# ==========================================================================================================================
+import numpy as np
+
+# O folium é importado somente dentro das funções que montam os mapas: o mapa só é construído quando o usuário abre a aba
+# 'Visão Geográfica', e as demais execuções (e páginas) não pagam pela importação
+
+from utils.data import DATASET_PATH, load_memoized
+
+# ==========================================================================================================================
+# CONFIGURAÇÕES INCIAIS
+# ==========================================================================================================================
+# Quantidade máxima de mapas (HTML já renderizado) mantidos em memória, descartando os usados há mais tempo
+MAP_CACHE_SIZE = 32
+
+# Quantidade máxima de pontos enviados ao navegador no modo de pontos brutos; acima disso os pontos são amostrados
+# em intervalos regulares (a ordem por data mantém a amostra espalhada por todo o período)
+MAX_RAW_POINTS = 50_000
+
+# ==========================================================================================================================
+# FUNÇÕES
+# ==========================================================================================================================
+def central_locations_map(df2):
+    """ Esta função tem a responsabilidade de gerar o mapa das localizações centrais em uma única camada GeoJSON,
+        montada diretamente a partir das colunas do Dataframe (sem criar um marcador por linha).
+
+        Input:  Dataframe com 'City', 'Road_traffic_density', 'Delivery_location_latitude (median)' e 'Delivery_location_longitude (median)'
+        Output: folium.Map
+    """
+    latitudes = df2['Delivery_location_latitude (median)'].to_numpy(dtype = np.float64)
+    longitudes = df2['Delivery_location_longitude (median)'].to_numpy(dtype = np.float64)
+    cities = df2['City'].astype(str).to_numpy()
+    traffic = df2['Road_traffic_density'].astype(str).to_numpy()
+
+    # GeoJSON usa a ordem (longitude, latitude)
+    features = [{'type': 'Feature',
+                 'geometry': {'type': 'Point', 'coordinates': [lon, lat]},
+                 'properties': {'City': city, 'Road_traffic_density': density}}
+                for lat, lon, city, density in zip(latitudes.tolist(), longitudes.tolist(), cities, traffic)]
+
+    import folium
+
+    map = folium.Map()
+    # sem pedidos selecionados, o mapa é exibido vazio (o popup do GeoJSON exige ao menos um ponto)
+    if features:
+        folium.GeoJson({'type': 'FeatureCollection', 'features': features},
+                       popup = folium.GeoJsonPopup(fields = ['City', 'Road_traffic_density'])).add_to(map)
+    return map
+
+def raw_points_map(latitudes, longitudes, max_points = MAX_RAW_POINTS):
+    """ Esta função tem a responsabilidade de gerar o mapa com os pontos de entrega individuais, agrupados em clusters no navegador
+        (FastMarkerCluster), o que mantém o mapa responsivo com dezenas de milhares de pontos.
+
+        Input:  1. Arrays de latitudes e longitudes;
+                2. Quantidade máxima de pontos enviados ao navegador.
+        Output: folium.Map
+    """
+    points = np.column_stack([np.asarray(latitudes, dtype = np.float64), np.asarray(longitudes, dtype = np.float64)])
+    points = points[~np.isnan(points).any(axis = 1)]
+    if len(points) > max_points:
+        points = points[np.linspace(0, len(points) - 1, max_points).astype(np.int64)]
+
+    import folium
+    from folium.plugins import FastMarkerCluster
+
+    map = folium.Map()
+    FastMarkerCluster(np.round(points, 6).tolist()).add_to(map)
+    return map
+
+def render_map(map):
+    """ Esta função tem a responsabilidade de transformar um mapa em uma página HTML completa, pronta para ser exibida.
+
+        Input:  folium.Map
+        Output: HTML (str)
+    """
+    import folium
+
+    return folium.Figure().add_child(map).render()
+
+def cached_map_html(key, builder, path = DATASET_PATH):
+    """ Esta função tem a responsabilidade de fornecer o HTML de um mapa, renderizado uma única vez por processo, por versão do dataset
+        e por estado dos filtros. Trocas de aba e mudanças em outros controles reaproveitam o HTML já renderizado.
+
+        Input:  1. Chave com o estado dos filtros (valores imutáveis, por exemplo tuplas);
+                2. Função sem argumentos que constrói o folium.Map (chamada apenas quando o mapa não está em cache);
+                3. Caminho do arquivo CSV.
+        Output: HTML (str)
+    """
+    return load_memoized('map_html', key, lambda: render_map(builder()), path, MAP_CACHE_SIZE)
@@ -0,0 +1,80 @@
+# ==========================================================================================================================
+# IMPORTANDO BIBLIOTECAS NECESSÁRIAS
+# ==========================================================================================================================
+import numpy as np
+
+from utils.data import DATASET_PATH, load_data, load_memoized
+from utils.filters import load_filter_index
+from utils.sketches import count_distinct_codes
+
+# ==========================================================================================================================
+# CONFIGURAÇÕES INCIAIS
+# ==========================================================================================================================
+# Colunas do dataset necessárias para as métricas globais
+METRIC_COLUMNS = ['Order_Date', 'Delivery_person_ID', 'Delivery_person_Age', 'Vehicle_condition', 'Distance_km']
+
+# Quantidade máxima de estados de filtro cujas métricas ficam memorizadas
+METRICS_CACHE_SIZE = 256
+
+# ==========================================================================================================================
+# FUNÇÕES
+# ==========================================================================================================================
+def filter_key(date_min = None, date_max = None, **options):
+    """ Esta função tem a responsabilidade de transformar o estado dos filtros em uma chave imutável, independente da ordem das opções.
+
+        Input:  1. Datas inicial e final, opcionais;
+                2. Valores aceitos de cada coluna filtrada.
+        Output: Tupla
+    """
+    return (None if date_min is None else str(date_min), None if date_max is None else str(date_max),
+            tuple(sorted((col, tuple(sorted(values))) for col, values in options.items())))
+
+def _min_max(values):
+    """ Esta função tem a responsabilidade de calcular o mínimo e o máximo de um array numérico (NaN quando vazio).
+
+        Input:  Array
+        Output: Tupla (mínimo, máximo)
+    """
+    if len(values) == 0:
+        return (np.nan, np.nan)
+    return (values.min().item(), values.max().item())
+
+def compute_metrics(df1):
+    """ Esta função tem a responsabilidade de calcular todas as métricas globais das páginas em uma única passada pelo Dataframe filtrado:
+
+        1. 'age_min' / 'age_max': menor e maior idade dos entregadores;
+        2. 'vehicle_condition_min' / 'vehicle_condition_max': pior e melhor condição de veículo;
+        3. 'unique_couriers': quantidade exata de entregadores distintos (contados sobre os códigos do dicionário de IDs);
+        4. 'distance_mean': distância média (km) entre restaurante e local de entrega.
+
+        A média e o desvio padrão do tempo com e sem Festival vêm do backend das consultas ('query.mean_std()').
+
+        Input:  Dataframe limpo e filtrado (com METRIC_COLUMNS)
+        Output: Dicionário com as métricas
+    """
+    metrics = {}
+    metrics['age_min'], metrics['age_max'] = _min_max(df1['Delivery_person_Age'].to_numpy())
+    metrics['vehicle_condition_min'], metrics['vehicle_condition_max'] = _min_max(df1['Vehicle_condition'].to_numpy())
+    couriers = df1['Delivery_person_ID']
+    metrics['unique_couriers'] = count_distinct_codes(couriers.cat.codes.to_numpy(), len(couriers.cat.categories))
+
+    distance = df1['Distance_km'].to_numpy(dtype = np.float64)
+    metrics['distance_mean'] = float(np.nanmean(distance)) if len(distance) else np.nan
+
+    return metrics
+
+def load_metrics(date_min = None, date_max = None, path = DATASET_PATH, **options):
+    """ Esta função tem a responsabilidade de fornecer as métricas globais de um estado dos filtros da barra lateral, memorizadas
+        por versão do dataset e por estado dos filtros. Não depende do Streamlit, podendo ser usada por outros consumidores.
+
+        Input:  1. Datas inicial e final (inclusive), opcionais;
+                2. Caminho do arquivo CSV;
+                3. Valores aceitos de cada coluna de FILTER_COLS, por exemplo City = ['Urban'].
+        Output: Dicionário com as métricas (ver 'compute_metrics()')
+    """
+    def builder():
+        # o Dataframe em memória é filtrado pelo índice (busca binária nas datas e bitmaps das multiseleções)
+        df1 = load_data(path, columns = METRIC_COLUMNS)
+        return compute_metrics(load_filter_index(path).select(df1, date_min, date_max, **options))
+
+    return load_memoized('metrics', filter_key(date_min, date_max, **options), builder, path, METRICS_CACHE_SIZE)
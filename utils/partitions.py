@@ -0,0 +1,286 @@
+# ==========================================================================================================================
+# IMPORTANDO BIBLIOTECAS NECESSÁRIAS
+# ==========================================================================================================================
+import json
+import os
+import re
+import shutil
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+from pyarrow import feather
+
+from utils.data import (CACHE_VERSION, DATASET_PATH, KEEP_SNAPSHOTS, arrow_to_pandas, batches_dir, cache_path, host_lock, list_batches,
+                        load_derived, publish_snapshot, read_cache, write_feather)
+from utils.filters import FILTER_COLS
+from utils.profiling import span
+from utils.weekly import week_start
+
+# ==========================================================================================================================
+# CONFIGURAÇÕES INCIAIS
+# ==========================================================================================================================
+# As partições são semanais (semana ISO, começando na segunda-feira) e, opcionalmente, também por cidade
+PARTITION_BY_CITY = True
+
+# Nome do manifesto de cada diretório de partições: um registro por partição, com o arquivo, as linhas e as estatísticas
+MANIFEST_NAME = 'manifest.json'
+
+# ==========================================================================================================================
+# FUNÇÕES - GRAVAÇÃO
+# ==========================================================================================================================
+def partitions_dir(path = DATASET_PATH, source = None):
+    """ Esta função tem a responsabilidade de definir o diretório das partições de uma versão do CSV, ao lado do snapshot
+        ('dataset/train.<mtime>-<size>.parts'). Como o snapshot, cada versão tem o seu próprio diretório.
+
+        Input:  1. Caminho do arquivo CSV;
+                2. Versão do CSV - tupla (data de modificação em ns, tamanho) - ou None para a versão atual.
+        Output: Caminho do diretório
+    """
+    return os.path.splitext(cache_path(path, source))[0] + '.parts'
+
+def _stats(df1):
+    """ Esta função tem a responsabilidade de calcular as estatísticas de uma partição: as cidades presentes e o mínimo e o máximo
+        da data e de cada coluna numérica.
+
+        Input:  Dataframe limpo da partição
+        Output: Dicionário {'cities': lista, 'stats': {coluna: [mínimo, máximo]}} (datas em ISO 8601 e None quando não há valores)
+    """
+    stats = {}
+    for col in df1.columns:
+        values = df1[col]
+        if pd.api.types.is_datetime64_any_dtype(values):
+            low, high = values.min(), values.max()
+            stats[col] = [None if pd.isna(low) else low.isoformat(), None if pd.isna(high) else high.isoformat()]
+        elif pd.api.types.is_numeric_dtype(values) and not pd.api.types.is_bool_dtype(values):
+            low, high = values.min(), values.max()
+            stats[col] = [None if pd.isna(low) else low.item(), None if pd.isna(high) else high.item()]
+    cities = sorted(str(city) for city in df1['City'].dropna().unique()) if 'City' in df1.columns else None
+    return {'cities': cities, 'stats': stats}
+
+def write_partitions(df1, directory, by_city = PARTITION_BY_CITY):
+    """ Esta função tem a responsabilidade de gravar o Dataframe limpo em partições (um arquivo Feather sem compressão por semana ISO e,
+        opcionalmente, por cidade) e o manifesto com as linhas e as estatísticas de cada partição. O manifesto é gravado por último:
+        um diretório sem manifesto está incompleto.
+
+        As colunas categóricas mantêm o dicionário completo em todas as partições, de modo que partições lidas juntas têm as mesmas
+        categorias. Um Dataframe sem linhas é gravado como uma única partição vazia: todo manifesto lista ao menos um arquivo, de onde
+        'read_partitions()' tira o esquema do resultado quando nenhuma partição é selecionada.
+
+        Input:  1. Dataframe limpo, ordenado por 'Order_Date';
+                2. Diretório das partições (criado se não existir);
+                3. Particionar também por cidade.
+        Output: Manifesto (dicionário)
+    """
+    os.makedirs(directory, exist_ok = True)
+    keys = [pd.Series(week_start(df1['Order_Date']), index = df1.index, name = 'week')]
+    if by_city:
+        keys.append(df1['City'])
+
+    partitions = []
+    for key, rows in sorted(df1.groupby(keys, observed = True, sort = True).indices.items()):
+        week, city = (key if by_city else (key, None))
+        name = '{}.{}.feather'.format(pd.Timestamp(week).date().isoformat(), re.sub(r'[^\w-]', '_', str(city)) if by_city else 'all')
+        part = df1.take(rows)
+        write_feather(part, os.path.join(directory, name))
+        partitions.append({'file': name, 'week': pd.Timestamp(week).date().isoformat(), 'rows': len(part), **_stats(part)})
+    if not partitions:
+        write_feather(df1, os.path.join(directory, 'empty.feather'))
+        partitions.append({'file': 'empty.feather', 'week': None, 'rows': 0, **_stats(df1)})
+
+    manifest = {'cache_version': CACHE_VERSION.decode(), 'by_city': by_city, 'partitions': partitions}
+    tmp = os.path.join(directory, MANIFEST_NAME + '.tmp')
+    with open(tmp, 'w') as file:
+        json.dump(manifest, file, indent = 1)
+    os.replace(tmp, os.path.join(directory, MANIFEST_NAME))
+    return manifest
+
+def read_manifest(directory):
+    """ Esta função tem a responsabilidade de ler o manifesto de um diretório de partições.
+
+        Input:  Diretório das partições
+        Output: Lista de partições (dicionários com o caminho completo em 'file', 'rows', 'cities' e 'stats')
+    """
+    with open(os.path.join(directory, MANIFEST_NAME)) as file:
+        manifest = json.load(file)
+    return [{**entry, 'file': os.path.join(directory, entry['file'])} for entry in manifest['partitions']]
+
+def _partitions_are_fresh(directory, by_city = PARTITION_BY_CITY):
+    """ Esta função tem a responsabilidade de verificar se as partições podem ser utilizadas: o manifesto deve existir e ter sido
+        gerado pela versão atual da limpeza ('CACHE_VERSION') e com o mesmo particionamento.
+
+        Input:  1. Diretório das partições;
+                2. Particionamento por cidade esperado.
+        Output: True ou False
+    """
+    try:
+        with open(os.path.join(directory, MANIFEST_NAME)) as file:
+            manifest = json.load(file)
+    except (OSError, ValueError):
+        return False
+    return manifest.get('cache_version') == CACHE_VERSION.decode() and manifest.get('by_city') == by_city
+
+def _remove_old_partitions(path, keep = KEEP_SNAPSHOTS):
+    """ Esta função tem a responsabilidade de apagar os diretórios de partições mais antigos do dataset, mantendo os 'keep' mais recentes.
+
+        Input:  1. Caminho do arquivo CSV;
+                2. Quantidade de diretórios mantidos.
+        Output: Nenhum.
+    """
+    folder, base = os.path.split(os.path.splitext(path)[0])
+    pattern = re.compile(re.escape(base) + r'\.\d+-\d+\.parts$')
+    directories = [os.path.join(folder, name) for name in os.listdir(folder or '.') if pattern.match(name)]
+    for directory in sorted(directories, key = os.path.getmtime, reverse = True)[keep:]:
+        shutil.rmtree(directory, ignore_errors = True)
+
+def publish_partitions(path = DATASET_PATH, source = None, csv_path = None):
+    """ Esta função tem a responsabilidade de publicar as partições de uma versão do CSV uma única vez por host, a partir do snapshot
+        limpo ('publish_snapshot()'): o primeiro processo a precisar delas grava as partições em um diretório temporário e o renomeia,
+        e os demais aguardam a trava e apenas as reutilizam.
+
+        Input:  1. Caminho do arquivo CSV;
+                2. Versão do CSV - tupla (data de modificação em ns, tamanho) - ou None para a versão atual;
+                3. CSV a ser limpo quando o snapshot ainda não existe (ver 'publish_snapshot()').
+        Output: Caminho do diretório das partições (erros de gravação são propagados)
+    """
+    directory = partitions_dir(path, source)
+    if _partitions_are_fresh(directory):
+        return directory
+
+    # o snapshot é publicado antes de tomar a trava, que ele também usa
+    snapshot = publish_snapshot(path, source, csv_path)
+    with host_lock(path):
+        if not _partitions_are_fresh(directory):
+            staging = '{}.{}.tmp'.format(directory, os.getpid())
+            shutil.rmtree(staging, ignore_errors = True)
+            try:
+                with span('write_partitions'):
+                    write_partitions(read_cache(snapshot), staging)
+                shutil.rmtree(directory, ignore_errors = True)
+                os.replace(staging, directory)
+            finally:
+                shutil.rmtree(staging, ignore_errors = True)
+            _remove_old_partitions(path)
+    return directory
+
+# ==========================================================================================================================
+# FUNÇÕES - LEITURA COM PODA DE PARTIÇÕES
+# ==========================================================================================================================
+def build_partition_manifest(path = DATASET_PATH):
+    """ Esta função tem a responsabilidade de listar as partições da versão atual do dataset: as do snapshot, pelo manifesto, e os lotes
+        ingeridos após o CSV, cada um como uma partição (as estatísticas dos lotes são calculadas a partir das suas datas e cidades).
+
+        Input:  Caminho do arquivo CSV
+        Output: Lista de partições (ver 'read_manifest()')
+    """
+    entries = read_manifest(publish_partitions(path))
+    for name in list_batches(path):
+        batch = os.path.join(batches_dir(path), name)
+        df1 = read_cache(batch, ['Order_Date', 'City'])
+        entries.append({'file': batch, 'week': None, 'rows': len(df1), **_stats(df1)})
+    return entries
+
+def load_partition_manifest(path = DATASET_PATH):
+    """ Esta função tem a responsabilidade de fornecer a lista de partições, montada uma única vez por processo e por versão do dataset.
+
+        Input:  Caminho do arquivo CSV
+        Output: Lista de partições
+    """
+    return load_derived('partition_manifest', build_partition_manifest, path)
+
+def prune_partitions(entries, date_min = None, date_max = None, cities = None):
+    """ Esta função tem a responsabilidade de descartar, somente pelas estatísticas do manifesto e antes de ler qualquer arquivo,
+        as partições sem pedidos no período ou nas cidades selecionadas.
+
+        Input:  1. Lista de partições;
+                2. Datas inicial e final (inclusive), opcionais;
+                3. Cidades selecionadas (None para todas).
+        Output: Lista das partições que podem ter pedidos selecionados
+    """
+    low = None if date_min is None else pd.Timestamp(date_min)
+    high = None if date_max is None else pd.Timestamp(date_max)
+    cities = None if cities is None else set(cities)
+
+    selected = []
+    for entry in entries:
+        first, last = entry['stats'].get('Order_Date', [None, None])
+        if entry['rows'] == 0 or first is None:
+            continue
+        if (low is not None and pd.Timestamp(last) < low) or (high is not None and pd.Timestamp(first) > high):
+            continue
+        if cities is not None and entry['cities'] is not None and not cities.intersection(entry['cities']):
+            continue
+        selected.append(entry)
+    return selected
+
+def _read_table(path, columns = None):
+    """ Esta função tem a responsabilidade de ler uma partição (ou lote) via memory-map, com os dicionários em índices de 32 bits,
+        para que arquivos com dicionários de tamanhos diferentes possam ser concatenados.
+
+        Input:  1. Caminho do arquivo Feather;
+                2. Lista de colunas (None para todas).
+        Output: pyarrow.Table
+    """
+    table = feather.read_table(path, columns = columns, memory_map = True)
+    schema = pa.schema([pa.field(field.name, pa.dictionary(pa.int32(), field.type.value_type))
+                        if pa.types.is_dictionary(field.type) else field for field in table.schema])
+    return table if schema.equals(table.schema) else table.cast(schema)
+
+def read_partitions(entries, date_min = None, date_max = None, columns = None, **options):
+    """ Esta função tem a responsabilidade de ler somente as partições que podem ter pedidos selecionados e aplicar os filtros
+        da barra lateral às suas linhas.
+
+        Cada partição é lida via memory-map e somente com as colunas necessárias (as partições descartadas não são abertas); as tabelas
+        são concatenadas, filtradas e ordenadas por data no Arrow, e apenas as linhas selecionadas são convertidas em Dataframe.
+
+        Input:  1. Lista de partições (ver 'read_manifest()');
+                2. Datas inicial e final (inclusive), opcionais;
+                3. Lista de colunas (None para todas);
+                4. Valores aceitos de cada coluna de FILTER_COLS, por exemplo City = ['Urban'].
+        Output: Dataframe limpo e filtrado, ordenado por data
+    """
+    for col in options:
+        if col not in FILTER_COLS:
+            raise ValueError("Invalid filter column '{}'! Expected one of {}.".format(col, FILTER_COLS))
+
+    needed = None if columns is None else list(dict.fromkeys(list(columns) + ['Order_Date'] + list(options)))
+    # uma multiseleção vazia não seleciona nenhum pedido: nenhuma partição é lida
+    empty = any(len(values) == 0 for values in options.values())
+    selected = [] if empty else prune_partitions(entries, date_min, date_max, options.get('City'))
+    if not selected:
+        # apenas o esquema da primeira partição, sem linhas (o manifesto sempre tem ao menos uma, ver 'write_partitions()')
+        if not entries:
+            raise ValueError('No partitions to read.')
+        return arrow_to_pandas(_read_table(entries[0]['file'], columns).slice(0, 0))
+
+    table = pa.concat_tables([_read_table(entry['file'], needed) for entry in selected]).unify_dictionaries()
+
+    date_type = table.schema.field('Order_Date').type
+    conditions = []
+    if date_min is not None:
+        conditions.append(pc.greater_equal(table['Order_Date'], pa.scalar(pd.Timestamp(date_min), type = date_type)))
+    if date_max is not None:
+        conditions.append(pc.less_equal(table['Order_Date'], pa.scalar(pd.Timestamp(date_max), type = date_type)))
+    for col, values in options.items():
+        conditions.append(pc.is_in(table[col], value_set = pa.array(list(values), type = table.schema.field(col).type.value_type)))
+    if conditions:
+        mask = conditions[0]
+        for condition in conditions[1:]:
+            mask = pc.and_(mask, condition)
+        table = table.filter(mask)
+    table = table.take(pc.sort_indices(table, sort_keys = [('Order_Date', 'ascending')]))
+    return arrow_to_pandas(table if columns is None else table.select(list(columns)))
+
+def load_partitions(path = DATASET_PATH, date_min = None, date_max = None, columns = None, **options):
+    """ Esta função tem a responsabilidade de carregar as linhas selecionadas pelos filtros da barra lateral lendo somente as partições
+        do período e das cidades selecionados, em vez do conjunto de dados inteiro.
+
+        Input:  1. Caminho do arquivo CSV;
+                2. Datas inicial e final (inclusive), opcionais;
+                3. Lista de colunas (None para todas);
+                4. Valores aceitos de cada coluna de FILTER_COLS, por exemplo City = ['Urban'].
+        Output: Dataframe limpo e filtrado, ordenado por data
+    """
+    entries = load_partition_manifest(path)
+    with span('read_partitions'):
+        return read_partitions(entries, date_min, date_max, columns, **options)
@@ -0,0 +1,141 @@
+# ==========================================================================================================================
+# IMPORTANDO BIBLIOTECAS NECESSÁRIAS
+# ==========================================================================================================================
+import math
+
+import numpy as np
+import pandas as pd
+
+from utils.weekly import week_start
+
+# ==========================================================================================================================
+# CONFIGURAÇÕES INCIAIS
+# ==========================================================================================================================
+# Quantidade máxima de pontos (barras, marcadores) enviados ao navegador em cada série de um gráfico
+MAX_CHART_POINTS = 500
+
+# Granularidades de tempo, da mais fina para a mais grossa: dia, semana ISO (segunda-feira) e mês
+TIME_BUCKETS = ['D', 'W', 'M']
+
+# Quantidade de linhas enviadas ao navegador por página das tabelas grandes
+TABLE_PAGE_SIZE = 200
+
+# ==========================================================================================================================
+# FUNÇÕES - GRÁFICOS
+# ==========================================================================================================================
+def bucket_dates(dates, freq):
+    """ Esta função tem a responsabilidade de levar cada data ao início do seu período.
+
+        Input:  1. Series de datas;
+                2. Granularidade - 'D' (dia), 'W' (semana ISO, começando na segunda-feira) ou 'M' (mês).
+        Output: Series com o início do período de cada data
+    """
+    if freq == 'D':
+        return dates.dt.normalize()
+    if freq == 'W':
+        return pd.Series(week_start(dates), index = dates.index, name = dates.name)
+    if freq == 'M':
+        return pd.Series(dates.to_numpy().astype('datetime64[M]').astype('datetime64[ns]'), index = dates.index, name = dates.name)
+    raise ValueError("Invalid time bucket '{}'! Expected one of {}.".format(freq, TIME_BUCKETS))
+
+def time_bucket(dates, max_points = MAX_CHART_POINTS):
+    """ Esta função tem a responsabilidade de escolher a granularidade mais fina que mantém a série dentro do orçamento de pontos.
+
+        Input:  1. Series de datas;
+                2. Quantidade máxima de pontos.
+        Output: 'D', 'W' ou 'M' (o mês é usado mesmo quando ainda excede o orçamento)
+    """
+    for freq in TIME_BUCKETS[:-1]:
+        if bucket_dates(dates, freq).nunique() <= max_points:
+            return freq
+    return TIME_BUCKETS[-1]
+
+def aggregate_by_time(df2, date_col, value_cols, max_points = MAX_CHART_POINTS):
+    """ Esta função tem a responsabilidade de somar uma série temporal em períodos mais longos (dia -> semana -> mês) quando ela
+        tem mais pontos que o orçamento, de modo que o volume enviado ao navegador não cresça com o histórico.
+
+        Input:  1. Dataframe com uma linha por data;
+                2. Coluna das datas;
+                3. Colunas de valores somáveis (contagens, totais);
+                4. Quantidade máxima de pontos.
+        Output: Tupla (Dataframe com uma linha por período, granularidade escolhida)
+    """
+    if len(df2) <= max_points:
+        return df2, 'D'
+    freq = time_bucket(df2[date_col], max_points)
+    df2 = df2.groupby(bucket_dates(df2[date_col], freq))[value_cols].sum().reset_index()
+    return df2, freq
+
+def lttb_indices(x, y, n_out):
+    """ Esta função tem a responsabilidade de escolher os pontos de uma série com o Largest-Triangle-Three-Buckets (LTTB):
+        o primeiro e o último pontos são mantidos e, em cada um dos n_out - 2 intervalos, fica o ponto que forma o maior triângulo
+        com o ponto escolhido no intervalo anterior e a média do intervalo seguinte, preservando picos e vales.
+
+        Input:  1. Array do eixo x (numérico, crescente);
+                2. Array do eixo y;
+                3. Quantidade de pontos desejada.
+        Output: Array com as posições dos pontos escolhidos
+    """
+    n = len(x)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+
+    x = np.asarray(x, dtype = np.float64)
+    y = np.asarray(y, dtype = np.float64)
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+    selected = np.empty(n_out, dtype = np.int64)
+    selected[0], selected[-1] = 0, n - 1
+
+    for i in range(n_out - 2):
+        lo, hi = edges[i], edges[i + 1]
+        next_lo, next_hi = hi, (edges[i + 2] if i + 2 < len(edges) else n)
+        mean_x, mean_y = x[next_lo:next_hi].mean(), y[next_lo:next_hi].mean()
+        a = selected[i]
+        areas = np.abs((x[a] - mean_x) * (y[lo:hi] - y[a]) - (x[a] - x[lo:hi]) * (mean_y - y[a]))
+        selected[i + 1] = lo + int(np.argmax(areas))
+    return selected
+
+def downsample(df2, x, y, max_points = MAX_CHART_POINTS):
+    """ Esta função tem a responsabilidade de reduzir uma série de um gráfico de linhas ao orçamento de pontos, com o LTTB.
+
+        Input:  1. Dataframe ordenado pelo eixo x;
+                2. Coluna do eixo x (numérica, de datas ou de rótulos em ordem);
+                3. Coluna do eixo y;
+                4. Quantidade máxima de pontos.
+        Output: Dataframe com as linhas escolhidas (todas as colunas preservadas)
+    """
+    if len(df2) <= max_points:
+        return df2
+    values = df2[x]
+    if pd.api.types.is_datetime64_any_dtype(values):
+        positions = values.to_numpy().astype('datetime64[ns]').astype(np.int64)
+    elif pd.api.types.is_numeric_dtype(values):
+        positions = values.to_numpy()
+    else:
+        positions = np.arange(len(df2))
+    y_values = df2[y].to_numpy(dtype = np.float64)
+    return df2.iloc[lttb_indices(positions, np.nan_to_num(y_values), max_points)]
+
+# ==========================================================================================================================
+# FUNÇÕES - TABELAS
+# ==========================================================================================================================
+def page_count(n_rows, page_size = TABLE_PAGE_SIZE):
+    """ Esta função tem a responsabilidade de calcular a quantidade de páginas de uma tabela (no mínimo 1).
+
+        Input:  1. Quantidade de linhas;
+                2. Linhas por página.
+        Output: int
+    """
+    return max(1, math.ceil(n_rows / page_size))
+
+def paginate(df2, page, page_size = TABLE_PAGE_SIZE):
+    """ Esta função tem a responsabilidade de recortar uma página de uma tabela, para que apenas ela seja enviada ao navegador.
+        Páginas fora do intervalo são levadas à primeira ou à última página.
+
+        Input:  1. Dataframe;
+                2. Número da página (a partir de 1);
+                3. Linhas por página.
+        Output: Tupla (Dataframe da página, número da página efetivamente exibida)
+    """
+    page = min(max(int(page), 1), page_count(len(df2), page_size))
+    return df2.iloc[(page - 1) * page_size:page * page_size], page
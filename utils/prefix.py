@@ -0,0 +1,145 @@
+# ==========================================================================================================================
+# IMPORTANDO BIBLIOTECAS NECESSÁRIAS
+# ==========================================================================================================================
+import numpy as np
+import pandas as pd
+
+from utils.cube import CUBE_DIMS, CUBE_MEASURES, OrderCube, load_cube
+from utils.data import DATASET_PATH, load_derived
+
+# ==========================================================================================================================
+# CONFIGURAÇÕES INCIAIS
+# ==========================================================================================================================
+# Dimensões dos grupos: todas as dimensões do cubo, exceto a data (que vira o eixo das somas acumuladas)
+PREFIX_DIMS = [col for col in CUBE_DIMS if col != 'Order_Date']
+
+# ==========================================================================================================================
+# CLASSES
+# ==========================================================================================================================
+class DailyPrefix:
+    """ Esta classe tem a responsabilidade de responder agregados de qualquer intervalo de datas em tempo constante no tamanho do histórico.
+
+        Para cada grupo (combinação observada de PREFIX_DIMS) são guardadas somas acumuladas por dia, do primeiro dia do histórico
+        até cada dia: a contagem de pedidos e, para cada medida, a soma e a soma dos quadrados dos desvios em relação a um deslocamento
+        (a média global da medida). O agregado de [início, fim] é a diferença entre as somas do fim e as do dia anterior ao início:
+        duas consultas e uma subtração por grupo, qualquer que seja o tamanho do intervalo ou do histórico.
+
+        Com o deslocamento, as somas ficam próximas de zero e a variância ('M2 = S2 - S1**2 / n') não sofre o cancelamento das somas
+        dos valores brutos. A memória é de (dias + 1) x grupos x (1 + 2 x medidas) números.
+    """
+    def __init__(self, groups, first_day, sums, shifts):
+        """ Input:  1. Dataframe com as PREFIX_DIMS de cada grupo (a posição é a coluna dos arrays);
+                    2. Primeiro dia do histórico (pd.Timestamp);
+                    3. Dicionário {'count' ou '<medida> (s1)' / '<medida> (s2)': array (dias + 1) x grupos com as somas acumuladas};
+                    4. Dicionário {medida: deslocamento}.
+        """
+        self.groups = groups
+        self.first_day = first_day
+        self.sums = sums
+        self.shifts = shifts
+
+    @classmethod
+    def build(cls, cube):
+        """ Esta função tem a responsabilidade de construir as somas acumuladas a partir das células do cubo de agregados,
+            sem acessar as linhas do dataset.
+
+            Input:  OrderCube
+            Output: DailyPrefix
+        """
+        cells = cube.cells
+        groups = cells.groupby(PREFIX_DIMS, observed = True, sort = True)
+        group_id = groups.ngroup().to_numpy()
+        n_groups = groups.ngroups
+
+        dates = cells['Order_Date'].dt.normalize()
+        first_day = dates.min() if len(cells) else pd.Timestamp(0)
+        day = ((dates - first_day) // pd.Timedelta(days = 1)).to_numpy(dtype = np.int64)
+        n_days = int(day.max()) + 1 if len(cells) else 0
+
+        # Linha 0 das somas acumuladas = antes do primeiro dia; a célula do dia d entra na linha d + 1
+        position = (day + 1) * n_groups + group_id
+        size = (n_days + 1) * n_groups
+
+        def accumulate(weights):
+            return np.cumsum(np.bincount(position, weights = weights, minlength = size).reshape(n_days + 1, n_groups), axis = 0)
+
+        count = cells['count'].to_numpy(dtype = np.float64)
+        sums = {'count': accumulate(count)}
+        shifts = {}
+        for measure in CUBE_MEASURES:
+            mean = cells[measure + ' (mean)'].to_numpy(dtype = np.float64)
+            m2 = cells[measure + ' (m2)'].to_numpy(dtype = np.float64)
+            shifts[measure] = float(np.dot(count, mean) / count.sum()) if count.sum() else 0.0
+            delta = mean - shifts[measure]
+            sums[measure + ' (s1)'] = accumulate(count * delta)
+            sums[measure + ' (s2)'] = accumulate(m2 + count * delta * delta)
+
+        return cls(groups.size().index.to_frame(index = False), first_day, sums, shifts)
+
+    def _row(self, date, side):
+        """ Esta função tem a responsabilidade de traduzir uma data no índice da linha das somas acumuladas.
+
+            Input:  1. Data (ou None);
+                    2. 'start' (primeiro dia incluído) ou 'end' (último dia incluído).
+            Output: Índice da linha (as somas até o dia anterior ao início, ou até o dia final)
+        """
+        n_days = len(self.sums['count']) - 1
+        if date is None:
+            return 0 if side == 'start' else n_days
+        days = (pd.Timestamp(date) - self.first_day) / pd.Timedelta(days = 1)
+        row = np.ceil(days) if side == 'start' else np.floor(days) + 1
+        return int(min(max(row, 0), n_days))
+
+    def select(self, date_min = None, date_max = None, **options):
+        """ Esta função tem a responsabilidade de calcular os agregados de um intervalo de datas e dos filtros da barra lateral.
+
+            O resultado é um OrderCube sem a dimensão 'Order_Date' (uma célula por grupo), que responde 'counts()' e 'mean_std()'
+            como o cubo recortado por 'OrderCube.select()'.
+
+            Input:  1. Data inicial (inclusive), opcional;
+                    2. Data final (inclusive), opcional;
+                    3. Valores aceitos de cada dimensão, por exemplo Road_traffic_density = ['Low', 'High'].
+            Output: OrderCube com as colunas PREFIX_DIMS, 'count', '<medida> (mean)' e '<medida> (m2)'
+        """
+        mask = np.ones(len(self.groups), dtype = bool)
+        for col, values in options.items():
+            if col not in PREFIX_DIMS:
+                raise ValueError("Invalid dimension '{}'! Expected one of {}.".format(col, PREFIX_DIMS))
+            mask &= self.groups[col].isin(values).to_numpy()
+
+        start, end = self._row(date_min, 'start'), self._row(date_max, 'end')
+        end = max(start, end)
+
+        def window(name):
+            return (self.sums[name][end] - self.sums[name][start])[mask]
+
+        count = window('count')
+        cells = self.groups.loc[mask, :].reset_index(drop = True)
+        cells['count'] = np.rint(count).astype(np.int64)
+        with np.errstate(divide = 'ignore', invalid = 'ignore'):
+            for measure in CUBE_MEASURES:
+                s1, s2 = window(measure + ' (s1)'), window(measure + ' (s2)')
+                cells[measure + ' (mean)'] = self.shifts[measure] + s1 / count
+                cells[measure + ' (m2)'] = np.maximum(s2 - s1 * s1 / count, 0)
+
+        return OrderCube(cells.loc[cells['count'] > 0, :].reset_index(drop = True))
+
+# ==========================================================================================================================
+# FUNÇÕES
+# ==========================================================================================================================
+def build_daily_prefix(path = DATASET_PATH):
+    """ Esta função tem a responsabilidade de construir as somas acumuladas por dia a partir do cubo de agregados.
+
+        Input:  Caminho do arquivo CSV
+        Output: DailyPrefix
+    """
+    return DailyPrefix.build(load_cube(path))
+
+def load_daily_prefix(path = DATASET_PATH):
+    """ Esta função tem a responsabilidade de fornecer as somas acumuladas por dia, construídas uma única vez por processo e por versão
+        do dataset. Novos lotes atualizam o cubo de forma incremental, e as somas são refeitas a partir das células do cubo.
+
+        Input:  Caminho do arquivo CSV
+        Output: DailyPrefix
+    """
+    return load_derived('daily_prefix', build_daily_prefix, path)
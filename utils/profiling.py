@@ -0,0 +1,264 @@
+# ==========================================================================================================================
+# IMPORTANDO BIBLIOTECAS NECESSÁRIAS
+# ==========================================================================================================================
+import cProfile
+import io
+import json
+import marshal
+import os
+import pstats
+import threading
+import time
+from collections import OrderedDict, deque
+from contextlib import contextmanager
+
+import pandas as pd
+
+# ==========================================================================================================================
+# CONFIGURAÇÕES INCIAIS
+# ==========================================================================================================================
+# Variável de ambiente com o caminho de um arquivo JSON lines que recebe os tempos de todas as execuções (opcional)
+TIMINGS_LOG_ENV = 'CURRY_TIMINGS_LOG'
+
+# Quantidade de execuções (reruns) recentes guardadas para exportação
+RERUNS_HISTORY = 500
+
+# Quantidade máxima de sessões com tempos agregados em memória (as menos recentes são descartadas)
+MAX_SESSIONS = 256
+
+# Quantidade de funções listadas no relatório de um perfil
+PROFILE_LIMIT = 40
+
+# Execução ativa de cada thread, execuções recentes e tempos agregados por sessão -> {(página, etapa): [n, total, máximo]}
+_local = threading.local()
+_lock = threading.Lock()
+_reruns = deque(maxlen = RERUNS_HISTORY)
+_totals = OrderedDict()
+
+# ==========================================================================================================================
+# CLASSES
+# ==========================================================================================================================
+class Rerun:
+    """ Esta classe tem a responsabilidade de registrar os tempos (spans) de uma execução de uma página.
+
+        A execução fica ativa na thread que a criou (e nas threads dos gráficos agendados por ela, ver 'utils.scheduler'):
+        enquanto ativa, cada 'span()' aberto nessas threads é registrado nela. Sem execução ativa, 'span()' não faz nada.
+    """
+    def __init__(self, page, session = None):
+        """ Input:  1. Nome da página;
+                    2. Identificador da sessão do usuário.
+        """
+        self.page = page
+        self.session = session
+        self.timestamp = time.time()
+        self.spans = []
+        self.profile = None
+        self.profile_report = None
+        self.finished = False
+        self._start = time.perf_counter()
+        self._lock = threading.Lock()
+
+    def add(self, name, seconds):
+        """ Esta função tem a responsabilidade de registrar a duração de uma etapa.
+
+            Input:  1. Nome da etapa;
+                    2. Duração em segundos.
+            Output: Nenhum.
+        """
+        with self._lock:
+            self.spans.append((name, seconds, threading.current_thread().name))
+
+    @contextmanager
+    def activate(self):
+        """ Esta função tem a responsabilidade de tornar a execução ativa na thread atual enquanto o bloco 'with' durar.
+        """
+        previous = getattr(_local, 'rerun', None)
+        _local.rerun = self
+        try:
+            yield self
+        finally:
+            _local.rerun = previous
+
+    def start(self, profile = False):
+        """ Esta função tem a responsabilidade de tornar a execução ativa na thread atual até 'finish()', opcionalmente
+            capturando um perfil (cProfile) de tudo o que rodar na thread até lá.
+
+            Uma execução anterior que ainda esteja ativa na thread (encerrada sem chegar ao 'finish()') é interrompida antes,
+            para que o seu perfil não continue ligado nem se sobreponha ao novo.
+
+            Input:  Capturar ou não o perfil
+            Output: A própria execução
+        """
+        previous = getattr(_local, 'rerun', None)
+        if previous is not None and previous is not self:
+            previous.stop()
+        _local.rerun = self
+        if profile:
+            self.profile = cProfile.Profile()
+            self.profile.enable()
+        return self
+
+    def stop(self):
+        """ Esta função tem a responsabilidade de encerrar o perfil (quando capturado) e desativar a execução na thread atual,
+            sem registrar os tempos.
+
+            Input:  Nenhum
+            Output: A própria execução
+        """
+        if self.profile is not None and self.profile_report is None:
+            self.profile.disable()
+            self.profile_report = profile_report(self.profile)
+        if getattr(_local, 'rerun', None) is self:
+            _local.rerun = None
+        return self
+
+    def finish(self):
+        """ Esta função tem a responsabilidade de encerrar a execução: registra o tempo total, encerra o perfil, desativa a execução
+            e acumula os tempos nos agregados da página e da sessão (e no arquivo de TIMINGS_LOG_ENV, quando definido).
+            Chamadas seguintes não fazem nada, então a execução pode ser encerrada em um 'finally' e de novo pelo painel.
+
+            Input:  Nenhum
+            Output: A própria execução
+        """
+        if self.finished:
+            return self
+        self.finished = True
+        self.stop()
+        self.add('rerun', time.perf_counter() - self._start)
+
+        with _lock:
+            _reruns.append(self)
+            totals = _totals.pop(self.session, {})
+            _totals[self.session] = totals
+            while len(_totals) > MAX_SESSIONS:
+                _totals.popitem(last = False)
+            for name, seconds, _ in self.spans:
+                stats = totals.setdefault((self.page, name), [0, 0.0, 0.0])
+                stats[0] += 1
+                stats[1] += seconds
+                stats[2] = max(stats[2], seconds)
+
+        log = os.environ.get(TIMINGS_LOG_ENV)
+        if log:
+            with _lock, open(log, 'a', encoding = 'utf-8') as file:
+                file.write(to_jsonl([self]))
+        return self
+
+    def is_profiling(self):
+        """ Esta função tem a responsabilidade de informar se a execução está capturando um perfil.
+        """
+        return self.profile is not None and self.profile_report is None
+
+    def summary(self):
+        """ Esta função tem a responsabilidade de listar as etapas da execução.
+
+            Input:  Nenhum
+            Output: Dataframe com 'span', 'seconds' e 'thread', na ordem de término
+        """
+        with self._lock:
+            return pd.DataFrame(self.spans, columns = ['span', 'seconds', 'thread'])
+
+# ==========================================================================================================================
+# FUNÇÕES
+# ==========================================================================================================================
+def current_rerun():
+    """ Esta função tem a responsabilidade de fornecer a execução ativa na thread atual.
+
+        Input:  Nenhum
+        Output: Rerun (ou None)
+    """
+    return getattr(_local, 'rerun', None)
+
+@contextmanager
+def span(name):
+    """ Esta função tem a responsabilidade de medir o tempo de um bloco 'with' e registrá-lo na execução ativa da thread.
+        Sem execução ativa (scripts, serviço HTTP, benchmarks), o custo é só o de uma consulta à execução ativa.
+
+        Input:  Nome da etapa (por exemplo 'load', 'filter', 'aggregate: ratings_by_courier', 'render: ratings_by_courier')
+        Output: Nenhum.
+    """
+    rerun = getattr(_local, 'rerun', None)
+    if rerun is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        rerun.add(name, time.perf_counter() - start)
+
+def totals(session = None):
+    """ Esta função tem a responsabilidade de agregar os tempos das etapas por página (e por sessão).
+
+        Input:  Identificador da sessão (None para todas as sessões)
+        Output: Dataframe com 'session', 'page', 'span', 'count', 'total_s', 'mean_s' e 'max_s'
+    """
+    with _lock:
+        sessions = [session] if session is not None else list(_totals)
+        rows = [(key, page, name, *stats) for key in sessions for (page, name), stats in _totals.get(key, {}).items()]
+    df2 = pd.DataFrame(rows, columns = ['session', 'page', 'span', 'count', 'total_s', 'max_s'])
+    df2.insert(5, 'mean_s', df2['total_s'] / df2['count'])
+    return df2.sort_values(['page', 'total_s'], ascending = [True, False], ignore_index = True)
+
+def recent_reruns(session = None):
+    """ Esta função tem a responsabilidade de listar as execuções recentes (até RERUNS_HISTORY).
+
+        Input:  Identificador da sessão (None para todas as sessões)
+        Output: Lista de Rerun
+    """
+    with _lock:
+        return [rerun for rerun in _reruns if session is None or rerun.session == session]
+
+def to_jsonl(reruns):
+    """ Esta função tem a responsabilidade de exportar as etapas de execuções em JSON lines (uma linha por etapa).
+
+        Input:  Lista de Rerun
+        Output: Texto
+    """
+    lines = []
+    for rerun in reruns:
+        for name, seconds, thread in rerun.summary().itertuples(index = False):
+            lines.append(json.dumps({'timestamp': rerun.timestamp, 'session': rerun.session, 'page': rerun.page,
+                                     'span': name, 'seconds': seconds, 'thread': thread}))
+    return ''.join(line + '\n' for line in lines)
+
+def to_prometheus(session = None):
+    """ Esta função tem a responsabilidade de exportar os tempos agregados no formato texto do Prometheus (um summary por
+        página e etapa, somando as sessões).
+
+        Input:  Identificador da sessão (None para todas as sessões)
+        Output: Texto
+    """
+    df2 = totals(session).groupby(['page', 'span'], sort = True)[['count', 'total_s']].sum().reset_index()
+
+    def label(value):
+        return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+    lines = ['# HELP curry_span_seconds Tempo gasto em cada etapa das páginas do dashboard.',
+             '# TYPE curry_span_seconds summary']
+    for page, name, count, total in df2.itertuples(index = False):
+        labels = 'page="{}",span="{}"'.format(label(page), label(name))
+        lines.append('curry_span_seconds_sum{{{}}} {:.6f}'.format(labels, total))
+        lines.append('curry_span_seconds_count{{{}}} {}'.format(labels, count))
+    return '\n'.join(lines) + '\n'
+
+def profile_report(profile, limit = PROFILE_LIMIT):
+    """ Esta função tem a responsabilidade de resumir um perfil do cProfile, ordenado pelo tempo acumulado.
+
+        Input:  1. cProfile.Profile já encerrado;
+                2. Quantidade de funções listadas.
+        Output: Texto
+    """
+    output = io.StringIO()
+    pstats.Stats(profile, stream = output).strip_dirs().sort_stats('cumulative').print_stats(limit)
+    return output.getvalue()
+
+def profile_dump(profile):
+    """ Esta função tem a responsabilidade de serializar um perfil no formato do 'pstats' (o mesmo de 'cProfile.Profile.dump_stats()'),
+        para ser aberto depois com pstats, snakeviz etc.
+
+        Input:  cProfile.Profile já encerrado
+        Output: bytes
+    """
+    profile.create_stats()
+    return marshal.dumps(profile.stats)
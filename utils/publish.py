@@ -0,0 +1,67 @@
+# ==========================================================================================================================
+# IMPORTANDO BIBLIOTECAS NECESSÁRIAS
+# ==========================================================================================================================
+import argparse
+import os
+import shutil
+
+from utils.data import DATASET_PATH, dataset_version, publish_snapshot
+from utils.partitions import publish_partitions
+
+# ==========================================================================================================================
+# FUNÇÕES
+# ==========================================================================================================================
+def publish(path = DATASET_PATH):
+    """ Esta função tem a responsabilidade de publicar o snapshot limpo e as partições da versão atual do dataset, por exemplo no deploy,
+        antes de subir as réplicas do painel, para que nenhuma sessão precise limpar o CSV.
+
+        Input:  Caminho do arquivo CSV
+        Output: Caminho do snapshot
+    """
+    source = dataset_version(path)[0]
+    snapshot = publish_snapshot(path, source)
+    publish_partitions(path, source)
+    return snapshot
+
+def swap_dataset(csv_source, path = DATASET_PATH):
+    """ Esta função tem a responsabilidade de trocar o dataset por uma nova versão de forma atômica, sem interromper as sessões:
+
+        1. O novo CSV é copiado para um arquivo temporário no diretório do dataset;
+        2. O snapshot limpo e as partições da nova versão são publicados antes da troca (os nomes levam a data de modificação e
+           o tamanho do novo CSV, que não mudam com a renomeação);
+        3. O CSV é renomeado sobre o antigo (os.replace, atômico no mesmo sistema de arquivos).
+
+        A partir da troca, cada processo passa a mapear o novo snapshot na sua próxima execução; quem ainda lê o snapshot anterior
+        continua lendo-o sem interrupção. Os lotes já ingeridos ('utils.ingest') continuam sendo acrescentados ao novo CSV.
+
+        Input:  1. Caminho do novo CSV;
+                2. Caminho do arquivo CSV do dataset.
+        Output: Caminho do snapshot da nova versão
+    """
+    folder, name = os.path.split(os.path.abspath(path))
+    staged = os.path.join(folder, '.{}.{}.staging'.format(name, os.getpid()))
+    shutil.copyfile(csv_source, staged)
+    try:
+        stat = os.stat(staged)
+        source = (stat.st_mtime_ns, stat.st_size)
+        snapshot = publish_snapshot(path, source, csv_path = staged)
+        publish_partitions(path, source)
+        os.replace(staged, path)
+    finally:
+        if os.path.exists(staged):
+            os.remove(staged)
+    return snapshot
+
+# ==========================================================================================================================
+# INÍCIO DA ESTRUTURA LÓGICA DO CÓDIGO
+# ==========================================================================================================================
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description = 'Publicação do snapshot limpo e das partições do dataset (compartilhados por todos os processos do host).')
+    parser.add_argument('csv', nargs = '?', help = 'novo CSV; quando informado, o dataset é trocado atomicamente por ele')
+    parser.add_argument('--dataset', default = DATASET_PATH)
+    args = parser.parse_args()
+
+    if args.csv:
+        print('Dataset trocado; snapshot publicado em {}'.format(swap_dataset(args.csv, args.dataset)))
+    else:
+        print('Snapshot publicado em {}'.format(publish(args.dataset)))
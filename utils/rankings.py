@@ -0,0 +1,36 @@
+# ==========================================================================================================================
+# IMPORTANDO BIBLIOTECAS NECESSÁRIAS
+# ==========================================================================================================================
+import pandas as pd
+
+# ==========================================================================================================================
+# CONFIGURAÇÕES INCIAIS
+# ==========================================================================================================================
+# Quantidade padrão de entregadores em cada ranking
+TOP_N = 10
+
+# ==========================================================================================================================
+# FUNÇÕES
+# ==========================================================================================================================
+def rank_couriers(means, n = TOP_N, cities = None):
+    """ Esta função tem a responsabilidade de montar, para cada cidade, o ranking dos N entregadores com a menor e com a maior média,
+        a partir das médias por (cidade, entregador) já calculadas em uma única agregação (por exemplo, 'query.means()'), sem acessar as linhas.
+
+        Cada cidade seleciona apenas os N extremos ('nsmallest'/'nlargest') entre os seus entregadores, sem ordenar todos eles; o custo
+        depende do número de entregadores, e não do número de cidades multiplicado pelo número de linhas. Empates são resolvidos pelo ID
+        do entregador (a ordem do índice).
+
+        Input:  1. Series de médias indexada por ('City', 'Delivery_person_ID'), ordenada;
+                2. Quantidade de entregadores em cada ranking;
+                3. Cidades a serem ranqueadas (None para todas, na ordem do índice).
+        Output: Dicionário {cidade: (Series dos N menores, Series dos N maiores)}, indexadas por 'Delivery_person_ID'
+    """
+    groups = {city: group.droplevel('City') for city, group in means.groupby(level = 'City', observed = True, sort = False)}
+    if cities is None:
+        cities = list(groups)
+
+    rankings = {}
+    for city in cities:
+        group = groups.get(city, pd.Series(dtype = 'float64', name = means.name))
+        rankings[city] = (group.nsmallest(n), group.nlargest(n))
+    return rankings
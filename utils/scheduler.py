@@ -0,0 +1,97 @@
+# ==========================================================================================================================
+# IMPORTANDO BIBLIOTECAS NECESSÁRIAS
+# ==========================================================================================================================
+import os
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+
+from utils.profiling import current_rerun, span
+
+# ==========================================================================================================================
+# CONFIGURAÇÕES INCIAIS
+# ==========================================================================================================================
+# Quantidade de threads compartilhadas por todas as sessões para construir gráficos
+CHART_WORKERS = min(8, (os.cpu_count() or 1) + 2)
+
+# Pool de threads do processo, criado no primeiro uso
+_executor = None
+_lock = threading.Lock()
+
+# ==========================================================================================================================
+# CLASSES
+# ==========================================================================================================================
+class ChartScheduler:
+    """ Esta classe tem a responsabilidade de construir os gráficos de uma página em paralelo, em um pool de threads compartilhado.
+
+        As agregações do pandas/numpy liberam o GIL em boa parte do trabalho, então os gráficos das várias abas são calculados
+        ao mesmo tempo, e o tempo até o primeiro gráfico passa a ser o do gráfico mais lento, e não a soma de todos.
+
+        As funções agendadas não podem chamar 'st.*': elas apenas calculam e devolvem os objetos (figuras, HTML...),
+        que são exibidos pela thread da página com 'result()'.
+
+        A execução ativa da página ('utils.profiling') é propagada para as threads, então a construção de cada gráfico
+        ('chart: <nome>') e a espera pelo resultado ('wait: <nome>') aparecem nos tempos da página. Enquanto a execução
+        captura um perfil, os gráficos são construídos na própria thread da página, para que apareçam no perfil.
+    """
+    def __init__(self, executor = None):
+        """ Input:  Pool de threads (None para o pool compartilhado do processo).
+        """
+        self.rerun = current_rerun()
+        if executor is None:
+            executor = InlineExecutor() if self.rerun is not None and self.rerun.is_profiling() else get_executor()
+        self.executor = executor
+        self.futures = {}
+
+    def submit(self, name, func, *args, **kwargs):
+        """ Esta função tem a responsabilidade de agendar a construção de um gráfico.
+
+            Input:  1. Nome do gráfico;
+                    2. Função que constrói o gráfico e os seus argumentos.
+            Output: Future
+        """
+        self.futures[name] = self.executor.submit(self._run, name, func, *args, **kwargs)
+        return self.futures[name]
+
+    def _run(self, name, func, *args, **kwargs):
+        """ Esta função tem a responsabilidade de construir um gráfico com a execução da página ativa na thread.
+        """
+        if self.rerun is None:
+            return func(*args, **kwargs)
+        with self.rerun.activate(), span('chart: ' + name):
+            return func(*args, **kwargs)
+
+    def result(self, name):
+        """ Esta função tem a responsabilidade de aguardar e devolver um gráfico agendado (exceções da construção são relançadas aqui).
+
+            Input:  Nome do gráfico
+            Output: O retorno da função agendada
+        """
+        with span('wait: ' + name):
+            return self.futures[name].result()
+
+class InlineExecutor:
+    """ Esta classe tem a responsabilidade de executar as funções agendadas imediatamente, na thread de quem as agenda,
+        com a mesma interface do ThreadPoolExecutor (usada, por exemplo, ao capturar o perfil de uma execução).
+    """
+    def submit(self, func, *args, **kwargs):
+        future = Future()
+        try:
+            future.set_result(func(*args, **kwargs))
+        except Exception as error:
+            future.set_exception(error)
+        return future
+
+# ==========================================================================================================================
+# FUNÇÕES
+# ==========================================================================================================================
+def get_executor():
+    """ Esta função tem a responsabilidade de fornecer o pool de threads compartilhado, criado uma única vez por processo.
+
+        Input:  Nenhum
+        Output: ThreadPoolExecutor
+    """
+    global _executor
+    with _lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers = CHART_WORKERS, thread_name_prefix = 'charts')
+    return _executor
@@ -0,0 +1,244 @@
+# ==========================================================================================================================
+# IMPORTANDO BIBLIOTECAS NECESSÁRIAS
+# ==========================================================================================================================
+import argparse
+import json
+import math
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+import pyarrow as pa
+
+from utils.backends import get_backend
+from utils.data import DATASET_PATH, load_memoized
+from utils.engine import VIEWS, compute_view
+from utils.metrics import filter_key
+
+# ==========================================================================================================================
+# CONFIGURAÇÕES INCIAIS
+# ==========================================================================================================================
+# Endereço e porta padrão do serviço (somente local)
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 8600
+
+# Quantidade padrão de requisições atendidas em paralelo
+DEFAULT_WORKERS = 4
+
+# Parâmetros de filtro aceitos na URL (os mesmos da barra lateral) e as colunas correspondentes do dataset
+FILTER_PARAMS = {'traffic': 'Road_traffic_density', 'weather': 'Weatherconditions', 'city': 'City'}
+
+# Quantidade máxima de respostas já serializadas mantidas em memória
+RESPONSES_CACHE_SIZE = 256
+
+# Tempo máximo (s) que uma conexão pode ficar parada antes de enviar a requisição; cada conexão ocupa uma thread do pool
+REQUEST_TIMEOUT = 5
+
+# ==========================================================================================================================
+# CLASSES
+# ==========================================================================================================================
+class PooledHTTPServer(HTTPServer):
+    """ Esta classe tem a responsabilidade de atender as requisições HTTP em um pool de threads de tamanho fixo,
+        em vez de uma thread nova por requisição (como o ThreadingHTTPServer), limitando o trabalho simultâneo do processo.
+    """
+    def __init__(self, address, handler, workers = DEFAULT_WORKERS, path = DATASET_PATH):
+        """ Input:  1. Tupla (endereço, porta);
+                    2. Classe que trata as requisições;
+                    3. Quantidade de threads do pool;
+                    4. Caminho do arquivo CSV servido.
+        """
+        super().__init__(address, handler)
+        self.path = path
+        self.pool = ThreadPoolExecutor(max_workers = workers, thread_name_prefix = 'metrics-service')
+
+    def process_request(self, request, client_address):
+        """ Esta função tem a responsabilidade de entregar cada conexão aceita a uma thread do pool.
+        """
+        self.pool.submit(self._process, request, client_address)
+
+    def _process(self, request, client_address):
+        """ Esta função tem a responsabilidade de tratar uma conexão dentro do pool e fechá-la ao final.
+        """
+        try:
+            self.finish_request(request, client_address)
+        except Exception:
+            self.handle_error(request, client_address)
+        finally:
+            self.shutdown_request(request)
+
+    def server_close(self):
+        """ Esta função tem a responsabilidade de encerrar o servidor e aguardar as requisições em andamento.
+        """
+        super().server_close()
+        self.pool.shutdown(wait = True)
+
+class MetricsHandler(BaseHTTPRequestHandler):
+    """ Esta classe tem a responsabilidade de responder às requisições GET do serviço:
+
+        1. GET /                 -> lista das visões disponíveis;
+        2. GET /<visão>?filtros  -> resultado da visão em JSON (padrão) ou em Arrow IPC ('format=arrow').
+
+        Filtros aceitos: 'date_min' e 'date_max' (AAAA-MM-DD) e 'traffic', 'weather' e 'city' (valores separados por vírgula
+        ou parâmetros repetidos), como em /orders_by_week?date_max=2022-03-01&traffic=Low,Jam.
+
+        Cada conexão atende uma única requisição ('Connection: close') e é encerrada após REQUEST_TIMEOUT segundos parada, para que
+        clientes ociosos (keep-alive) não prendam as threads do pool e deixem o serviço indisponível.
+    """
+    protocol_version = 'HTTP/1.1'
+    timeout = REQUEST_TIMEOUT
+
+    def handle(self):
+        try:
+            super().handle()
+        except (BrokenPipeError, ConnectionResetError):
+            # o cliente desconectou antes de receber a resposta: não há a quem responder
+            self.close_connection = True
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        name = url.path.strip('/')
+        try:
+            if not name:
+                self._send(HTTPStatus.OK, 'application/json', json.dumps({'views': list(VIEWS)}).encode())
+                return
+            if name not in VIEWS:
+                self._send_error(HTTPStatus.NOT_FOUND, "Unknown view '{}'.".format(name))
+                return
+            fmt, date_min, date_max, options = parse_query(url.query)
+            content_type, body = render_view(name, fmt, date_min, date_max, self.server.path, **options)
+        except ValueError as error:
+            self._send_error(HTTPStatus.BAD_REQUEST, str(error))
+            return
+        except Exception:
+            self.server.handle_error(self.request, self.client_address)
+            self._send_error(HTTPStatus.INTERNAL_SERVER_ERROR, 'Internal error while computing the view.')
+            return
+        self._send(HTTPStatus.OK, content_type, body)
+
+    def _send(self, status, content_type, body):
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.send_header('Connection', 'close')
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_error(self, status, message):
+        self._send(status, 'application/json', json.dumps({'error': message}).encode())
+
+    def log_message(self, format, *args):
+        # As consultas frequentes dos jobs de alerta não devem poluir a saída padrão
+        pass
+
+# ==========================================================================================================================
+# FUNÇÕES
+# ==========================================================================================================================
+def parse_query(query):
+    """ Esta função tem a responsabilidade de converter a query string da URL nos filtros da barra lateral.
+
+        Input:  Query string (por exemplo 'date_max=2022-03-01&traffic=Low,Jam')
+        Output: Tupla (formato, data inicial, data final, {coluna: valores aceitos})
+    """
+    params = parse_qs(query, keep_blank_values = True)
+    unknown = set(params) - set(FILTER_PARAMS) - {'date_min', 'date_max', 'format'}
+    if unknown:
+        raise ValueError('Unknown parameters: {}.'.format(sorted(unknown)))
+
+    fmt = params.get('format', ['json'])[-1]
+    if fmt not in ['json', 'arrow']:
+        raise ValueError("Invalid format '{}'! Expected 'json' or 'arrow'.".format(fmt))
+
+    dates = {}
+    for param in ['date_min', 'date_max']:
+        value = params.get(param, [''])[-1]
+        try:
+            dates[param] = date.fromisoformat(value).isoformat() if value else None
+        except ValueError:
+            raise ValueError("Invalid date for '{}': '{}'.".format(param, value))
+
+    options = {}
+    for param, col in FILTER_PARAMS.items():
+        if param in params:
+            options[col] = [value for values in params[param] for value in values.split(',') if value]
+
+    return fmt, dates['date_min'], dates['date_max'], options
+
+def _json_safe(value):
+    """ Esta função tem a responsabilidade de trocar NaN por None (null), já que NaN não é um valor JSON válido.
+    """
+    if isinstance(value, float) and math.isnan(value):
+        return None
+    if isinstance(value, dict):
+        return {key: _json_safe(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_json_safe(item) for item in value]
+    return value
+
+def serialize(result, fmt):
+    """ Esta função tem a responsabilidade de serializar o resultado de uma visão.
+
+        Input:  1. Dataframe ou dicionário;
+                2. Formato - 'json' ou 'arrow'.
+        Output: Tupla (Content-Type, bytes)
+    """
+    if isinstance(result, dict):
+        if fmt == 'arrow':
+            raise ValueError("The 'metrics' view is only available as JSON.")
+        return 'application/json', json.dumps(_json_safe(result)).encode()
+
+    if fmt == 'arrow':
+        table = pa.Table.from_pandas(result, preserve_index = False)
+        sink = pa.BufferOutputStream()
+        with pa.ipc.new_stream(sink, table.schema) as writer:
+            writer.write_table(table)
+        return 'application/vnd.apache.arrow.stream', sink.getvalue().to_pybytes()
+    return 'application/json', result.to_json(orient = 'records', date_format = 'iso').encode()
+
+def render_view(name, fmt = 'json', date_min = None, date_max = None, path = DATASET_PATH, **options):
+    """ Esta função tem a responsabilidade de calcular e serializar uma visão, memorizando a resposta pronta por versão do dataset,
+        backend das consultas, formato e estado dos filtros.
+
+        Input:  1. Nome da visão;
+                2. Formato - 'json' ou 'arrow';
+                3. Datas inicial e final, opcionais;
+                4. Caminho do arquivo CSV;
+                5. Valores aceitos de cada coluna filtrada.
+        Output: Tupla (Content-Type, bytes)
+    """
+    # o backend entra na chave: trocar o CURRY_BACKEND não pode servir respostas calculadas pelo outro backend
+    key = (get_backend(path = path).name, name, fmt, filter_key(date_min, date_max, **options))
+    return load_memoized('responses', key, lambda: serialize(compute_view(name, date_min, date_max, path, **options), fmt),
+                         path, RESPONSES_CACHE_SIZE)
+
+def serve(host = DEFAULT_HOST, port = DEFAULT_PORT, workers = DEFAULT_WORKERS, path = DATASET_PATH):
+    """ Esta função tem a responsabilidade de iniciar o serviço HTTP e atendê-lo até ser interrompido (Ctrl+C).
+
+        Input:  1. Endereço;
+                2. Porta;
+                3. Quantidade de threads do pool;
+                4. Caminho do arquivo CSV servido.
+        Output: Nenhum.
+    """
+    server = PooledHTTPServer((host, port), MetricsHandler, workers, path)
+    print('Servindo {} em http://{}:{}/ com {} workers'.format(path, host, server.server_port, workers))
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+# ==========================================================================================================================
+# INÍCIO DA ESTRUTURA LÓGICA DO CÓDIGO
+# ==========================================================================================================================
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description = 'Serviço HTTP/JSON com as visões do dashboard, sem o Streamlit.')
+    parser.add_argument('--host', default = DEFAULT_HOST)
+    parser.add_argument('--port', type = int, default = DEFAULT_PORT)
+    parser.add_argument('--workers', type = int, default = DEFAULT_WORKERS)
+    parser.add_argument('--path', default = DATASET_PATH)
+    args = parser.parse_args()
+
+    serve(args.host, args.port, args.workers, args.path)
@@ -0,0 +1,170 @@
+# ==========================================================================================================================
+# IMPORTANDO BIBLIOTECAS NECESSÁRIAS
+# ==========================================================================================================================
+import numpy as np
+import pandas as pd
+
+# ==========================================================================================================================
+# CONFIGURAÇÕES INCIAIS
+# ==========================================================================================================================
+# Precisão padrão do HyperLogLog: 2**10 = 1024 registradores, erro padrão de ~1.04 / sqrt(1024) = 3.25%
+HLL_PRECISION = 10
+
+# Erro relativo máximo padrão dos sketches de quantis: 1e-5 equivale a ~100 m em uma coordenada de 80 graus
+QUANTILE_ALPHA = 1e-5
+
+# ==========================================================================================================================
+# FUNÇÕES - HYPERLOGLOG
+# ==========================================================================================================================
+def hash_values(values):
+    """ Esta função tem a responsabilidade de transformar, de forma vetorizada, uma coluna de valores (por exemplo, IDs dos entregadores) em hashes de 64 bits.
+        Em colunas categóricas, apenas as categorias são hasheadas, e cada linha recebe o hash da sua categoria pelo código.
+
+        Input:  Array ou Series de valores
+        Output: Array de uint64
+    """
+    if isinstance(getattr(values, 'dtype', None), pd.CategoricalDtype):
+        hashes = pd.util.hash_array(np.asarray(values.cat.categories, dtype = object))
+        return np.append(hashes, pd.util.hash_array(np.array([None], dtype = object)))[values.cat.codes.to_numpy()]
+    return pd.util.hash_array(np.asarray(values, dtype = object))
+
+def hll_entries(hashes, precision = HLL_PRECISION):
+    """ Esta função tem a responsabilidade de calcular, para cada hash, o registrador do HyperLogLog (os 'precision' bits mais altos)
+        e o valor a ser guardado nele (posição do primeiro bit 1 nos bits restantes).
+
+        Input:  1. Array de hashes uint64;
+                2. Precisão (número de bits do índice do registrador).
+        Output: Tupla (registradores, valores), ambos arrays.
+    """
+    hashes = np.asarray(hashes, dtype = np.uint64)
+    registers = (hashes >> np.uint64(64 - precision)).astype(np.int64)
+
+    # Bits restantes alinhados à esquerda; o valor é o número de zeros à esquerda + 1 (limitado ao tamanho do restante)
+    rest = hashes << np.uint64(precision)
+    width = 64 - precision
+    ranks = np.full(len(hashes), width + 1, dtype = np.uint8)
+    nonzero = rest != 0
+    # floor(log2) em float64 pode arredondar para cima perto de potências de 2; a correção abaixo garante o valor exato
+    top_bit = np.floor(np.log2(rest[nonzero].astype(np.float64))).astype(np.int64)
+    top_bit -= (rest[nonzero] >> top_bit.astype(np.uint64)) == 0
+    ranks[nonzero] = (64 - top_bit).astype(np.uint8)
+    return registers, ranks
+
+def hll_group_registers(groups, registers, ranks, n_groups, precision = HLL_PRECISION):
+    """ Esta função tem a responsabilidade de unir entradas esparsas de HyperLogLog (registrador, valor) em um HyperLogLog denso por grupo
+        (por exemplo, as entradas de cada dia unidas por semana).
+
+        Input:  1. Array com o grupo (0 a n_groups - 1) de cada entrada; entradas com grupo negativo são ignoradas;
+                2. Arrays de registradores e valores;
+                3. Número de grupos;
+                4. Precisão.
+        Output: Matriz uint8 (n_groups, 2**precision)
+    """
+    groups = np.asarray(groups)
+    keep = groups >= 0
+    dense = np.zeros((n_groups, 2 ** precision), dtype = np.uint8)
+    np.maximum.at(dense, (groups[keep], np.asarray(registers)[keep]), np.asarray(ranks)[keep])
+    return dense
+
+def hll_count(registers):
+    """ Esta função tem a responsabilidade de estimar o número de valores distintos a partir dos registradores de um HyperLogLog,
+        aplicando a correção de contagem linear para cardinalidades pequenas. Aceita um único vetor ou uma matriz (um sketch por linha).
+
+        Erro padrão relativo: ~1.04 / sqrt(2**precision).
+
+        Input:  Array (m,) ou (n, m) de registradores
+        Output: Estimativa (float) ou array de estimativas
+    """
+    registers = np.atleast_2d(registers)
+    m = registers.shape[1]
+    alpha = 0.7213 / (1 + 1.079 / m)
+
+    raw = alpha * m * m / np.sum(np.exp2(-registers.astype(np.float64)), axis = 1)
+    zeros = np.count_nonzero(registers == 0, axis = 1)
+    with np.errstate(divide = 'ignore'):
+        linear = m * np.log(m / np.maximum(zeros, 1))
+    estimate = np.where((raw <= 2.5 * m) & (zeros > 0), linear, raw)
+
+    return float(estimate[0]) if estimate.shape[0] == 1 else estimate
+
+# ==========================================================================================================================
+# FUNÇÕES - CONTAGEM EXATA
+# ==========================================================================================================================
+def count_distinct_codes(codes, size):
+    """ Esta função tem a responsabilidade de contar, de forma exata, os valores distintos de uma coluna codificada em dicionário,
+        marcando os códigos presentes em um vetor de 'size' posições (sem hashear os valores originais).
+
+        Input:  1. Array de códigos inteiros (códigos negativos, de dados ausentes, são ignorados);
+                2. Tamanho do dicionário.
+        Output: Quantidade de valores distintos (int)
+    """
+    codes = np.asarray(codes)
+    seen = np.zeros(size, dtype = bool)
+    seen[codes[codes >= 0]] = True
+    return int(np.count_nonzero(seen))
+
+# ==========================================================================================================================
+# FUNÇÕES - MÉDIA E VARIÂNCIA COMBINÁVEIS (CHAN)
+# ==========================================================================================================================
+def combine_moments(groups, n_groups, count, mean, m2):
+    """ Esta função tem a responsabilidade de unir, por grupo, estatísticas suficientes do tipo (contagem, média, M2), em que M2 é
+        a soma dos quadrados dos desvios em relação à média da parte, com a fórmula de Chan et al.:
+
+            n = soma(n_i);  média = soma(n_i * média_i) / n;  M2 = soma(M2_i) + soma(n_i * (média_i - média)**2)
+
+        Os desvios são medidos em relação à média do grupo, e não acumulados como soma dos quadrados dos valores, então a
+        variância não sofre o cancelamento catastrófico de 'soma dos quadrados - n * média**2' quando a média é grande em relação
+        ao desvio. Com contagens 1 e M2 0, a mesma função calcula as estatísticas a partir das linhas (em duas passadas).
+
+        Input:  1. Array com o grupo (0 a n_groups - 1) de cada parte;
+                2. Número de grupos;
+                3. Arrays com a contagem, a média e o M2 de cada parte (partes com contagem 0 são ignoradas).
+        Output: Tupla de arrays (contagem, média, M2) de cada grupo; grupos vazios têm média e M2 NaN
+    """
+    count = np.asarray(count, dtype = np.float64)
+    mean = np.where(count > 0, np.asarray(mean, dtype = np.float64), 0.0)
+    m2 = np.where(count > 0, np.asarray(m2, dtype = np.float64), 0.0)
+
+    total = np.bincount(groups, weights = count, minlength = n_groups)
+    with np.errstate(divide = 'ignore', invalid = 'ignore'):
+        group_mean = np.bincount(groups, weights = count * mean, minlength = n_groups) / total
+    delta = mean - np.nan_to_num(group_mean)[groups]
+    group_m2 = np.bincount(groups, weights = m2 + count * delta * delta, minlength = n_groups)
+    return total, group_mean, np.where(total > 0, group_m2, np.nan)
+
+def sample_std(count, m2):
+    """ Esta função tem a responsabilidade de calcular o desvio padrão amostral (ddof = 1) a partir da contagem e do M2.
+
+        Input:  Arrays de contagens e de M2
+        Output: Array de desvios padrão (NaN quando a contagem é menor que 2)
+    """
+    count = np.asarray(count, dtype = np.float64)
+    with np.errstate(divide = 'ignore', invalid = 'ignore'):
+        return np.sqrt(np.where(count > 1, np.maximum(m2, 0) / (count - 1), np.nan))
+
+# ==========================================================================================================================
+# FUNÇÕES - QUANTIS (HISTOGRAMA LOGARÍTMICO, NOS MOLDES DO DDSKETCH)
+# ==========================================================================================================================
+def quantile_buckets(values, alpha = QUANTILE_ALPHA):
+    """ Esta função tem a responsabilidade de substituir cada valor pelo representante do seu intervalo (bucket) logarítmico,
+        no estilo do DDSketch: os intervalos são (gamma**(i-1), gamma**i], com gamma = (1 + alpha) / (1 - alpha), e o representante
+        2 * gamma**i / (gamma + 1) fica a uma distância relativa de no máximo 'alpha' de qualquer valor do intervalo.
+
+        Contar quantas vezes cada representante aparece gera um sketch de quantis que pode ser unido (somando as contagens)
+        e cujo tamanho depende da amplitude dos valores, e não da quantidade de valores. Com alpha = None, os próprios valores são
+        usados (modo exato).
+
+        Input:  1. Array de valores;
+                2. Erro relativo máximo (alpha) ou None.
+        Output: Array com os representantes
+    """
+    values = np.asarray(values, dtype = np.float64)
+    if alpha is None:
+        return values
+
+    gamma = (1 + alpha) / (1 - alpha)
+    magnitude = np.abs(values)
+    with np.errstate(divide = 'ignore'):
+        index = np.ceil(np.log(magnitude) / np.log(gamma))
+    representative = 2 * np.power(gamma, index) / (gamma + 1)
+    return np.where(magnitude > 0, np.sign(values) * representative, 0.0)
@@ -0,0 +1,170 @@
+# ==========================================================================================================================
+# IMPORTANDO BIBLIOTECAS NECESSÁRIAS
+# ==========================================================================================================================
+import argparse
+import os
+import resource
+
+import pandas as pd
+
+from utils.cube import OrderCube
+from utils.data import DATASET_PATH, clean_code, read_raw
+from utils.locations import LocationSketch
+from utils.weekly import WeeklyStore
+
+# ==========================================================================================================================
+# CONFIGURAÇÕES INCIAIS
+# ==========================================================================================================================
+# Número padrão de linhas do CSV lidas e limpas por vez
+DEFAULT_CHUNKSIZE = 100_000
+
+# Linhas lidas na primeira leitura, usadas para estimar a memória ocupada por linha quando é informado um teto de memória
+PROBE_ROWS = 10_000
+
+# Fator entre a memória do pedaço bruto e o pico durante a limpeza (texto bruto + colunas limpas + máscaras)
+CLEAN_PEAK_FACTOR = 3
+
+# ==========================================================================================================================
+# CLASSES
+# ==========================================================================================================================
+class StreamSummary:
+    """ Esta classe tem a responsabilidade de acumular, pedaço a pedaço, os agregados de que as páginas precisam, sem manter as linhas em memória.
+
+        1. Cubo de agregados (OrderCube): contagens por dia, médias e desvios padrão por grupo, com todos os filtros da barra lateral;
+        2. Série semanal (WeeklyStore): pedidos, entregadores distintos e pedidos por entregador por semana ISO;
+        3. Sketches de quantis das coordenadas por (data, cidade, tráfego): medianas do mapa, exatas ou com erro relativo <= alpha;
+        4. Somas por (data, cidade, entregador): tempo médio e avaliação média de cada entregador.
+
+        Os itens 2 a 4 aceitam apenas o filtro de data (e de tráfego, no caso da série semanal e do mapa). A memória ocupada depende do número de dias,
+        entregadores e coordenadas distintas, e não do número de pedidos.
+    """
+    def __init__(self, alpha = None):
+        """ Input:  Erro relativo máximo dos sketches de quantis do mapa (None para medianas exatas, guardando cada coordenada distinta).
+        """
+        self.alpha = alpha
+        self.cube = None
+        self.weekly_store = None
+        self.locations = None
+        self.couriers = None
+        self.rows = 0
+
+    def update(self, df1):
+        """ Esta função tem a responsabilidade de incorporar um pedaço já limpo do conjunto de dados aos agregados.
+
+            Input:  Dataframe limpo
+            Output: Nenhum.
+        """
+        if df1.empty:
+            return
+        self.rows += len(df1)
+
+        cube = OrderCube.build(df1)
+        self.cube = cube if self.cube is None else self.cube.merge(cube)
+
+        weekly_store = WeeklyStore.build(df1)
+        self.weekly_store = weekly_store if self.weekly_store is None else self.weekly_store.merge(weekly_store)
+
+        locations = LocationSketch.build(df1, self.alpha)
+        self.locations = locations if self.locations is None else self.locations.merge(locations)
+
+        values = pd.DataFrame({
+            'count': 1,
+            'Time_taken(min) (sum)': df1['Time_taken(min)'].astype('float64'),
+            'Delivery_person_Ratings (sum)': df1['Delivery_person_Ratings'].astype('float64')})
+        keys = [df1['Order_Date'], df1['City'], df1['Delivery_person_ID']]
+        self.couriers = _add(self.couriers, values.groupby(keys, observed = True).sum())
+
+    def weekly(self, date_max = None, traffic = None):
+        """ Esta função tem a responsabilidade de calcular, por semana ISO, os pedidos, os entregadores distintos e a média de pedidos por entregador.
+
+            Input:  1. Data final (inclusive), opcional;
+                    2. Condições de tráfego aceitas, opcional.
+            Output: Dataframe de 'WeeklyStore.select()'
+        """
+        return self.weekly_store.select(date_max = date_max, traffic = traffic)
+
+    def map_medians(self, date_max = None, traffic = None):
+        """ Esta função tem a responsabilidade de calcular as medianas das coordenadas de entrega por cidade e condição de tráfego,
+            a partir dos sketches de quantis.
+
+            Input:  1. Data final (inclusive), opcional;
+                    2. Condições de tráfego aceitas, opcional.
+            Output: Dataframe com 'City', 'Road_traffic_density' e as medianas das coordenadas
+        """
+        return self.locations.select(date_max = date_max, traffic = traffic).medians()
+
+    def courier_means(self, measure, by = ('City', 'Delivery_person_ID'), date_max = None):
+        """ Esta função tem a responsabilidade de calcular a média de uma medida por entregador (e, opcionalmente, por cidade).
+
+            Input:  1. Medida - 'Time_taken(min)' ou 'Delivery_person_Ratings';
+                    2. Chaves do agrupamento;
+                    3. Data final (inclusive), opcional.
+            Output: Dataframe com as chaves e a média da medida
+        """
+        couriers = self.couriers
+        if date_max is not None:
+            couriers = couriers.loc[couriers.index.get_level_values('Order_Date') <= pd.Timestamp(date_max), :]
+        df2 = couriers.groupby(level = list(by), observed = True)[['count', measure + ' (sum)']].sum()
+        df2[measure] = df2[measure + ' (sum)'] / df2['count']
+        return df2[[measure]].reset_index()
+
+# ==========================================================================================================================
+# FUNÇÕES
+# ==========================================================================================================================
+def _add(old, new):
+    """ Esta função tem a responsabilidade de somar dois agregados indexados pelas mesmas chaves (a união das chaves é mantida).
+
+        Input:  Series ou Dataframes (o primeiro pode ser None)
+        Output: Soma dos agregados
+    """
+    if old is None:
+        return new
+    both = pd.concat([old, new])
+    return both.groupby(level = list(range(both.index.nlevels)), observed = True).sum()
+
+def chunk_rows(path, memory_mb):
+    """ Esta função tem a responsabilidade de estimar quantas linhas podem ser lidas e limpas por vez sem ultrapassar um teto de memória.
+
+        Input:  1. Caminho do CSV;
+                2. Teto de memória para o pedaço em processamento (MB).
+        Output: Número de linhas por pedaço
+    """
+    probe = read_raw(path, nrows = PROBE_ROWS)
+    bytes_per_row = max(probe.memory_usage(deep = True).sum() / max(len(probe), 1), 1)
+    return max(int(memory_mb * 2**20 / (bytes_per_row * CLEAN_PEAK_FACTOR)), 1_000)
+
+def summarize_csv(path = DATASET_PATH, chunksize = None, memory_mb = None, alpha = None):
+    """ Esta função tem a responsabilidade de ler o CSV em pedaços, limpar cada pedaço com 'clean_code()' e acumular os agregados
+        das páginas em um StreamSummary, mantendo em memória apenas um pedaço por vez.
+
+        O tamanho do pedaço pode ser informado diretamente ('chunksize') ou derivado de um teto de memória ('memory_mb').
+
+        Input:  1. Caminho do CSV;
+                2. Linhas por pedaço, opcional;
+                3. Teto de memória do pedaço em processamento (MB), opcional;
+                4. Erro relativo máximo das medianas do mapa (None para medianas exatas).
+        Output: StreamSummary
+    """
+    if chunksize is None:
+        chunksize = chunk_rows(path, memory_mb) if memory_mb is not None else DEFAULT_CHUNKSIZE
+
+    summary = StreamSummary(alpha)
+    for chunk in read_raw(path, chunksize = chunksize):
+        summary.update(clean_code(chunk))
+    return summary
+
+# ==========================================================================================================================
+# INÍCIO DA ESTRUTURA LÓGICA DO CÓDIGO
+# ==========================================================================================================================
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description = 'Agregação do dataset em pedaços, com memória limitada.')
+    parser.add_argument('path', nargs = '?', default = DATASET_PATH)
+    parser.add_argument('--chunksize', type = int, default = None)
+    parser.add_argument('--memory-mb', type = float, default = None)
+    parser.add_argument('--alpha', type = float, default = None, help = 'erro relativo das medianas do mapa (padrão: exatas)')
+    args = parser.parse_args()
+
+    summary = summarize_csv(args.path, args.chunksize, args.memory_mb, args.alpha)
+    peak_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    print('{}: {:,} pedidos em {:,} células do cubo | pico de memória do processo: {:.0f} MB'.format(
+        os.path.basename(args.path), summary.rows, len(summary.cube.cells), peak_mb))
@@ -0,0 +1,264 @@
+# ==========================================================================================================================
+# IMPORTANDO BIBLIOTECAS NECESSÁRIAS
+# ==========================================================================================================================
+import numpy as np
+import pandas as pd
+
+from utils.data import DATASET_PATH, concat_clean, load_data, load_derived, read_batches
+from utils.sketches import count_distinct_codes, hash_values, hll_count, hll_entries, hll_group_registers
+
+# ==========================================================================================================================
+# CONFIGURAÇÕES INCIAIS
+# ==========================================================================================================================
+# Colunas do dataset necessárias para construir a série semanal
+WEEKLY_COLUMNS = ['Order_Date', 'Road_traffic_density', 'Delivery_person_ID']
+
+# Chaves diárias da série (o recorte por datas e por tráfego é feito sobre elas)
+WEEKLY_KEYS = ['Order_Date', 'Road_traffic_density']
+
+# Janela padrão (em semanas) das médias móveis
+ROLLING_WEEKS = 4
+
+# ==========================================================================================================================
+# CLASSES
+# ==========================================================================================================================
+class WeeklyStore:
+    """ Esta classe tem a responsabilidade de guardar a série semanal de pedidos, indexada por (ano ISO, semana ISO).
+
+        Guarda, por (data, condição de tráfego):
+        1. A quantidade de pedidos;
+        2. Os entregadores do dia, em um de dois modos:
+           - exato (precision = None): os códigos inteiros dos entregadores (dicionário de IDs da coluna categórica),
+             sem repetições; as contagens de distintos são feitas sobre os códigos;
+           - aproximado (precision = p): um HyperLogLog esparso por dia, com erro padrão de ~1.04 / sqrt(2**p),
+             cujo tamanho não cresce com o número de entregadores.
+
+        Como a granularidade é o dia, qualquer recorte de datas e de tráfego é respondido unindo os dias selecionados, sem acessar
+        as linhas, e novos lotes são incorporados com 'merge()'.
+    """
+    def __init__(self, orders, couriers, ids = None, precision = None):
+        """ Input:  1. Dataframe com 'Order_Date', 'Road_traffic_density' e 'count';
+                    2. Dataframe com 'Order_Date', 'Road_traffic_density' e 'courier' (código do entregador; modo exato)
+                       ou 'register' e 'rank' (HyperLogLog; modo aproximado);
+                    3. Index com os IDs dos entregadores, em que a posição é o código (modo exato);
+                    4. Precisão do HyperLogLog (None para o modo exato).
+        """
+        self.orders = orders
+        self.couriers = couriers
+        self.ids = ids
+        self.precision = precision
+
+    @classmethod
+    def build(cls, df1, precision = None):
+        """ Esta função tem a responsabilidade de construir a série a partir do Dataframe limpo.
+
+            Input:  1. Dataframe limpo (com WEEKLY_COLUMNS);
+                    2. Precisão do HyperLogLog (None para contagens exatas).
+            Output: WeeklyStore
+        """
+        keys = df1[WEEKLY_KEYS].reset_index(drop = True)
+        orders = keys.groupby(WEEKLY_KEYS, observed = True).size().reset_index(name = 'count')
+
+        if precision is not None:
+            registers, ranks = hll_entries(hash_values(df1['Delivery_person_ID']), precision)
+            couriers = keys.assign(register = registers.astype(np.int32), rank = ranks)
+            couriers = couriers.groupby(WEEKLY_KEYS + ['register'], observed = True)['rank'].max().reset_index()
+            return cls(orders, couriers, None, precision)
+
+        ids = df1['Delivery_person_ID']
+        if isinstance(ids.dtype, pd.CategoricalDtype):
+            codes, ids = ids.cat.codes.to_numpy(), pd.Index(ids.cat.categories)
+        else:
+            codes, ids = pd.factorize(ids)
+            ids = pd.Index(ids)
+        couriers = keys.assign(courier = codes.astype(np.int32))
+        couriers = couriers.loc[codes >= 0, :].drop_duplicates(ignore_index = True)
+        return cls(orders, couriers, ids)
+
+    def merge(self, other):
+        """ Esta função tem a responsabilidade de unir duas séries do mesmo modo (por exemplo, o histórico e um novo lote de pedidos).
+
+            Input:  Outro WeeklyStore
+            Output: Novo WeeklyStore
+        """
+        orders = pd.concat([self.orders, other.orders], ignore_index = True)
+        orders = orders.groupby(WEEKLY_KEYS, observed = True)['count'].sum().reset_index()
+
+        if self.precision is not None:
+            couriers = pd.concat([self.couriers, other.couriers], ignore_index = True)
+            couriers = couriers.groupby(WEEKLY_KEYS + ['register'], observed = True)['rank'].max().reset_index()
+            return WeeklyStore(orders, couriers, None, self.precision)
+
+        # Acrescentando ao dicionário somente os entregadores novos e traduzindo os códigos da outra série
+        ids = self.ids.append(other.ids[~other.ids.isin(self.ids)])
+        remap = ids.get_indexer(other.ids).astype(np.int32)
+        other_couriers = other.couriers.assign(courier = remap[other.couriers['courier'].to_numpy()])
+        couriers = pd.concat([self.couriers, other_couriers], ignore_index = True).drop_duplicates(ignore_index = True)
+        return WeeklyStore(orders, couriers, ids)
+
+    def _distinct(self, couriers, groups, n_groups):
+        """ Esta função tem a responsabilidade de contar os entregadores distintos de cada grupo de dias.
+
+            Input:  1. Recorte da tabela de entregadores;
+                    2. Array com o grupo (0 a n_groups - 1) de cada linha do recorte;
+                    3. Número de grupos.
+            Output: Array com a contagem (exata ou estimada) de cada grupo
+        """
+        if self.precision is not None:
+            registers = hll_group_registers(groups, couriers['register'].to_numpy(), couriers['rank'].to_numpy(),
+                                            n_groups, self.precision)
+            return np.atleast_1d(hll_count(registers)) if n_groups else np.zeros(0)
+
+        # Contagem exata sobre os códigos: cada par (grupo, código) distinto é contado uma única vez
+        pairs = np.unique(groups.astype(np.int64) * len(self.ids) + couriers['courier'].to_numpy())
+        return np.bincount(pairs // max(len(self.ids), 1), minlength = n_groups)
+
+    def distinct_couriers(self, date_min = None, date_max = None, traffic = None):
+        """ Esta função tem a responsabilidade de contar os entregadores distintos de um recorte de datas e de condições de tráfego.
+
+            Input:  1. Datas inicial e final (inclusive), opcionais;
+                    2. Condições de tráfego aceitas, opcional.
+            Output: Contagem exata (int) ou estimativa (float)
+        """
+        couriers = _slice(self.couriers, date_min, date_max, traffic)
+        if self.precision is None:
+            return count_distinct_codes(couriers['courier'].to_numpy(), len(self.ids))
+        return float(self._distinct(couriers, np.zeros(len(couriers), dtype = np.int64), 1)[0])
+
+    def select(self, date_min = None, date_max = None, traffic = None):
+        """ Esta função tem a responsabilidade de calcular a série semanal de um recorte de datas e de condições de tráfego.
+
+            Input:  1. Datas inicial e final (inclusive), opcionais;
+                    2. Condições de tráfego aceitas, opcional.
+            Output: Dataframe com 'iso_year', 'iso_week', 'week_start' (segunda-feira), 'Week_of_year' ('AAAA-Www'),
+                    'ID (count)', 'Delivery_person_ID (nunique)' (estimativa no modo aproximado) e 'media_por_entreg_unico',
+                    em ordem cronológica
+        """
+        orders = _slice(self.orders, date_min, date_max, traffic)
+        couriers = _slice(self.couriers, date_min, date_max, traffic)
+
+        orders = orders.assign(week_start = week_start(orders['Order_Date'])).groupby('week_start')['count'].sum()
+        weeks = orders.index
+        groups = weeks.get_indexer(week_start(couriers['Order_Date']))
+        distinct = pd.Series(self._distinct(couriers, groups, len(weeks)), index = weeks)
+
+        df2 = pd.concat([orders.rename('ID (count)'), distinct.rename('Delivery_person_ID (nunique)')], axis = 1)
+        df2 = df2.loc[df2['Delivery_person_ID (nunique)'] > 0, :].sort_index().reset_index()
+        df2['media_por_entreg_unico'] = df2['ID (count)'] / df2['Delivery_person_ID (nunique)']
+
+        iso_year, iso_week = iso_year_week(df2['week_start'])
+        df2.insert(0, 'iso_year', iso_year)
+        df2.insert(1, 'iso_week', iso_week)
+        df2.insert(3, 'Week_of_year', week_labels(iso_year, iso_week))
+        return df2
+
+# ==========================================================================================================================
+# FUNÇÕES
+# ==========================================================================================================================
+def _slice(df2, date_min, date_max, traffic):
+    """ Esta função tem a responsabilidade de recortar uma tabela diária por datas e condições de tráfego.
+
+        Input:  1. Dataframe com 'Order_Date' e 'Road_traffic_density';
+                2. Datas inicial e final (inclusive), opcionais;
+                3. Condições de tráfego aceitas, opcional.
+        Output: Dataframe recortado
+    """
+    mask = np.ones(len(df2), dtype = bool)
+    if date_min is not None:
+        mask &= (df2['Order_Date'] >= pd.Timestamp(date_min)).to_numpy()
+    if date_max is not None:
+        mask &= (df2['Order_Date'] <= pd.Timestamp(date_max)).to_numpy()
+    if traffic is not None:
+        mask &= df2['Road_traffic_density'].isin(traffic).to_numpy()
+    return df2.loc[mask, :]
+
+def week_start(dates):
+    """ Esta função tem a responsabilidade de calcular, com aritmética de datas vetorizada, a segunda-feira da semana ISO de cada data.
+
+        Input:  Series ou array de datas
+        Output: Array datetime64[ns]
+    """
+    days = np.asarray(dates, dtype = 'datetime64[D]')
+    # 1970-01-01 foi uma quinta-feira: (dias + 3) % 7 é o dia da semana com segunda-feira = 0
+    weekday = (days.astype(np.int64) + 3) % 7
+    return (days - weekday.astype('timedelta64[D]')).astype('datetime64[ns]')
+
+def iso_year_week(dates):
+    """ Esta função tem a responsabilidade de calcular o ano e a semana ISO 8601 de cada data, sem formatar texto:
+        a semana ISO é a da sua quinta-feira, e o ano ISO é o ano dessa quinta-feira.
+
+        Input:  Series ou array de datas
+        Output: Tupla (anos, semanas), arrays de inteiros
+    """
+    days = np.asarray(dates, dtype = 'datetime64[D]')
+    weekday = (days.astype(np.int64) + 3) % 7
+    thursday = days - weekday.astype('timedelta64[D]') + np.timedelta64(3, 'D')
+    year = thursday.astype('datetime64[Y]')
+    week = (thursday - year.astype('datetime64[D]')).astype(np.int64) // 7 + 1
+    return year.astype(np.int64) + 1970, week
+
+def week_labels(iso_year, iso_week):
+    """ Esta função tem a responsabilidade de gerar os rótulos 'AAAA-Www' das semanas ISO.
+
+        Input:  Arrays de anos e semanas ISO
+        Output: Lista de textos
+    """
+    return ['{}-W{:02d}'.format(year, week) for year, week in zip(np.asarray(iso_year).tolist(), np.asarray(iso_week).tolist())]
+
+def weekly_growth(df2, window = ROLLING_WEEKS):
+    """ Esta função tem a responsabilidade de acrescentar à série semanal as médias móveis e o crescimento semana a semana (WoW).
+        As semanas sem pedidos dentro do período são incluídas com zero, para que as janelas e o WoW comparem semanas consecutivas.
+
+        Input:  1. Dataframe de 'WeeklyStore.select()';
+                2. Janela das médias móveis, em semanas.
+        Output: Dataframe com as colunas da série e, para 'ID (count)' e 'media_por_entreg_unico',
+                '<coluna> (rolling mean)' e '<coluna> (WoW %)'
+    """
+    if df2.empty:
+        return df2.assign(**{'{} ({})'.format(col, kind): pd.Series(dtype = 'float64')
+                             for col in ['ID (count)', 'media_por_entreg_unico'] for kind in ['rolling mean', 'WoW %']})
+
+    weeks = pd.date_range(df2['week_start'].min(), df2['week_start'].max(), freq = '7D')
+    df3 = df2.set_index('week_start').reindex(weeks)
+    df3.index.name = 'week_start'
+    for col in ['ID (count)', 'Delivery_person_ID (nunique)']:
+        df3[col] = df3[col].fillna(0).astype(np.int64)
+    df3 = df3.reset_index()
+
+    iso_year, iso_week = iso_year_week(df3['week_start'])
+    df3['iso_year'], df3['iso_week'], df3['Week_of_year'] = iso_year, iso_week, week_labels(iso_year, iso_week)
+
+    for col in ['ID (count)', 'media_por_entreg_unico']:
+        values = df3[col].astype('float64')
+        df3[col + ' (rolling mean)'] = values.rolling(window, min_periods = 1).mean()
+        df3[col + ' (WoW %)'] = (values.pct_change(fill_method = None) * 100).replace([np.inf, -np.inf], np.nan)
+    return df3
+
+def build_weekly_store(path = DATASET_PATH, precision = None):
+    """ Esta função tem a responsabilidade de construir a série semanal a partir do conjunto de dados limpo.
+
+        Input:  1. Caminho do arquivo CSV;
+                2. Precisão do HyperLogLog (None para contagens exatas).
+        Output: WeeklyStore
+    """
+    return WeeklyStore.build(load_data(path, columns = WEEKLY_COLUMNS), precision)
+
+def update_weekly_store(store, path, batches):
+    """ Esta função tem a responsabilidade de atualizar a série semanal com novos lotes de pedidos, sem reprocessar o histórico.
+
+        Input:  1. WeeklyStore atual;
+                2. Caminho do arquivo CSV;
+                3. Nomes dos novos lotes.
+        Output: WeeklyStore atualizado
+    """
+    return store.merge(WeeklyStore.build(concat_clean(read_batches(path, batches, WEEKLY_COLUMNS)), store.precision))
+
+def load_weekly_store(path = DATASET_PATH, precision = None):
+    """ Esta função tem a responsabilidade de fornecer a série semanal, construída uma única vez por processo, por versão do dataset e por modo.
+
+        Input:  1. Caminho do arquivo CSV;
+                2. Precisão do HyperLogLog (None para contagens exatas).
+        Output: WeeklyStore
+    """
+    name = 'weekly_store' if precision is None else 'weekly_store_hll{}'.format(precision)
+    return load_derived(name, lambda path: build_weekly_store(path, precision), path, update_weekly_store)